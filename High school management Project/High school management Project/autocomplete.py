@@ -0,0 +1,143 @@
+# School Management System (GUI-Based using tkinter)
+# Module: Autocomplete
+# Data Storage: students.json, teachers.json, grades.json or subjects.json,
+#               read through core.indexes
+# Libraries: tkinter, core.indexes, task_runner
+#
+# Drop-down of matching keys under an ID entry of the score and enrollment
+# forms. Every keystroke matches the text typed so far against a snapshot of
+# the collection's keys (indexes.Completions): one bisect over a sorted
+# tuple in memory, with no lock and no file read, so typing never waits on
+# another window's save or CSV import. Down moves into the list, Return or a
+# click takes the highlighted key, Escape closes it. An entry whose text
+# matches no key turns red before the form is even saved.
+#
+# The snapshot is taken on the task runner when the window opens and again
+# each time the entry gets focus, which picks up keys other windows added;
+# the keystrokes in between use the one they have.
+
+import tkinter as tk
+from tkinter import messagebox
+from core import indexes
+from task_runner import run_in_background
+
+ROWS = 8
+NO_MATCH_BG = "#fdecea"
+HIDE_DELAY_MS = 150  # lets a click on the list land before focus-out hides it
+
+# Keys that move or select rather than change the text
+IGNORED_KEYS = {"Up", "Down", "Left", "Right", "Return", "KP_Enter", "Escape", "Tab",
+                "Shift_L", "Shift_R", "Control_L", "Control_R", "Alt_L", "Alt_R", "Home", "End"}
+
+class Autocomplete:
+    def __init__(self, entry, filename):
+        self.entry = entry
+        self.filename = filename
+        self.background = entry.cget("bg")
+        self.popup = None
+        self.listbox = None
+        self.completions = None
+        self.loading = False
+
+        entry.bind("<KeyRelease>", self.on_key, add="+")
+        entry.bind("<FocusIn>", lambda event: self.refresh(), add="+")
+        entry.bind("<Down>", self.focus_list, add="+")
+        entry.bind("<Escape>", lambda event: self.hide(), add="+")
+        entry.bind("<FocusOut>", lambda event: entry.after(HIDE_DELAY_MS, self.hide_unless_focused), add="+")
+        self.refresh()
+
+    # ========== Snapshot ==========
+    def refresh(self):
+        if self.loading:
+            return
+        self.loading = True
+        run_in_background(self.entry.winfo_toplevel(), f"Loading {self.filename} keys", indexes.completions,
+                          self.filename, on_done=self.loaded, on_error=self.load_failed)
+
+    def loaded(self, completions):
+        self.loading = False
+        changed = completions is not self.completions
+        self.completions = completions
+        if changed and self.entry.focus_get() is self.entry:
+            self.update()
+
+    def load_failed(self, error):
+        self.loading = False
+        messagebox.showerror("Error", f"Reading {self.filename} keys failed:\n{error}", parent=self.entry.winfo_toplevel())
+
+    # ========== Matching ==========
+    def on_key(self, event):
+        if event.keysym in IGNORED_KEYS:
+            return
+        self.update()
+
+    def update(self):
+        text = self.entry.get().strip()
+        if not text or self.completions is None:
+            self.reset()
+            return
+        matches = self.completions.match(text, ROWS)
+        # A lone exact match needs no list
+        if not matches or (len(matches) == 1 and matches[0] == text):
+            self.entry.configure(bg=self.background if matches else NO_MATCH_BG)
+            self.hide()
+            return
+        self.entry.configure(bg=self.background)
+        self.show(matches)
+
+    # ========== Drop-Down ==========
+    def show(self, matches):
+        if self.popup is None:
+            self.popup = tk.Toplevel(self.entry)
+            self.popup.overrideredirect(True)
+            self.listbox = tk.Listbox(self.popup, font=("Arial", 10), bg="white", bd=1, relief=tk.SOLID,
+                                      selectbackground="#3498db", selectforeground="white", activestyle="none")
+            self.listbox.pack(fill=tk.BOTH, expand=True)
+            self.listbox.bind("<ButtonRelease-1>", lambda event: self.choose())
+            self.listbox.bind("<Return>", lambda event: self.choose())
+            self.listbox.bind("<Escape>", lambda event: self.cancel())
+            self.listbox.bind("<FocusOut>", lambda event: self.entry.after(HIDE_DELAY_MS, self.hide_unless_focused))
+        self.listbox.delete(0, tk.END)
+        for match in matches:
+            self.listbox.insert(tk.END, match)
+        self.listbox.configure(height=len(matches))
+        x = self.entry.winfo_rootx()
+        y = self.entry.winfo_rooty() + self.entry.winfo_height()
+        self.popup.geometry(f"{self.entry.winfo_width()}x{self.listbox.winfo_reqheight()}+{x}+{y}")
+        self.popup.deiconify()
+        self.popup.lift()
+
+    def reset(self):
+        # After the form clears the entry
+        self.entry.configure(bg=self.background)
+        self.hide()
+
+    def hide(self):
+        if self.popup is not None:
+            self.popup.withdraw()
+
+    def hide_unless_focused(self):
+        if self.entry.focus_get() not in (self.entry, self.listbox):
+            self.hide()
+
+    def focus_list(self, event):
+        if self.popup is None or not self.popup.winfo_viewable():
+            return
+        self.listbox.focus_set()
+        self.listbox.selection_clear(0, tk.END)
+        self.listbox.selection_set(0)
+        self.listbox.activate(0)
+        return "break"
+
+    def choose(self):
+        selection = self.listbox.curselection()
+        if selection:
+            self.entry.delete(0, tk.END)
+            self.entry.insert(0, self.listbox.get(selection[0]))
+            self.entry.configure(bg=self.background)
+        self.cancel()
+
+    def cancel(self):
+        self.hide()
+        self.entry.focus_set()
+        self.entry.icursor(tk.END)
@@ -0,0 +1,315 @@
+# School Management System
+# Module: Command Line Interface
+# Data Storage: same JSON files / database as the GUI
+# Libraries: argparse, json, os, sys, core
+#
+# Runs reports and bulk operations without a display, e.g. from cron:
+#
+#     python cli.py report all
+#     python cli.py report average-score-per-subject --json
+#     python cli.py report-cards cards/ --format html --workers 4
+#     python cli.py stats --by grade
+#     python cli.py list students
+#     python cli.py search students tub
+#     python cli.py add scores student_id=7771 subject=math teacher_id=001 score=88
+#     python cli.py load scores new_scores.json
+#     python cli.py import-csv scores term_scores.csv
+#     python cli.py compact
+#     python cli.py rebuild-aggregates
+#     python cli.py sqlite-import
+#     python cli.py scores-format binary
+#     python cli.py field-codes on
+#     python cli.py --data-dir /tmp/big generate 100000 --seed 7
+#     python cli.py benchmark 1000 10000 --out baseline.json
+#
+# Use --data-dir to point at the folder holding the data files.
+
+import argparse
+import json
+import os
+import sys
+from core import config, storage, reports, report_engine, report_cards, analytics, aggregates, bulk_import, occupancy, search
+from core.entities import ENTITIES
+from core.records import to_json
+from core.errors import ValidationError
+
+# ========== Commands ==========
+def cmd_report(args):
+    if args.name == "all":
+        # One pass over each collection for every report
+        rows = report_engine.run_all()
+    else:
+        title, data, text = reports.run_report(args.name)
+        rows = [(args.name, title, data, text)]
+    if args.json:
+        results = {name: data for name, _, data, _ in rows}
+        json.dump(results if args.name == "all" else results[args.name], sys.stdout, indent=4, default=to_json)
+        print()
+    else:
+        for _, title, _, text in rows:
+            print(f"== {title} ==")
+            print(text.rstrip("\n"))
+            print()
+    return 0
+
+def cmd_report_cards(args):
+    formats = report_cards.FORMATS if args.format == "both" else [args.format]
+    cards, files = report_cards.generate_all(args.out_dir, formats, args.workers)
+    print(f"{cards} report cards written to {args.out_dir} ({files} files).")
+    return 0
+
+def cmd_stats(args):
+    try:
+        stats = analytics.score_stats(args.by, args.pass_mark)
+    except RuntimeError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    if args.json:
+        json.dump(stats, sys.stdout, indent=4)
+        print()
+    else:
+        print(analytics.render_score_stats(stats))
+    return 0
+
+def cmd_list(args):
+    _, list_records, describe = ENTITIES[args.collection]
+    records = list_records()
+    if args.json:
+        json.dump(records, sys.stdout, indent=4, default=to_json)
+        print()
+    else:
+        for r in records:
+            print(describe(r))
+    return 0
+
+def cmd_search(args):
+    _, _, describe = ENTITIES[args.collection]
+    results = search.search(f"{args.collection}.json", " ".join(args.query), args.limit)
+    if args.json:
+        json.dump(results, sys.stdout, indent=4, default=to_json)
+        print()
+    else:
+        for r in results:
+            print(describe(r))
+        if not results:
+            print("No matches.")
+    return 0
+
+def cmd_add(args):
+    add, _, _ = ENTITIES[args.collection]
+    values = {}
+    for pair in args.values:
+        field, sep, value = pair.partition("=")
+        if not sep:
+            print(f"Expected field=value, got {pair!r}", file=sys.stderr)
+            return 2
+        values[field] = value
+    try:
+        add(values)
+    except ValidationError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    print("Added.")
+    return 0
+
+def cmd_load(args):
+    # Bulk add from a JSON array of records; each goes through the same
+    # validation as the form, and rejected records are listed
+    add, _, _ = ENTITIES[args.collection]
+    with open(args.file, 'r') as f:
+        records = json.load(f)
+    added = 0
+    rejected = 0
+    for i, values in enumerate(records, start=1):
+        try:
+            add({k: str(v) if not isinstance(v, list) else v for k, v in values.items()})
+            added += 1
+        except ValidationError as e:
+            rejected += 1
+            print(f"Record {i}: {e}", file=sys.stderr)
+    print(f"{added} added, {rejected} rejected.")
+    return 1 if rejected else 0
+
+def cmd_import_csv(args):
+    try:
+        result = bulk_import.import_csv(args.collection, args.file)
+    except ValidationError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    for line, message in result.rejected:
+        print(f"Line {line}: {message}", file=sys.stderr)
+    print(f"{result.accepted} imported, {len(result.rejected)} rejected.")
+    return 1 if result.rejected else 0
+
+def cmd_compact(args):
+    if storage.BACKEND != "json":
+        print("Compaction only applies to the JSON backend.")
+        return 0
+    unknown = [c for c in args.collections if c not in ENTITIES]
+    if unknown:
+        print(f"Unknown collection: {', '.join(unknown)}", file=sys.stderr)
+        return 2
+    filenames = [f"{c}.json" for c in (args.collections or ENTITIES)]
+    for filename in filenames:
+        storage.compact(filename)
+        print(f"{filename}: compacted")
+    return 0
+
+def cmd_rebuild_aggregates(args):
+    if storage.BACKEND != "json":
+        print("Aggregates are only kept for the JSON backend.")
+    else:
+        for filename in aggregates.AGGREGATES:
+            agg = aggregates.rebuild(filename)
+            print(f"{filename}: {agg['records']} records")
+    seated = occupancy.rebuild()
+    print(f"{occupancy.SEAT_LOG}: {sum(seated.values())} students seated")
+    return 0
+
+def cmd_sqlite_import(args):
+    from core import sqlite_backend
+    for filename, n in sqlite_backend.import_json().items():
+        print(f"{filename}: {n} records imported")
+    return 0
+
+def cmd_scores_format(args):
+    # Converts the score data; the "score_format" setting chooses which
+    # copy the program uses
+    from core import score_binary
+    try:
+        if args.format == "binary":
+            n = score_binary.from_json()
+            print(f"{n} scores written to {score_binary.BIN_FILE}.")
+        else:
+            n = score_binary.to_json()
+            print(f"{n} scores written to {score_binary.COLLECTION}.")
+    except ValueError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    if config.get("score_format") != args.format:
+        print(f'Set "score_format": "{args.format}" in {config.CONFIG_FILE} to use it.')
+    return 0
+
+def cmd_field_codes(args):
+    # Rewrites the JSON collections; the "field_codes" setting decides the
+    # format of later rewrites
+    if storage.BACKEND != "json":
+        print("Field codes only apply to the JSON backend.")
+        return 0
+    encode = args.state == "on"
+    for filename in [f"{c}.json" for c in ENTITIES]:
+        n = storage.set_field_codes(filename, encode)
+        if n is not None:
+            print(f"{filename}: {n} records {'encoded' if encode else 'decoded'}")
+    if config.get("field_codes") != encode:
+        print(f'Set "field_codes": {"true" if encode else "false"} in {config.CONFIG_FILE} to keep it.')
+    return 0
+
+def cmd_generate(args):
+    from core import datagen
+    for filename, n in datagen.generate(args.students, args.seed).items():
+        print(f"{filename}: {n} records")
+    return 0
+
+def cmd_benchmark(args):
+    from core import benchmark
+    results = benchmark.run(args.sizes, args.seed, args.runs, args.adds, args.keep)
+    print(benchmark.render_results(results))
+    if args.out:
+        benchmark.save_results(results, args.out)
+        print(f"Results written to {args.out}")
+    return 0
+
+# ========== Argument Parsing ==========
+def build_parser():
+    parser = argparse.ArgumentParser(description="School Management System (headless)")
+    parser.add_argument("--data-dir", help="folder holding the data files (default: current folder)")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("report", help="run a dashboard report")
+    p.add_argument("name", choices=["all"] + list(reports.REPORTS))
+    p.add_argument("--json", action="store_true", help="print the report data as JSON")
+    p.set_defaults(func=cmd_report)
+
+    p = sub.add_parser("report-cards", help="write every student's report card to a folder")
+    p.add_argument("out_dir")
+    p.add_argument("--format", choices=report_cards.FORMATS + ["both"], default="both")
+    p.add_argument("--workers", type=int, help="worker processes (default: one per CPU)")
+    p.set_defaults(func=cmd_report_cards)
+
+    p = sub.add_parser("stats", help="score statistics per subject, teacher or grade (needs numpy)")
+    p.add_argument("--by", choices=analytics.GROUPINGS, default="subject")
+    p.add_argument("--pass-mark", type=float, help="default: the pass_mark setting")
+    p.add_argument("--json", action="store_true")
+    p.set_defaults(func=cmd_stats)
+
+    p = sub.add_parser("list", help="list the records of a collection")
+    p.add_argument("collection", choices=list(ENTITIES))
+    p.add_argument("--json", action="store_true")
+    p.set_defaults(func=cmd_list)
+
+    p = sub.add_parser("search", help="full-text search of students, teachers or subjects, best match first")
+    p.add_argument("collection", choices=[c for c in ENTITIES if f"{c}.json" in search.SEARCH_FIELDS])
+    p.add_argument("query", nargs="+")
+    p.add_argument("--limit", type=int, default=search.RESULT_LIMIT)
+    p.add_argument("--json", action="store_true")
+    p.set_defaults(func=cmd_search)
+
+    p = sub.add_parser("add", help="add one record")
+    p.add_argument("collection", choices=list(ENTITIES))
+    p.add_argument("values", nargs="+", metavar="field=value")
+    p.set_defaults(func=cmd_add)
+
+    p = sub.add_parser("load", help="add every record of a JSON array file")
+    p.add_argument("collection", choices=list(ENTITIES))
+    p.add_argument("file")
+    p.set_defaults(func=cmd_load)
+
+    p = sub.add_parser("import-csv", help="bulk import a CSV file in one commit")
+    p.add_argument("collection", choices=list(bulk_import.IMPORTS))
+    p.add_argument("file")
+    p.set_defaults(func=cmd_import_csv)
+
+    p = sub.add_parser("compact", help="fold append logs back into the JSON files")
+    p.add_argument("collections", nargs="*", metavar="collection", help="default: all")
+    p.set_defaults(func=cmd_compact)
+
+    p = sub.add_parser("rebuild-aggregates", help="recompute the report aggregates and grade occupancy from the raw data")
+    p.set_defaults(func=cmd_rebuild_aggregates)
+
+    p = sub.add_parser("sqlite-import", help="copy the JSON files into the SQLite database")
+    p.set_defaults(func=cmd_sqlite_import)
+
+    p = sub.add_parser("scores-format", help="convert scores between scores.json and the binary scores.bin")
+    p.add_argument("format", choices=["binary", "json"], help="format to convert to")
+    p.set_defaults(func=cmd_scores_format)
+
+    p = sub.add_parser("field-codes", help="store grade, status and other repeated fields as codes on disk, or as text")
+    p.add_argument("state", choices=["on", "off"])
+    p.set_defaults(func=cmd_field_codes)
+
+    p = sub.add_parser("generate", help="replace all data with generated records (for load tests)")
+    p.add_argument("students", type=int, help="number of students; other collections scale with it")
+    p.add_argument("--seed", type=int, default=0)
+    p.set_defaults(func=cmd_generate)
+
+    p = sub.add_parser("benchmark", help="time the hot paths on generated data in scratch folders")
+    p.add_argument("sizes", type=int, nargs="+", metavar="students")
+    p.add_argument("--seed", type=int, default=0)
+    p.add_argument("--runs", type=int, default=3, help="timed runs per case")
+    p.add_argument("--adds", type=int, default=20, help="inserts timed per add_* function")
+    p.add_argument("--keep", action="store_true", help="keep the scratch folders")
+    p.add_argument("--out", help="write the results to this JSON file")
+    p.set_defaults(func=cmd_benchmark)
+    return parser
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    if args.data_dir:
+        os.chdir(args.data_dir)
+        config.reload()
+        storage.BACKEND = config.get("backend")
+    return args.func(args)
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,6 @@
+# School Management System
+# Package: core
+#
+# GUI-free logic shared by the Tk modules, the dashboard and cli.py:
+# storage backends, entity add/list functions and reports. Nothing in this
+# package imports tkinter, so it can be scripted or run from cron.
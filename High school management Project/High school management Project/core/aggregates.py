@@ -0,0 +1,121 @@
+# School Management System
+# Module: Materialized Aggregates (core)
+# Data Storage: aggregate file per collection (<name>.json.agg)
+# Libraries: json, os, storage
+#
+# Running totals kept next to the data so the dashboard reports read a few
+# groups instead of every record: students per grade, enrollments per status,
+# score sum and count per subject, and the record count of each collection.
+# The add_* functions call record_added inside the collection lock right
+# after appending. A missing file (e.g. after save_data), or one older than
+# the data (a hand edit, a compaction), is rebuilt from the raw data on next
+# use; "python cli.py rebuild-aggregates" forces a rebuild.
+#
+# With the SQLite backend the reports already run as GROUP BY queries, so
+# these calls go straight to storage and no files are kept.
+
+import json
+import os
+from core import storage
+
+# collection -> [(group field, summed field or None)]
+AGGREGATES = {
+    "students.json": [("grade", None)],
+    "teachers.json": [],
+    "subjects.json": [],
+    "scores.json": [("subject", "score")],
+    "enrollments.json": [("status", None)],
+}
+
+def aggregate_path(filename):
+    return filename + ".agg"
+
+# ========== Building ==========
+def _empty(filename):
+    return {"records": 0, "groups": {field: {} for field, _ in AGGREGATES[filename]}}
+
+def _add(agg, filename, record):
+    agg["records"] += 1
+    for field, summed in AGGREGATES[filename]:
+        group = agg["groups"][field].setdefault(str(record.get(field, "Unknown")), [0, 0.0])
+        group[0] += 1
+        if summed is not None:
+            group[1] += record.get(summed, 0)
+
+def _write(filename, agg):
+    path = aggregate_path(filename)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, 'w') as f:
+        json.dump(agg, f)
+    os.replace(tmp, path)
+
+def rebuild(filename):
+    with storage.collection_lock(filename):
+        agg = _empty(filename)
+        for record in storage.iter_records(filename):
+            _add(agg, filename, record)
+        _write(filename, agg)
+    return agg
+
+def rebuild_all():
+    if storage.BACKEND == "sqlite":
+        return
+    for filename in AGGREGATES:
+        rebuild(filename)
+
+def _stale(filename, check_log=True):
+    built = storage.mtime(aggregate_path(filename))
+    if built is None:
+        return True
+    data_paths = [filename, storage.log_path(filename)] if check_log else [filename]
+    for data_path in data_paths:
+        modified = storage.mtime(data_path)
+        if modified is not None and modified > built:
+            return True
+    return False
+
+def load(filename):
+    storage.recover(filename)
+    path = aggregate_path(filename)
+    with storage.collection_lock(filename):
+        if _stale(filename):
+            return rebuild(filename)
+        with open(path, 'r') as f:
+            return json.load(f)
+
+def record_added(filename, record):
+    records_added(filename, [record])
+
+def records_added(filename, records):
+    # Call with the collection lock held, right after the records are appended
+    if storage.BACKEND == "sqlite" or filename not in AGGREGATES:
+        return
+    with storage.collection_lock(filename):
+        path = aggregate_path(filename)
+        # The append just made the log newer than the file, so only the main
+        # file is compared here
+        if _stale(filename, check_log=False):
+            # The rebuild already sees the new records
+            rebuild(filename)
+            return
+        with open(path, 'r') as f:
+            agg = json.load(f)
+        for record in records:
+            _add(agg, filename, record)
+        _write(filename, agg)
+
+# ========== Queries ==========
+def count(filename):
+    if storage.BACKEND == "sqlite":
+        return storage.count(filename)
+    return load(filename)["records"]
+
+def count_by(filename, field):
+    if storage.BACKEND == "sqlite":
+        return storage.count_by(filename, field)
+    return {g: v[0] for g, v in load(filename)["groups"][field].items()}
+
+def average_by(filename, group_field, value_field):
+    if storage.BACKEND == "sqlite":
+        return storage.average_by(filename, group_field, value_field)
+    return {g: v[1] / v[0] for g, v in load(filename)["groups"][group_field].items()}
@@ -0,0 +1,165 @@
+# School Management System
+# Module: Score Analytics (core)
+# Data Storage: scores.json, students.json (read only)
+# Libraries: numpy (optional), storage, config
+#
+# Score statistics computed on columns instead of record dicts. scores.json
+# is converted once into a float64 array of scores plus int32 codes for
+# student_id, subject and teacher_id (each code indexes a list of the
+# distinct values). Every statistic is then a handful of vectorized calls
+# over those arrays: count, mean, std, median, percentiles, a histogram and
+# the pass rate, grouped by subject, by teacher, or by the student's grade
+# (joined through students.json).
+#
+# The columns are rebuilt only when scores.json or students.json change.
+# With the binary score format the mapped file is used as the columns as is.
+# numpy is needed only for this module:  pip install numpy
+
+from core import storage, config
+
+GROUPINGS = ["subject", "teacher", "grade"]
+PERCENTILES = [25, 50, 75, 90]
+HISTOGRAM_EDGES = [0, 10, 20, 30, 40, 50, 60, 70, 80, 90, 100]
+
+def _numpy():
+    try:
+        import numpy
+    except ImportError:
+        raise RuntimeError("Score analytics need numpy (pip install numpy).")
+    return numpy
+
+# ========== Columns ==========
+class ScoreColumns:
+    def __init__(self, scores, students):
+        np = _numpy()
+        if hasattr(scores, "records_buffer"):
+            self._from_binary(np, scores)
+        else:
+            self._from_records(np, scores)
+
+        # Grade of every student code, so a score's grade is one array lookup
+        grade_of = {s.get("student_id"): s.get("grade", "Unknown") for s in students}
+        self.grades, grade_codes = [], {}
+        student_grade = np.array(
+            [_code(grade_codes, self.grades, grade_of.get(sid, "Unknown")) for sid in self.student_ids],
+            dtype=np.int32,
+        )
+        self.grade = student_grade[self.student] if len(self.student) else np.empty(0, dtype=np.int32)
+
+    def _from_binary(self, np, scores):
+        # scores.bin is already columns of codes: view the mapped records
+        # directly, without decoding a single one
+        dtype = np.dtype([("student", "<u4"), ("subject", "<u4"), ("teacher", "<u4"), ("score", "<f4")])
+        records = np.frombuffer(scores.records_buffer(), dtype=dtype)
+        self.student_ids, self.subjects, self.teachers = scores.strings
+        self.score = records["score"].astype(np.float64)
+        self.student = records["student"].astype(np.int32)
+        self.subject = records["subject"].astype(np.int32)
+        self.teacher = records["teacher"].astype(np.int32)
+
+    def _from_records(self, np, scores):
+        self.student_ids, student_codes = [], {}
+        self.subjects, subject_codes = [], {}
+        self.teachers, teacher_codes = [], {}
+        n = len(scores)
+        score = np.empty(n, dtype=np.float64)
+        student = np.empty(n, dtype=np.int32)
+        subject = np.empty(n, dtype=np.int32)
+        teacher = np.empty(n, dtype=np.int32)
+        for i, s in enumerate(scores):
+            score[i] = s.get("score", 0)
+            student[i] = _code(student_codes, self.student_ids, s.get("student_id", "Unknown"))
+            subject[i] = _code(subject_codes, self.subjects, s.get("subject", "Unknown"))
+            teacher[i] = _code(teacher_codes, self.teachers, s.get("teacher_id", "Unknown"))
+        self.score, self.student, self.subject, self.teacher = score, student, subject, teacher
+
+    def group(self, by):
+        # (codes per score, names per code)
+        if by == "subject":
+            return self.subject, self.subjects
+        if by == "teacher":
+            return self.teacher, self.teachers
+        if by == "grade":
+            return self.grade, self.grades
+        raise ValueError(f"Unknown grouping: {by}")
+
+def _code(codes, names, value):
+    code = codes.get(value)
+    if code is None:
+        code = codes[value] = len(names)
+        names.append(value)
+    return code
+
+_columns = {"scores": None, "students": None, "columns": None}
+
+def load_columns():
+    scores = storage.snapshot("scores.json")
+    students = storage.snapshot("students.json")
+    if _columns["scores"] is not scores or _columns["students"] is not students:
+        _columns.update(scores=scores, students=students, columns=ScoreColumns(scores, students))
+    return _columns["columns"]
+
+# ========== Statistics ==========
+def score_stats(by="subject", pass_mark=None):
+    # {group: {"count", "mean", "std", "min", "max", "median", "p25", ...,
+    #          "pass_rate", "histogram"}} with histogram counts per
+    # HISTOGRAM_EDGES bin
+    np = _numpy()
+    if pass_mark is None:
+        pass_mark = config.get("pass_mark")
+    columns = load_columns()
+    codes, names = columns.group(by)
+    groups = len(names)
+    if not len(codes):
+        return {}
+
+    counts = np.bincount(codes, minlength=groups)
+    sums = np.bincount(codes, weights=columns.score, minlength=groups)
+    squares = np.bincount(codes, weights=columns.score * columns.score, minlength=groups)
+    passed = np.bincount(codes, weights=(columns.score >= pass_mark).astype(np.float64), minlength=groups)
+    present = counts > 0
+    means = np.divide(sums, counts, out=np.zeros(groups), where=present)
+    variances = np.divide(squares, counts, out=np.zeros(groups), where=present) - means * means
+    stds = np.sqrt(np.maximum(variances, 0))
+
+    # Histogram of every group at once: one bincount over (group, bin) pairs
+    bins = len(HISTOGRAM_EDGES) - 1
+    bin_of = np.clip(np.searchsorted(HISTOGRAM_EDGES, columns.score, side="right") - 1, 0, bins - 1)
+    histograms = np.bincount(codes * bins + bin_of, minlength=groups * bins).reshape(groups, bins)
+
+    # Order statistics: sort by (group, score) once, then each group is a
+    # contiguous slice
+    order = np.lexsort((columns.score, codes))
+    ordered = columns.score[order]
+    ends = np.cumsum(counts)
+    starts = ends - counts
+
+    results = {}
+    for code, name in enumerate(names):
+        if not present[code]:
+            continue
+        values = ordered[starts[code]:ends[code]]
+        quantiles = np.percentile(values, PERCENTILES)
+        row = {
+            "count": int(counts[code]),
+            "mean": float(means[code]),
+            "std": float(stds[code]),
+            "min": float(values[0]),
+            "max": float(values[-1]),
+            "median": float(np.median(values)),
+        }
+        for p, q in zip(PERCENTILES, quantiles):
+            row[f"p{p}"] = float(q)
+        row["pass_rate"] = float(passed[code] / counts[code])
+        row["histogram"] = [int(c) for c in histograms[code]]
+        results[name] = row
+    return results
+
+def render_score_stats(stats):
+    lines = []
+    for name, row in stats.items():
+        lines.append(
+            f"{name}: n={row['count']} mean={row['mean']:.2f} median={row['median']:.2f} "
+            f"std={row['std']:.2f} p90={row['p90']:.2f} pass={row['pass_rate'] * 100:.1f}%"
+        )
+    return "\n".join(lines) or "No score records found."
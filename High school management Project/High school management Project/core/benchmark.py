@@ -0,0 +1,197 @@
+# School Management System
+# Module: Benchmark Suite (core)
+# Data Storage: generated data in a scratch folder; results as a JSON file
+# Libraries: json, os, platform, shutil, statistics, subprocess, sys, tempfile,
+#            time, core
+#
+# Times the hot paths on generated data (datagen.py) of one or more sizes:
+# load_data (cold and cached) and save_data for every collection, every add_*
+# function, the text of every list (the describe_* lines and the first page
+# of the list window), searches (index build and query), and every
+# dashboard report alone and all together.
+# Each size runs with the same seed in a fresh scratch folder, and in a
+# process of its own started there: storage keeps per-collection state keyed
+# by relative file name (key indexes, write-behind markers, ...), and the
+# exit handlers that flush it then run in that folder too, so nothing is
+# left behind in the caller's. Two runs of the same version give comparable
+# numbers.
+#
+#     python cli.py benchmark 1000 10000 --out baseline.json
+
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from core import config, storage, datagen, reports, report_engine, search, grades
+from core.cache import collections_cache
+from core.entities import ENTITIES
+
+# collection file -> (add, list, describe)
+COLLECTIONS = {f"{name}.json": functions for name, functions in ENTITIES.items()}
+
+# The folder holding the core package, for the processes run() starts
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# New students and enrollments go to a grade with a seat for each of them
+BENCH_GRADE = "bench"
+
+# Valid form values for the i-th benchmark insert into each collection
+NEW_RECORDS = {
+    "students.json": lambda i: {
+        "student_id": f"B{i:07d}", "name": "Bench Student", "grade": BENCH_GRADE,
+        "dob": "2010/01/01", "gender": "female", "phone": "0770000000", "address": "Broad Street",
+        "email": f"bench{i}@example.com", "guardian_name": "Bench Guardian",
+        "guardian_phone": "0770000001", "registered_at": "2025/01/01",
+    },
+    "teachers.json": lambda i: {
+        "Teacher_id": f"BT{i:06d}", "name": "Bench Teacher", "age": "40", "dob": "1985/01/01",
+        "gender": "m", "phone": "0770000002", "salary": "5000", "employment_date": "2020/01/01",
+        "courses": "math",
+    },
+    "grades.json": lambda i: {
+        "name": f"bench-{i}", "description": "benchmark grade", "level": "junior",
+        "class_teacher": datagen.teacher_id(0), "capacity": "40",
+    },
+    "subjects.json": lambda i: {
+        "name": f"bench subject {i}", "grades": "7th, 8th", "category": "science",
+        "description": "benchmark subject",
+    },
+    "scores.json": lambda i: {
+        "student_id": datagen.student_id(0), "subject": datagen.SUBJECTS[0][0],
+        "teacher_id": datagen.teacher_id(0), "score": "75",
+    },
+    "enrollments.json": lambda i: {
+        "student_id": datagen.student_id(i), "grade": BENCH_GRADE, "status": "Active",
+    },
+    "users.json": lambda i: {
+        "username": f"bench{i:06d}", "password": "secret", "role": "staff",
+        "full_name": "Bench User", "created_at": "2025/01/01",
+    },
+}
+
+PAGE_ROWS = 25
+
+# ========== Timing ==========
+def _time(fn, runs, before=None):
+    # Seconds for each of `runs` calls; `before` runs untimed before each
+    samples = []
+    for i in range(runs):
+        if before is not None:
+            before()
+        start = time.perf_counter()
+        fn(i)
+        samples.append(time.perf_counter() - start)
+    return samples
+
+def _result(size, case, samples):
+    return {
+        "size": size,
+        "case": case,
+        "runs": len(samples),
+        "min": min(samples),
+        "median": statistics.median(samples),
+        "max": max(samples),
+    }
+
+# ========== Cases ==========
+def _run_size(size, seed, runs, adds):
+    results = []
+
+    def record(case, samples):
+        results.append(_result(size, case, samples))
+
+    start = time.perf_counter()
+    datagen.generate(size, seed)
+    record("generate", [time.perf_counter() - start])
+
+    for filename in COLLECTIONS:
+        record(f"load_data:{filename}:cold", _time(lambda i: storage.load_data(filename), runs, collections_cache.clear))
+        record(f"load_data:{filename}:cached", _time(lambda i: storage.load_data(filename), runs))
+
+    for filename, (_, list_records, describe) in COLLECTIONS.items():
+        record(f"view:{filename}:text", _time(lambda i: "\n".join(describe(r) for r in list_records()), runs))
+        record(f"view:{filename}:first-page", _time(lambda i: storage.page(filename, 0, PAGE_ROWS), runs))
+
+    for filename in search.SEARCH_FIELDS:
+        # A word of the first record's name: a common word in generated data
+        query = search.words(storage.first(filename).get("name", ""))[0]
+        record(f"search:{filename}:build", _time(lambda i: search.search(filename, query), runs, search.reset))
+        record(f"search:{filename}", _time(lambda i: search.search(filename, query), runs))
+
+    for name in reports.REPORTS:
+        record(f"report:{name}", _time(lambda i: reports.run_report(name), runs))
+    record("report:all", _time(lambda i: report_engine.run_all(), runs))
+
+    grades.add_grade({"name": BENCH_GRADE, "description": "benchmark grade", "level": "junior",
+                      "class_teacher": datagen.teacher_id(0), "capacity": str(2 * adds)})
+    for filename, (add, _, _) in COLLECTIONS.items():
+        make = NEW_RECORDS[filename]
+        record(f"add:{filename}", _time(lambda i: add(make(i)), adds))
+
+    # Last: a full rewrite drops the derived files the other cases use
+    for filename in COLLECTIONS:
+        data = storage.load_data(filename)
+        record(f"save_data:{filename}", _time(lambda i: storage.save_data(filename, data), runs))
+    return results
+
+def _run_in_folder(folder, size, seed, runs, adds):
+    # _run_size in a new process started in folder, with this process's
+    # settings (it finds no config.json there)
+    env = dict(os.environ)
+    for name, value in config.settings.items():
+        if name in config.DEFAULTS:
+            env["SCHOOL_" + name.upper()] = str(value)
+    env["PYTHONPATH"] = os.pathsep.join([ROOT] + [p for p in [env.get("PYTHONPATH")] if p])
+    command = [sys.executable, "-m", "core.benchmark", str(size), str(seed), str(runs), str(adds)]
+    done = subprocess.run(command, cwd=folder, env=env, capture_output=True, text=True)
+    if done.returncode != 0:
+        raise RuntimeError(f"Benchmark of {size} students failed:\n{done.stderr}")
+    return json.loads(done.stdout)
+
+def run(sizes, seed=0, runs=3, adds=20, keep=False):
+    # Returns {"meta": ..., "results": [...]}; every size runs in its own
+    # scratch folder, removed afterwards unless keep is set
+    results = []
+    for size in sizes:
+        folder = tempfile.mkdtemp(prefix=f"school-bench-{size}-")
+        try:
+            results.extend(_run_in_folder(folder, size, seed, runs, adds))
+        finally:
+            if not keep:
+                shutil.rmtree(folder, ignore_errors=True)
+    return {
+        "meta": {
+            "created": datetime.now().isoformat(timespec="seconds"),
+            "sizes": list(sizes),
+            "seed": seed,
+            "runs": runs,
+            "adds": adds,
+            "backend": storage.BACKEND,
+            "score_format": config.get("score_format"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+        },
+        "results": results,
+    }
+
+def save_results(results, path):
+    with open(path, 'w') as f:
+        json.dump(results, f, indent=4)
+
+def render_results(results):
+    lines = [f"{'size':>8}  {'case':<48} {'median ms':>10} {'max ms':>10}"]
+    for r in results["results"]:
+        lines.append(f"{r['size']:>8}  {r['case']:<48} {r['median'] * 1000:>10.2f} {r['max'] * 1000:>10.2f}")
+    return "\n".join(lines)
+
+if __name__ == "__main__":
+    # One size, run by _run_in_folder in the scratch folder; the results go
+    # to stdout as JSON
+    size, seed, runs, adds = map(int, sys.argv[1:])
+    json.dump(_run_size(size, seed, runs, adds), sys.stdout)
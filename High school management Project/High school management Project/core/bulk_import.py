@@ -0,0 +1,136 @@
+# School Management System
+# Module: Bulk CSV Import (core)
+# Data Storage: students.json, scores.json, enrollments.json
+# Libraries: contextlib, csv, storage, indexes, aggregates, integrity, occupancy
+#
+# Streams a CSV file (header row with the collection's field names) in
+# batches, validates each row with the same checks as the forms (references
+# are checked against one snapshot of the referenced key sets), and then
+# appends every accepted row in one write. Rejected rows are reported with
+# their line number in the file and nothing is written for them. Students and
+# enrollments also need a seat in their grade (occupancy.py); rows are
+# admitted against a copy of the counters, so a file can fill a grade but
+# not overfill it.
+
+import csv
+from contextlib import nullcontext
+from core import storage, indexes, aggregates, occupancy
+from core import students, scores, enrollments
+from core.errors import ValidationError
+from core.integrity import check_references, referenced_collections
+
+BATCH_ROWS = 5000
+
+class ImportResult:
+    def __init__(self):
+        self.accepted = 0
+        self.rejected = []  # [(line number, message)]
+
+class _Seats:
+    # The import's own view of the grade occupancy. The seat changes are
+    # recorded only once the rows are saved.
+    def __init__(self):
+        self.state = occupancy.planner()
+        self.changes = []
+        self.waitlisted = []  # enrollments for new students whose grade is full
+
+    def change(self, change):
+        self.state.apply(change)
+        self.changes.append(change)
+
+    def student(self, student):
+        if occupancy.admit(student["grade"], student["student_id"], self.state):
+            self.change(["s", student["student_id"], student["grade"]])
+        else:
+            self.waitlisted.append(enrollments.make_enrollment(
+                {"student_id": student["student_id"], "grade": student["grade"], "status": occupancy.WAITLISTED}))
+
+    def enrollment(self, enrollment):
+        if occupancy.is_seated_status(enrollment["status"]) and not occupancy.admit(enrollment["grade"], enrollment["student_id"], self.state):
+            enrollment["status"] = occupancy.WAITLISTED
+        change = self.state.enrollment_change(enrollment)
+        if change is not None:
+            self.change(change)
+
+# ========== Row Checks ==========
+# Each check gets the row values, the reference key sets and the seats, and
+# returns the record to store or raises ValidationError.
+def _check_student(values, refs, seats):
+    student = students.make_student(values)
+    if student["student_id"] in refs["students.json"]:
+        raise ValidationError("Student ID already exists.")
+    seats.student(student)
+    # Also catches the same ID twice in one file
+    refs["students.json"][student["student_id"]] = student["student_id"]
+    return student
+
+def _check_score(values, refs, seats):
+    score = scores.make_score(values)
+    check_references(scores.FILENAME, score, refs)
+    return score
+
+def _check_enrollment(values, refs, seats):
+    enrollment = enrollments.make_enrollment(values)
+    check_references(enrollments.FILENAME, enrollment, refs)
+    seats.enrollment(enrollment)
+    return enrollment
+
+# collection -> (data file, required columns, key sets needed, check)
+IMPORTS = {
+    "students": (students.FILENAME, students.FIELDS, ["students.json"], _check_student),
+    "scores": (scores.FILENAME, scores.FIELDS, referenced_collections(scores.FILENAME), _check_score),
+    "enrollments": (enrollments.FILENAME, ["student_id", "grade", "status"], referenced_collections(enrollments.FILENAME), _check_enrollment),
+}
+
+# ========== Reading ==========
+def _batches(reader):
+    batch = []
+    for row in reader:
+        values = {k: (v or "").strip() for k, v in row.items() if k}
+        batch.append((reader.line_num, values))
+        if len(batch) >= BATCH_ROWS:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+# ========== Import ==========
+def import_csv(collection, path):
+    filename, required, references, check = IMPORTS[collection]
+    result = ImportResult()
+    accepted = []
+
+    # Held from the key snapshot to the commit so a clerk adding the same
+    # student ID, or taking the last seat, in a window cannot slip in between.
+    # Only student and enrollment rows take seats; the seat lock comes first
+    # for them, as in add_student, and a scores import leaves it free.
+    takes_seats = filename in storage.SHARED_DERIVED
+    with occupancy.lock() if takes_seats else nullcontext(), storage.collection_lock(filename):
+        refs = {ref: indexes.key_map(ref) for ref in references}
+        seats = _Seats() if takes_seats else None
+
+        with open(path, 'r', newline='', encoding='utf-8-sig') as f:
+            reader = csv.DictReader(f)
+            missing = [c for c in required if c not in (reader.fieldnames or [])]
+            if missing:
+                raise ValidationError(f"Missing columns: {', '.join(missing)}")
+            for batch in _batches(reader):
+                for line, values in batch:
+                    try:
+                        accepted.append(check(values, refs, seats))
+                    except ValidationError as e:
+                        result.rejected.append((line, str(e)))
+
+        if accepted:
+            if filename in indexes.PRIMARY_KEYS:
+                indexes.add_many(filename, accepted)
+            else:
+                storage.append_records(filename, accepted)
+            aggregates.records_added(filename, accepted)
+        if seats is not None:
+            if seats.waitlisted:
+                storage.append_records(enrollments.FILENAME, seats.waitlisted)
+                aggregates.records_added(enrollments.FILENAME, seats.waitlisted)
+            occupancy.commit(seats.changes)
+    result.accepted = len(accepted)
+    return result
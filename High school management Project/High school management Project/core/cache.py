@@ -0,0 +1,72 @@
+# School Management System
+# Module: Collection Cache (core)
+# Data Storage: in memory only
+# Libraries: collections, threading, config
+#
+# Parsed collections kept between calls, so a report or view_* click on
+# unchanged data does no parsing at all. Each entry carries the signature
+# (inode, size, mtime of every file it was read from) that storage.py checks
+# before using it. Entries are evicted least recently used first once the
+# total size of the files they came from passes the "cache_max_mb" setting.
+
+import threading
+from collections import OrderedDict
+from core import config
+
+class CacheEntry:
+    __slots__ = ("signature", "records", "cost")
+
+    def __init__(self, signature, records, cost):
+        self.signature = signature
+        self.records = records
+        self.cost = cost
+
+class CollectionCache:
+    def __init__(self, max_bytes=None):
+        # None follows the "cache_max_mb" setting, read on every use so a
+        # config reloaded for another data folder (cli.py --data-dir) applies
+        self.fixed_max_bytes = max_bytes
+        self.entries = OrderedDict()
+        self.total = 0
+        self.lock = threading.Lock()
+
+    @property
+    def max_bytes(self):
+        if self.fixed_max_bytes is not None:
+            return self.fixed_max_bytes
+        return int(config.get("cache_max_mb") * 1024 * 1024)
+
+    def lookup(self, key):
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is not None:
+                self.entries.move_to_end(key)
+            return entry
+
+    def store(self, key, signature, records, cost):
+        with self.lock:
+            self._discard(key)
+            max_bytes = self.max_bytes
+            if cost > max_bytes:
+                return  # would evict everything else; leave it uncached
+            self.entries[key] = CacheEntry(signature, records, cost)
+            self.total += cost
+            while self.total > max_bytes:
+                oldest = next(iter(self.entries))
+                self._discard(oldest)
+
+    def invalidate(self, key):
+        with self.lock:
+            self._discard(key)
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+            self.total = 0
+
+    def _discard(self, key):
+        entry = self.entries.pop(key, None)
+        if entry is not None:
+            self.total -= entry.cost
+
+collections_cache = CollectionCache()
@@ -0,0 +1,57 @@
+# School Management System
+# Module: Configuration
+# Data Storage: JSON file (config.json), optional
+# Libraries: json, os
+#
+# Settings are read from config.json in the working directory when present.
+# Any setting can be overridden with a SCHOOL_<NAME> environment variable,
+# e.g. SCHOOL_BACKEND=sqlite.
+
+import json
+import os
+
+CONFIG_FILE = "config.json"
+
+DEFAULTS = {
+    "backend": "json",          # "json" or "sqlite"
+    "sqlite_db": "school.db",
+    "score_format": "json",     # "json" or "binary" (core/score_binary.py)
+    "field_codes": False,       # store grade, status, ... as codes on disk (core/storage.py)
+    "cache_max_mb": 64,         # parsed collections kept in memory (core/cache.py)
+    "pass_mark": 50.0,          # lowest passing score (core/analytics.py)
+    "metrics_log": "",          # append timing summaries here (core/metrics.py)
+    "metrics_interval": 60,     # seconds between metrics_log lines
+    "capacity_policy": "reject",  # full grade: "reject" or "waitlist" (core/occupancy.py)
+    "flush_interval": 0.0,      # write-behind: seconds appends may wait for fsync; 0 = fsync each (core/storage.py)
+    "flush_records": 200,       # fsync sooner once this many records wait
+}
+
+def _coerce(value, default):
+    if isinstance(default, bool):
+        return value.strip().lower() in ("1", "true", "yes", "on")
+    if isinstance(default, int):
+        return int(value)
+    if isinstance(default, float):
+        return float(value)
+    return value
+
+def load_config():
+    settings = dict(DEFAULTS)
+    if os.path.exists(CONFIG_FILE):
+        with open(CONFIG_FILE, 'r') as f:
+            settings.update(json.load(f))
+    for name, default in DEFAULTS.items():
+        env = os.environ.get("SCHOOL_" + name.upper())
+        if env is not None:
+            settings[name] = _coerce(env, default)
+    return settings
+
+settings = load_config()
+
+def reload():
+    # Re-read after changing directory (cli.py --data-dir)
+    settings.clear()
+    settings.update(load_config())
+
+def get(name):
+    return settings[name]
@@ -0,0 +1,210 @@
+# School Management System
+# Module: Synthetic Data Generator (core)
+# Data Storage: writes every collection through storage.save_data
+# Libraries: random, storage, enrollments
+#
+# Fills the data files with made-up but consistent records for load testing:
+# every score, enrollment and grade points at a student, teacher, subject or
+# grade that exists. The size is given as a number of students; the other
+# collections scale from it (SCALE). The same seed always gives the same
+# data, and each collection has its own random stream, so changing one ratio
+# does not reshuffle the others. Records are generated and written one at a
+# time; only each student's grade number is kept, for the enrollments.
+#
+#     python cli.py --data-dir /tmp/big generate 100000 --seed 7
+
+import math
+import random
+from core import storage
+from core.enrollments import ACADEMIC_YEAR
+
+# records per student
+SCALE = {
+    "teachers": 1 / 25,
+    "grades": 1 / 35,
+    "users": 1 / 100,
+    "scores": 6,
+    "enrollments": 1,
+}
+
+FIRST_NAMES = ["James", "Mary", "John", "Patricia", "Robert", "Jennifer", "Michael", "Linda",
+               "William", "Elizabeth", "David", "Barbara", "Richard", "Susan", "Joseph", "Jessica",
+               "Thomas", "Sarah", "Charles", "Karen", "Archie", "Janet", "Jerry", "Comfort",
+               "Emmanuel", "Esther", "Samuel", "Grace", "Moses", "Ruth"]
+LAST_NAMES = ["Smith", "Johnson", "Williams", "Brown", "Jones", "Garcia", "Miller", "Davis",
+              "Quewon", "Jaye", "Paye", "Doe", "Kollie", "Flomo", "Kamara", "Sirleaf", "Weah",
+              "Tubman", "Cooper", "Dunbar", "Taylor", "Nyemah", "Togba", "Kpan"]
+STREETS = ["Duport Road", "Voker Mission", "Broad Street", "Tubman Boulevard", "Carey Street",
+           "Randall Street", "Old Road", "Paynesville", "Sinkor", "Congo Town"]
+SUBJECTS = [
+    ("math", "science"), ("english", "language"), ("biology", "science"),
+    ("chemistry", "science"), ("physics", "science"), ("history", "social"),
+    ("geography", "social"), ("social study", "social"), ("french", "language"),
+    ("literature", "art"), ("civics", "social"), ("computer", "science"),
+]
+GRADE_LEVELS = ["7th", "8th", "9th", "10th", "11th", "12th"]
+STATUSES = [("Active", 90), ("Transferred", 6), ("Withdrawn", 4)]
+ROLES = [("teacher", 70), ("staff", 25), ("admin", 5)]
+
+def sizes(students):
+    # {collection file: record count} for a run with `students` students
+    counts = {"students.json": students, "subjects.json": len(SUBJECTS)}
+    for name, ratio in SCALE.items():
+        counts[f"{name}.json"] = max(1, math.ceil(students * ratio))
+    counts["grades.json"] = max(len(GRADE_LEVELS), counts["grades.json"])
+    return counts
+
+# ========== IDs ==========
+# IDs are a function of the record number, so one collection can point at
+# another without keeping it in memory
+def student_id(i):
+    return f"S{i + 1:07d}"
+
+def teacher_id(i):
+    return f"T{i + 1:06d}"
+
+def grade_name(i):
+    # 7th-A, 8th-A, ..., 12th-A, 7th-B, ...
+    level = GRADE_LEVELS[i % len(GRADE_LEVELS)]
+    return f"{level}-{_section(i // len(GRADE_LEVELS))}"
+
+def _section(n):
+    letters = ""
+    n += 1
+    while n:
+        n, r = divmod(n - 1, 26)
+        letters = chr(ord("A") + r) + letters
+    return letters
+
+# ========== Field Values ==========
+def _rng(seed, collection):
+    return random.Random(f"{seed}:{collection}")
+
+def _name(rng):
+    return f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}"
+
+def _date(rng, first_year, last_year):
+    return f"{rng.randint(first_year, last_year)}/{rng.randint(1, 12):02d}/{rng.randint(1, 28):02d}"
+
+def _phone(rng):
+    return "0" + "".join(rng.choice("0123456789") for _ in range(9))
+
+def _weighted(rng, choices):
+    return rng.choices([c for c, _ in choices], weights=[w for _, w in choices])[0]
+
+# ========== Collections ==========
+def gen_teachers(seed, n):
+    rng = _rng(seed, "teachers")
+    for i in range(n):
+        age = rng.randint(24, 64)
+        yield {
+            "Teacher_id": teacher_id(i),
+            "name": _name(rng),
+            "age": str(age),
+            "dob": _date(rng, 2025 - age, 2025 - age),
+            "gender": rng.choice(["m", "f"]),
+            "phone": _phone(rng),
+            "salary": str(rng.randrange(3000, 12000, 250)),
+            "employment_date": _date(rng, 2005, 2025),
+            "courses": rng.choice(SUBJECTS)[0],
+        }
+
+def gen_grades(seed, n, teachers):
+    rng = _rng(seed, "grades")
+    for i in range(n):
+        level = GRADE_LEVELS[i % len(GRADE_LEVELS)]
+        yield {
+            "name": grade_name(i),
+            "description": f"{level} grade, section {_section(i // len(GRADE_LEVELS))}",
+            "level": "junior" if GRADE_LEVELS.index(level) < 3 else "senior",
+            "class_teacher": teacher_id(rng.randrange(teachers)),
+            "capacity": 40,
+        }
+
+def gen_subjects(seed):
+    rng = _rng(seed, "subjects")
+    for name, category in SUBJECTS:
+        first = rng.randrange(len(GRADE_LEVELS))
+        yield {
+            "name": name,
+            "grades": GRADE_LEVELS[first:first + rng.randint(2, 4)],
+            "category": category,
+            "description": f"{name.title()} for {category} students",
+        }
+
+def student_grades(seed, n, grades):
+    # Grade number of every student; enrollments need the same grades
+    rng = _rng(seed, "student-grades")
+    return [rng.randrange(grades) for _ in range(n)]
+
+def gen_students(seed, grade_of):
+    rng = _rng(seed, "students")
+    for i, grade in enumerate(grade_of):
+        first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+        yield {
+            "student_id": student_id(i),
+            "name": f"{first} {last}",
+            "grade": grade_name(grade),
+            "dob": _date(rng, 2005, 2013),
+            "gender": rng.choice(["male", "female"]),
+            "phone": _phone(rng),
+            "address": rng.choice(STREETS),
+            "email": f"{first.lower()}.{last.lower()}{i + 1}@example.com",
+            "guardian_name": f"{rng.choice(FIRST_NAMES)} {last}",
+            "guardian_phone": _phone(rng),
+            "registered_at": _date(rng, 2020, 2025),
+        }
+
+def gen_scores(seed, n, students, teachers):
+    rng = _rng(seed, "scores")
+    for _ in range(n):
+        yield {
+            "student_id": student_id(rng.randrange(students)),
+            "subject": rng.choice(SUBJECTS)[0],
+            "teacher_id": teacher_id(rng.randrange(teachers)),
+            "score": float(min(100, max(0, round(rng.gauss(70, 14))))),
+        }
+
+def gen_enrollments(seed, n, grade_of):
+    rng = _rng(seed, "enrollments")
+    for i in range(n):
+        s = i % len(grade_of)
+        yield {
+            "student_id": student_id(s),
+            "grade": grade_name(grade_of[s]),
+            "enroll_date": _date(rng, 2024, 2024).replace("/", "-"),
+            "academic_year": ACADEMIC_YEAR,
+            "status": _weighted(rng, STATUSES),
+        }
+
+def gen_users(seed, n):
+    rng = _rng(seed, "users")
+    yield {"username": "admin", "password": "admin", "role": "admin",
+           "full_name": "Administrator", "created_at": "2025/01/01"}
+    for i in range(1, n):
+        yield {
+            "username": f"user{i:06d}",
+            "password": "%016x" % rng.getrandbits(64),
+            "role": _weighted(rng, ROLES),
+            "full_name": _name(rng),
+            "created_at": _date(rng, 2020, 2025),
+        }
+
+# ========== Writing ==========
+def generate(students, seed=0):
+    # Replaces every collection in the current data folder; returns the
+    # record count written per file
+    counts = sizes(students)
+    grade_of = student_grades(seed, students, counts["grades.json"])
+    collections = {
+        "teachers.json": gen_teachers(seed, counts["teachers.json"]),
+        "grades.json": gen_grades(seed, counts["grades.json"], counts["teachers.json"]),
+        "subjects.json": gen_subjects(seed),
+        "students.json": gen_students(seed, grade_of),
+        "scores.json": gen_scores(seed, counts["scores.json"], students, counts["teachers.json"]),
+        "enrollments.json": gen_enrollments(seed, counts["enrollments.json"], grade_of),
+        "users.json": gen_users(seed, counts["users.json"]),
+    }
+    for filename, records in collections.items():
+        storage.save_data(filename, records)
+    return counts
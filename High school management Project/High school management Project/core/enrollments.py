@@ -0,0 +1,64 @@
+# School Management System
+# Module: Enrollments (core)
+# Data Storage: enrollments.json
+# Libraries: storage, aggregates, integrity, occupancy, datetime, metrics
+
+from datetime import datetime
+from core import storage, aggregates, occupancy, metrics
+from core.errors import ValidationError
+from core.integrity import check_references
+
+FILENAME = "enrollments.json"
+FIELDS = ["student_id", "grade", "enroll_date", "academic_year", "status"]
+ACADEMIC_YEAR = "2024-2025"
+
+def make_enrollment(values):
+    # Field checks only; add_enrollment checks the student and grade exist
+    student_id = values.get("student_id", "")
+    grade = values.get("grade", "")
+    academic_year = values.get("academic_year") or ACADEMIC_YEAR
+    status = values.get("status", "")
+    enroll_date = values.get("enroll_date") or datetime.now().strftime("%Y-%m-%d")
+
+    if not all([student_id, grade, status]):
+        raise ValidationError("All fields are required.")
+
+    return {
+        "student_id": student_id,
+        "grade": grade,
+        "enroll_date": enroll_date,
+        "academic_year": academic_year,
+        "status": status
+    }
+
+@metrics.timed(f"add:{FILENAME}")
+def add_enrollment(values):
+    enrollment = make_enrollment(values)
+
+    # The student must exist in students.json and the grade in grades.json
+    check_references(FILENAME, enrollment)
+
+    # An Active enrollment into a full grade is refused or stored as
+    # Waitlisted, depending on the "capacity_policy" setting
+    with occupancy.lock():
+        if occupancy.is_seated_status(enrollment["status"]) and not occupancy.admit(enrollment["grade"], enrollment["student_id"]):
+            enrollment["status"] = occupancy.WAITLISTED
+        with storage.collection_lock(FILENAME):
+            storage.append_record(FILENAME, enrollment)
+            aggregates.record_added(FILENAME, enrollment)
+        occupancy.enrollment_added(enrollment)
+    return enrollment
+
+def add_waitlisted(student_id, grade):
+    # For a new student whose grade is full; call with occupancy.lock() held
+    enrollment = make_enrollment({"student_id": student_id, "grade": grade, "status": occupancy.WAITLISTED})
+    with storage.collection_lock(FILENAME):
+        storage.append_record(FILENAME, enrollment)
+        aggregates.record_added(FILENAME, enrollment)
+    return enrollment
+
+def list_enrollments():
+    return storage.load_data(FILENAME)
+
+def describe_enrollment(e):
+    return f"Student ID: {e['student_id']}, Grade: {e['grade']}, Year: {e['academic_year']}, Status: {e['status']}, Enrolled: {e['enroll_date']}"
@@ -0,0 +1,19 @@
+# School Management System
+# Module: Entities (core)
+# Libraries: students, teachers, grades, subjects, scores, enrollments, users
+#
+# The add, list and describe functions of every collection, for callers that
+# take a collection by name (cli.py, benchmark.py).
+
+from core import students, teachers, grades, subjects, scores, enrollments, users
+
+# collection -> (add, list, describe); its data file is <collection>.json
+ENTITIES = {
+    "students": (students.add_student, students.list_students, students.describe_student),
+    "teachers": (teachers.add_teacher, teachers.list_teachers, teachers.describe_teacher),
+    "grades": (grades.add_grade, grades.list_grades, grades.describe_grade),
+    "subjects": (subjects.add_subject, subjects.list_subjects, subjects.describe_subject),
+    "scores": (scores.add_score, scores.list_scores, scores.describe_score),
+    "enrollments": (enrollments.add_enrollment, enrollments.list_enrollments, enrollments.describe_enrollment),
+    "users": (users.add_user, users.list_users, users.describe_user),
+}
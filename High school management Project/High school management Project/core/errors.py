@@ -0,0 +1,6 @@
+# School Management System
+# Module: Errors
+
+class ValidationError(ValueError):
+    # Raised by the add_* functions; the message is meant for the user
+    pass
@@ -0,0 +1,44 @@
+# School Management System
+# Module: Grades (core)
+# Data Storage: grades.json
+# Libraries: storage, indexes, integrity, occupancy, metrics
+
+from core import storage, occupancy, metrics
+from core.indexes import add_unique
+from core.errors import ValidationError
+from core.integrity import check_references
+
+FILENAME = "grades.json"
+FIELDS = ["name", "description", "level", "class_teacher", "capacity"]
+
+@metrics.timed(f"add:{FILENAME}")
+def add_grade(values):
+    try:
+        capacity_value = int(values.get("capacity", ""))
+    except ValueError:
+        raise ValidationError("Capacity must be an integer.")
+
+    grade = {
+        "name": values.get("name", ""),
+        "description": values.get("description", ""),
+        "level": values.get("level", ""),
+        "class_teacher": values.get("class_teacher", ""),
+        "capacity": capacity_value
+    }
+
+    if not all([grade["name"], grade["description"], grade["level"], grade["class_teacher"], str(values.get("capacity", ""))]):
+        raise ValidationError("All fields are required.")
+
+    check_references(FILENAME, grade)
+
+    with occupancy.lock():
+        if not add_unique(FILENAME, grade):
+            raise ValidationError("Grade name already exists.")
+        occupancy.grade_added(grade)
+    return grade
+
+def list_grades():
+    return storage.load_data(FILENAME)
+
+def describe_grade(g):
+    return f"Name: {g['name']}, Desc: {g['description']}, Level: {g['level']}, Class Teacher: {g['class_teacher']}, Capacity: {g['capacity']}"
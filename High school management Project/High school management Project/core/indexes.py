@@ -0,0 +1,260 @@
+# School Management System
+# Module: Primary-Key Indexes
+# Data Storage: key index file (<name>.json.idx), one JSON-encoded key per line,
+#               as written (normalized when read)
+# Libraries: bisect, json, os, threading, storage, sqlite_backend
+#
+# Each keyed collection keeps its primary keys in an append-only index file
+# next to the data. A process loads the index once into a set and afterwards
+# only reads lines appended since its last look, so keys added by other
+# windows are picked up without reloading the collection. save_data removes
+# the index, which makes every process rebuild it from the data on next use;
+# so does a main data file newer than the index.
+# The keys are also kept sorted (case-folded), built on the first
+# completions() call, so the ID fields of the forms can offer every key that
+# starts with what has been typed. completions() takes the lock and may have
+# to rebuild the index, so the forms call it on the task runner; what it
+# returns is a read-only Completions that every keystroke then matches
+# against with one bisect, on the Tk thread and without any lock.
+# With the SQLite backend the table's primary key does this job instead.
+
+import json
+import os
+import threading
+from bisect import bisect_left, bisect_right
+from core import storage
+from core import sqlite_backend
+
+PRIMARY_KEYS = {
+    "students.json": ("student_id", None),
+    "teachers.json": ("Teacher_id", None),
+    "users.json": ("username", None),
+    "grades.json": ("name", None),
+    "subjects.json": ("name", str.casefold),
+}
+
+COMPLETION_LIMIT = 8
+
+# New keys are inserted into the sorted list one by one up to this many at a
+# time; a bigger batch (a CSV import) drops the list, to be re-sorted on the
+# next completions() call
+INSERT_SORTED_MAX = 1000
+
+class Completions:
+    # The keys of a collection at one moment, sorted for prefix matching. A
+    # refresh makes a new one rather than changing this, so it can be read
+    # from any thread without a lock.
+    def __init__(self, folded, ordered):
+        self.folded = tuple(folded)    # case-folded, sorted
+        self.ordered = tuple(ordered)  # the keys as written, same order
+
+    @classmethod
+    def from_keys(cls, keys):
+        pairs = sorted((key.casefold(), key) for key in keys)
+        return cls([folded for folded, _ in pairs], [key for _, key in pairs])
+
+    def match(self, prefix, limit=COMPLETION_LIMIT):
+        # Keys starting with prefix, ignoring case, in sorted order
+        prefix = prefix.casefold()
+        i = bisect_left(self.folded, prefix)
+        matches = []
+        while i < len(self.folded) and len(matches) < limit and self.folded[i].startswith(prefix):
+            matches.append(self.ordered[i])
+            i += 1
+        return matches
+
+_lock = threading.Lock()
+_indexes = {}
+
+def index_path(filename):
+    return filename + ".idx"
+
+class KeyIndex:
+    def __init__(self, filename):
+        self.filename = filename
+        self.path = index_path(filename)
+        self.field, self.normalize = PRIMARY_KEYS[filename]
+        self.keys = set()
+        self.names = {}      # normalized key -> key as written, if they differ
+        self.folded = None   # sorted case-folded keys, built on demand
+        self.ordered = None  # the keys in the same order
+        self.published = None  # Completions of the keys as they are now
+        self.inode = None
+        self.offset = 0
+
+    def key_of(self, value):
+        value = str(value)
+        return self.normalize(value) if self.normalize else value
+
+    # ========== Sync With Disk ==========
+    def rebuild(self):
+        keys = [str(r.get(self.field, "")) for r in storage.load_json_data(self.filename)]
+        tmp = f"{self.path}.{os.getpid()}.tmp"
+        with open(tmp, 'w') as f:
+            for key in keys:
+                f.write(json.dumps(key) + "\n")
+        os.replace(tmp, self.path)
+
+    def stale(self):
+        # Missing, or older than the main data file (e.g. edited by hand).
+        # Appends only touch the log, and compaction keeps the index's mtime
+        # current, so neither forces a rebuild.
+        try:
+            built = os.path.getmtime(self.path)
+        except FileNotFoundError:
+            return True
+        modified = storage.mtime(self.filename)
+        return modified is not None and modified > built
+
+    def refresh(self):
+        storage.recover(self.filename)
+        if self.stale():
+            self.rebuild()
+            self.inode = None  # the new file may reuse the old inode
+        st = os.stat(self.path)
+        if st.st_ino != self.inode or st.st_size < self.offset:
+            # Index was rebuilt or replaced: start over from its first line
+            self.keys = set()
+            self.names = {}
+            self.folded = self.ordered = self.published = None
+            self.inode = st.st_ino
+            self.offset = 0
+        if st.st_size > self.offset:
+            keys = []
+            with open(self.path, 'rb') as f:
+                f.seek(self.offset)
+                for line in f:
+                    if not line.endswith(b"\n"):
+                        break  # another process is still writing this line
+                    keys.append(json.loads(line))
+                    self.offset += len(line)
+            self.add_keys(keys)
+
+    def add_keys(self, written):
+        # Into the set, and into the sorted list when it has been built
+        keys = written
+        if self.normalize:
+            keys = [self.normalize(key) for key in written]
+            for key, name in zip(keys, written):
+                self.names.setdefault(key, name)
+        self.published = None
+        if self.folded is not None:
+            new = [key for key in keys if key not in self.keys]
+            if len(new) > INSERT_SORTED_MAX:
+                self.folded = self.ordered = None
+            else:
+                for key in new:
+                    if key in self.keys:
+                        continue  # repeated within the batch
+                    self.keys.add(key)
+                    folded = key.casefold()
+                    i = bisect_right(self.folded, folded)
+                    self.folded.insert(i, folded)
+                    self.ordered.insert(i, key)
+        self.keys.update(keys)
+
+    # ========== Lookups ==========
+    def contains(self, value):
+        self.refresh()
+        return self.key_of(value) in self.keys
+
+    def add(self, value):
+        self.add_many([value])
+
+    def add_many(self, values):
+        written = [str(value) for value in values]
+        with open(self.path, 'a') as f:
+            f.write("".join(json.dumps(key) + "\n" for key in written))
+        self.add_keys(written)
+
+    def completions(self):
+        # A Completions of the keys as written (a subject as "Mathematics",
+        # not its key "mathematics"); the same one until a key is added
+        if self.published is None:
+            if self.folded is None:
+                pairs = sorted((key.casefold(), key) for key in self.keys)
+                self.folded = [folded for folded, _ in pairs]
+                self.ordered = [key for _, key in pairs]
+            ordered = self.ordered
+            if self.names:
+                ordered = [self.names.get(key, key) for key in ordered]
+            self.published = Completions(self.folded, ordered)
+        return self.published
+
+def get_index(filename):
+    with _lock:
+        index = _indexes.get(filename)
+        if index is None:
+            index = _indexes[filename] = KeyIndex(filename)
+        return index
+
+def key_exists(filename, value):
+    if storage.BACKEND == "sqlite":
+        return sqlite_backend.key_exists(filename, value)
+    index = get_index(filename)
+    with storage.collection_lock(filename):
+        return index.contains(value)
+
+def add_unique(filename, record):
+    # Append the record unless its primary key is already taken
+    if storage.BACKEND == "sqlite":
+        return sqlite_backend.add_unique(filename, record)
+    # The check and both appends share one lock so two windows cannot
+    # insert the same key between them
+    index = get_index(filename)
+    with storage.collection_lock(filename):
+        value = record[index.field]
+        if index.contains(value):
+            return False
+        storage.append_json_record(filename, record)
+        index.add(value)
+    return True
+
+def normalize_key(filename, value):
+    # The form a key is compared in (subject names are case-folded)
+    return get_index(filename).key_of(value)
+
+def stored_key(filename, value):
+    # The key as the collection spells it, or None when no record has it: a
+    # subject asked for as "Social Study" comes back as "social study"
+    if storage.BACKEND == "sqlite":
+        return sqlite_backend.stored_key(filename, value)
+    index = get_index(filename)
+    with storage.collection_lock(filename):
+        index.refresh()
+        key = index.key_of(value)
+        if key not in index.keys:
+            return None
+        return index.names.get(key, key)
+
+def key_map(filename):
+    # Snapshot of every primary key, {normalized key: key as spelled}, for
+    # validating many records at once
+    if storage.BACKEND == "sqlite":
+        return sqlite_backend.key_map(filename)
+    index = get_index(filename)
+    with storage.collection_lock(filename):
+        index.refresh()
+        return {key: index.names.get(key, key) for key in index.keys}
+
+def completions(filename):
+    # The primary keys as a Completions, for the autocomplete of the forms'
+    # ID fields. Waits for the collection lock, so call it off the Tk thread.
+    if storage.BACKEND == "sqlite":
+        return Completions.from_keys(sqlite_backend.key_map(filename).values())
+    index = get_index(filename)
+    with storage.collection_lock(filename):
+        index.refresh()
+        return index.completions()
+
+def add_many(filename, records):
+    # Append records whose keys the caller has already checked, holding the
+    # collection lock across the check and this call
+    if storage.BACKEND == "sqlite":
+        storage.append_records(filename, records)
+        return
+    index = get_index(filename)
+    with storage.collection_lock(filename):
+        index.refresh()
+        storage.append_json_records(filename, records)
+        index.add_many([r[index.field] for r in records])
@@ -0,0 +1,49 @@
+# School Management System
+# Module: Referential Integrity (core)
+# Data Storage: reads the primary-key indexes only
+# Libraries: indexes
+#
+# Checks that the IDs a record points at exist, e.g. a score's student,
+# teacher and subject. Every lookup is a set membership test on the
+# primary-key index of the referenced collection, which stays cached in
+# memory until that collection's files change, so no file is rescanned on
+# submit. A reference matched case-insensitively (a subject) is then stored
+# as the referenced record spells it, so the reports group it with the rest.
+
+from core import indexes
+from core.errors import ValidationError
+
+# collection -> [(field, referenced collection, message)] in check order
+REFERENCES = {
+    "scores.json": [
+        ("student_id", "students.json", "Student ID does not exist."),
+        ("teacher_id", "teachers.json", "Teacher ID does not exist."),
+        ("subject", "subjects.json", "Subject does not exist."),
+    ],
+    "enrollments.json": [
+        ("student_id", "students.json", "Student ID does not exist."),
+        ("grade", "grades.json", "Grade does not exist."),
+    ],
+    "grades.json": [
+        ("class_teacher", "teachers.json", "Class teacher (Teacher ID) does not exist."),
+    ],
+}
+
+def check_references(filename, record, key_sets=None):
+    # Raises ValidationError for the first reference that does not exist,
+    # and rewrites the others in `record` to their stored spelling.
+    # key_sets ({collection: indexes.key_map()}) lets bulk imports check
+    # against one snapshot instead of the live indexes.
+    for field, target, message in REFERENCES.get(filename, []):
+        value = record.get(field, "")
+        if key_sets is None:
+            stored = indexes.stored_key(target, value)
+        else:
+            stored = key_sets[target].get(indexes.normalize_key(target, value))
+        if stored is None:
+            raise ValidationError(message)
+        if stored != value:
+            record[field] = stored
+
+def referenced_collections(filename):
+    return [target for _, target, _ in REFERENCES.get(filename, [])]
@@ -0,0 +1,126 @@
+# School Management System
+# Module: Streaming JSON Reader (core)
+# Data Storage: reads the <name>.json arrays and .log files
+# Libraries: io, json, re
+#
+# Yields the records of a JSON array file one at a time while reading it in
+# fixed-size chunks, so walking a collection needs memory for one chunk and
+# one record rather than the whole file and every parsed dict at once.
+# iter_spans and iter_line_spans also give the byte range of each record,
+# which is how storage pages through collections too large to cache.
+
+import io
+import json
+import re
+
+CHUNK_CHARS = 64 * 1024
+_decoder = json.JSONDecoder()
+_SPACE = re.compile(r"[ \t\r\n]*")
+
+class _Buffer:
+    def __init__(self, f, chunk_chars):
+        self.f = f
+        self.chunk_chars = chunk_chars
+        self.text = ""
+        self.pos = 0
+        self.base = 0  # characters dropped before text[0]
+        self.eof = False
+
+    def fill(self):
+        # Append the next chunk, dropping what has been consumed
+        chunk = self.f.read(self.chunk_chars)
+        if not chunk:
+            self.eof = True
+        self.base += self.pos
+        self.text = self.text[self.pos:] + chunk
+        self.pos = 0
+
+    def skip_space(self):
+        # Returns the next non-blank character without consuming it, or ""
+        while True:
+            self.pos = _SPACE.match(self.text, self.pos).end()
+            if self.pos < len(self.text) or self.eof:
+                return self.text[self.pos:self.pos + 1]
+            self.fill()
+
+def iter_array(f, chunk_chars=CHUNK_CHARS):
+    # f: a file opened in text mode holding one JSON array (or nothing)
+    for value, _, _ in _elements(_Buffer(f, chunk_chars)):
+        yield value
+
+def iter_spans(f, chunk_chars=CHUNK_CHARS):
+    # (value, start, end) for each element of the JSON array in the binary
+    # file f, where bytes start:end are the element's own text. The file is
+    # read as Latin-1, one character per byte, so the offsets are byte
+    # offsets; non-ASCII text in the values comes out as Latin-1 too (the
+    # files are written ASCII-only, so only hand edits have any).
+    yield from _elements(_Buffer(io.TextIOWrapper(f, encoding="latin-1", newline=""), chunk_chars))
+
+def _elements(buf):
+    first = buf.skip_space()
+    if first == "":
+        return
+    if first != "[":
+        raise ValueError("Expected a JSON array")
+    buf.pos += 1
+    if buf.skip_space() == "]":
+        return
+    while True:
+        buf.skip_space()
+        start = buf.pos
+        try:
+            value, end = _decoder.raw_decode(buf.text, buf.pos)
+        except json.JSONDecodeError:
+            if buf.eof:
+                raise
+            buf.fill()
+            continue
+        after = _SPACE.match(buf.text, end).end()
+        if after == len(buf.text) or buf.text[after] not in ",]":
+            if not buf.eof:
+                # The value may go on in the next chunk (e.g. a number cut
+                # in two); read more and decode it again
+                buf.fill()
+                continue
+            raise ValueError("Expected ',' or ']' in JSON array")
+        buf.pos = after + 1
+        yield value, buf.base + start, buf.base + end
+        if buf.text[after] == "]":
+            return
+
+def iter_lines(f, limit=None):
+    # Records of an append log opened in binary mode, stopping at a torn
+    # last line like storage._parse_log. Lines past `limit` bytes (appended
+    # after the caller looked at the size) are left out.
+    read = 0
+    for raw in f:
+        read += len(raw)
+        if limit is not None and read > limit:
+            return
+        line = raw.strip()
+        if not line:
+            continue
+        try:
+            yield json.loads(line)
+        except ValueError:
+            return
+
+def iter_line_spans(f, start=0, limit=None):
+    # (value, start, end) for each record of an append log opened in binary
+    # mode, from byte `start` up to byte `limit`. Stops at a line still
+    # being written (no newline yet) or torn.
+    f.seek(start)
+    pos = start
+    for raw in f:
+        begin = pos
+        pos += len(raw)
+        if (limit is not None and pos > limit) or not raw.endswith(b"\n"):
+            return
+        line = raw.strip()
+        if not line:
+            continue
+        try:
+            value = json.loads(line)
+        except ValueError:
+            return
+        yield value, begin, pos
@@ -0,0 +1,144 @@
+# School Management System
+# Module: Inter-Process File Locks
+# Data Storage: lock files (<name>.lock), contents unused
+# Libraries: os, threading, time, fcntl (POSIX) / msvcrt (Windows)
+#
+# Every module window runs in its own process, so a threading lock alone does
+# not stop two windows from writing the same collection. FileLock adds an OS
+# lock on a sidecar file. It is re-entrant within a thread, so a helper that
+# already holds the lock can call another helper that takes it again. Work
+# that should not hold up other windows (an fsync) can be deferred with
+# after_release until the thread lets go of the lock altogether.
+#
+# Markers are lock files a process keeps locked while it is in some state
+# (e.g. has log writes not yet fsynced). The OS drops the lock when a process
+# dies, so a marker nobody holds was left by a crash.
+
+import os
+import threading
+import time
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+_guard = threading.Lock()
+_locks = {}
+
+def _os_lock(fd, blocking):
+    if fcntl is not None:
+        flags = fcntl.LOCK_EX if blocking else fcntl.LOCK_EX | fcntl.LOCK_NB
+        try:
+            fcntl.flock(fd, flags)
+        except BlockingIOError:
+            return False
+        return True
+    while True:
+        try:
+            msvcrt.locking(fd, msvcrt.LK_NBLCK, 1)
+            return True
+        except OSError:
+            if not blocking:
+                return False
+            time.sleep(0.01)
+
+def _os_unlock(fd):
+    if fcntl is not None:
+        fcntl.flock(fd, fcntl.LOCK_UN)
+    else:
+        os.lseek(fd, 0, os.SEEK_SET)
+        msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+
+class FileLock:
+    def __init__(self, path):
+        self.path = path
+        self.rlock = threading.RLock()
+        self.depth = 0
+        self.fd = None
+        self.owner = None
+        self.pending = []  # (fn, args) to call after the outermost release
+
+    def held(self):
+        # True when the calling thread already holds this lock
+        return self.depth > 0 and self.owner == threading.get_ident()
+
+    def acquire(self, blocking=True):
+        if not self.rlock.acquire(blocking):
+            return False
+        if self.depth == 0:
+            fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+            if not _os_lock(fd, blocking):
+                os.close(fd)
+                self.rlock.release()
+                return False
+            self.fd = fd
+            self.owner = threading.get_ident()
+        self.depth += 1
+        return True
+
+    def after_release(self, fn, *args):
+        # Call with the lock held: fn(*args) runs once this thread's
+        # outermost release has dropped the lock. Repeats run once.
+        if (fn, args) not in self.pending:
+            self.pending.append((fn, args))
+
+    def release(self):
+        self.depth -= 1
+        pending = ()
+        if self.depth == 0:
+            fd, self.fd = self.fd, None
+            self.owner = None
+            pending, self.pending = self.pending, []
+            try:
+                _os_unlock(fd)
+            finally:
+                os.close(fd)
+        self.rlock.release()
+        for fn, args in pending:
+            fn(*args)
+
+    def __enter__(self):
+        self.acquire()
+        return self
+
+    def __exit__(self, *exc):
+        self.release()
+
+def file_lock(path):
+    # One FileLock object per lock file, shared by all threads
+    with _guard:
+        lock = _locks.get(path)
+        if lock is None:
+            lock = _locks[path] = FileLock(path)
+        return lock
+
+# ========== Markers ==========
+def hold_marker(path):
+    # Creates and locks the marker; returns the handle for drop_marker
+    fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+    _os_lock(fd, True)
+    return fd
+
+def drop_marker(fd, path):
+    _os_unlock(fd)
+    os.close(fd)
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+def marker_abandoned(path):
+    # True when the marker exists but its owner is gone
+    try:
+        fd = os.open(path, os.O_RDWR)
+    except FileNotFoundError:
+        return False
+    try:
+        if not _os_lock(fd, False):
+            return False
+        _os_unlock(fd)
+        return True
+    finally:
+        os.close(fd)
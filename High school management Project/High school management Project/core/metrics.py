@@ -0,0 +1,137 @@
+# School Management System
+# Module: Timing Metrics (core)
+# Data Storage: in memory; optionally appended to a JSON-lines log
+#               (config "metrics_log")
+# Libraries: atexit, collections, functools, json, threading, time, config
+#
+# Every load_data/save_data call, add_* function and report is timed here.
+# Each operation keeps its last WINDOW durations, from which p50/p95/p99 are
+# read, plus running totals of calls, records and bytes. The dashboard's
+# Performance panel shows summary() live. When "metrics_log" names a file,
+# a summary line is appended to it at most every "metrics_interval" seconds
+# and once more when the program exits.
+
+import atexit
+import functools
+import json
+import threading
+import time
+from collections import deque
+from core import config
+
+WINDOW = 1000
+
+class OperationStats:
+    __slots__ = ("samples", "calls", "total", "records", "bytes", "last")
+
+    def __init__(self):
+        self.samples = deque(maxlen=WINDOW)
+        self.calls = 0
+        self.total = 0.0
+        self.records = 0
+        self.bytes = 0
+        self.last = 0.0
+
+    def add(self, seconds, records, nbytes):
+        self.samples.append(seconds)
+        self.calls += 1
+        self.total += seconds
+        self.last = seconds
+        self.records += records or 0
+        self.bytes += nbytes or 0
+
+    def summary(self):
+        ordered = sorted(self.samples)
+        return {
+            "calls": self.calls,
+            "p50": _percentile(ordered, 50),
+            "p95": _percentile(ordered, 95),
+            "p99": _percentile(ordered, 99),
+            "max": ordered[-1],
+            "last": self.last,
+            "mean": self.total / self.calls,
+            "records": self.records,
+            "bytes": self.bytes,
+        }
+
+def _percentile(ordered, p):
+    # Nearest-rank percentile of a sorted, non-empty list
+    rank = max(1, -(-len(ordered) * p // 100))
+    return ordered[int(rank) - 1]
+
+_stats = {}
+_lock = threading.Lock()
+_last_export = [time.monotonic()]
+
+# ========== Recording ==========
+def record(name, seconds, records=None, nbytes=None):
+    with _lock:
+        stats = _stats.get(name)
+        if stats is None:
+            stats = _stats[name] = OperationStats()
+        stats.add(seconds, records, nbytes)
+    _maybe_export()
+
+class timer:
+    # with metrics.timer("report:totals") as t:
+    #     ...
+    #     t.records = n   # optional, also t.bytes
+    def __init__(self, name):
+        self.name = name
+        self.records = None
+        self.bytes = None
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        record(self.name, time.perf_counter() - self.start, self.records, self.bytes)
+        return False
+
+def timed(name):
+    # Decorator form of timer
+    def wrap(fn):
+        @functools.wraps(fn)
+        def timed_fn(*args, **kwargs):
+            with timer(name):
+                return fn(*args, **kwargs)
+        return timed_fn
+    return wrap
+
+# ========== Reading ==========
+def summary():
+    # [{"name", "calls", "p50", "p95", "p99", ...}], slowest p95 first
+    with _lock:
+        rows = [dict(name=name, **stats.summary()) for name, stats in _stats.items()]
+    rows.sort(key=lambda r: r["p95"], reverse=True)
+    return rows
+
+def reset():
+    with _lock:
+        _stats.clear()
+
+# ========== Export ==========
+def export(path=None):
+    # Appends one JSON line with the current summary
+    path = path or config.get("metrics_log")
+    if not path:
+        return
+    rows = summary()
+    if not rows:
+        return
+    line = json.dumps({"time": time.strftime("%Y-%m-%dT%H:%M:%S"), "operations": rows})
+    with open(path, 'a') as f:
+        f.write(line + "\n")
+
+def _maybe_export():
+    if not config.get("metrics_log"):
+        return
+    now = time.monotonic()
+    with _lock:
+        if now - _last_export[0] < config.get("metrics_interval"):
+            return
+        _last_export[0] = now
+    export()
+
+atexit.register(export)
@@ -0,0 +1,218 @@
+# School Management System
+# Module: Grade Occupancy (core)
+# Data Storage: seat log (grades.json.seats), one JSON-encoded change per line
+# Libraries: json, os, threading, config, storage
+#
+# Live count of the students seated in every grade, so a full grade is
+# refused (or the newcomer waitlisted, config "capacity_policy") with two
+# dictionary lookups instead of a scan of students.json. A new student takes
+# a seat in the grade on their record. An "Active" enrollment moves the
+# student to its grade; any other status (Transferred, Withdrawn, Waitlisted)
+# for the grade they sit in frees the seat. A waitlisted student is promoted
+# by enrolling them as Active once a seat is free.
+#
+# Like the key indexes, each change is appended to the seat log and other
+# windows only read the lines added since their last look. The log is
+# rebuilt with one pass over grades, students and enrollments when it is
+# missing or older than one of their main files; save_data of any of them
+# removes it.
+
+import json
+import os
+import threading
+from core import config, storage
+from core.errors import ValidationError
+
+SEAT_LOG = "grades.json.seats"
+SOURCES = ["grades.json", "students.json", "enrollments.json"]
+WAITLISTED = "Waitlisted"
+
+def _capacity(grade):
+    # Loaded grades carry an int capacity; none that parses means never full
+    capacity = grade.get("capacity")
+    return capacity if isinstance(capacity, int) else None
+
+def is_seated_status(status):
+    return str(status).strip().casefold() == "active"
+
+class Occupancy:
+    # Changes: ["c", grade, capacity] sets a capacity; ["s", student_id,
+    # grade or None] moves a student to a grade or out of every seat
+    def __init__(self):
+        self.seats = {}      # student_id -> grade
+        self.counts = {}     # grade -> seated students
+        self.capacity = {}   # grade -> capacity
+        self.inode = None
+        self.offset = 0
+
+    def copy(self):
+        other = Occupancy()
+        other.seats = dict(self.seats)
+        other.counts = dict(self.counts)
+        other.capacity = dict(self.capacity)
+        return other
+
+    def apply(self, change):
+        if change[0] == "c":
+            self.capacity[change[1]] = change[2]
+            return
+        _, student_id, grade = change
+        old = self.seats.pop(student_id, None)
+        if old is not None:
+            self.counts[old] -= 1
+        if grade:
+            self.seats[student_id] = grade
+            self.counts[grade] = self.counts.get(grade, 0) + 1
+
+    # ========== Rules ==========
+    def has_room(self, grade, student_id=None):
+        if student_id is not None and self.seats.get(student_id) == grade:
+            return True  # already sits there
+        capacity = self.capacity.get(grade)
+        return capacity is None or self.counts.get(grade, 0) < capacity
+
+    def full_message(self, grade):
+        return f"Grade {grade} is full ({self.counts.get(grade, 0)}/{self.capacity[grade]} students)."
+
+    def enrollment_change(self, enrollment):
+        # The seat change an enrollment record makes, or None
+        student_id, grade = enrollment.get("student_id"), enrollment.get("grade")
+        if is_seated_status(enrollment.get("status", "")):
+            return ["s", student_id, grade]
+        if self.seats.get(student_id) == grade:
+            return ["s", student_id, None]
+        return None
+
+    # ========== Sync With Disk ==========
+    def rebuild(self):
+        state = Occupancy()
+        for g in storage.iter_records("grades.json"):
+            state.apply(["c", g.get("name"), _capacity(g)])
+        for s in storage.iter_records("students.json"):
+            state.apply(["s", s.get("student_id"), s.get("grade") or None])
+        for e in storage.iter_records("enrollments.json"):
+            change = state.enrollment_change(e)
+            if change is not None:
+                state.apply(change)
+        lines = [["c", grade, capacity] for grade, capacity in state.capacity.items()]
+        lines += [["s", student_id, grade] for student_id, grade in state.seats.items()]
+        tmp = f"{SEAT_LOG}.{os.getpid()}.tmp"
+        with open(tmp, 'w') as f:
+            for line in lines:
+                f.write(json.dumps(line) + "\n")
+        os.replace(tmp, SEAT_LOG)
+
+    def stale(self):
+        # Missing, or older than a main data file (a hand edit, a compaction
+        # of students or enrollments). SQLite has no such files; its
+        # save_data removes the log like the JSON one does.
+        try:
+            built = os.path.getmtime(SEAT_LOG)
+        except FileNotFoundError:
+            return True
+        if storage.BACKEND == "sqlite":
+            return False
+        return any((storage.mtime(p) or 0) > built for p in SOURCES)
+
+    def refresh(self):
+        for filename in SOURCES:
+            storage.recover(filename)
+        if self.stale():
+            self.rebuild()
+        st = os.stat(SEAT_LOG)
+        if st.st_ino != self.inode or st.st_size < self.offset:
+            # Rebuilt or replaced: start over from its first line
+            self.seats, self.counts, self.capacity = {}, {}, {}
+            self.inode = st.st_ino
+            self.offset = 0
+        if st.st_size > self.offset:
+            with open(SEAT_LOG, 'rb') as f:
+                f.seek(self.offset)
+                for line in f:
+                    if not line.endswith(b"\n"):
+                        break  # another process is still writing this line
+                    self.apply(json.loads(line))
+                    self.offset += len(line)
+
+    def record(self, changes):
+        # Append and apply; refresh() first so the offset stays in step
+        if not changes:
+            return
+        with open(SEAT_LOG, 'a') as f:
+            f.write("".join(json.dumps(change) + "\n" for change in changes))
+            f.flush()
+            self.offset = f.tell()
+        for change in changes:
+            self.apply(change)
+
+_guard = threading.Lock()
+_live = [None]
+
+def lock():
+    # Taken before any collection lock by every insert that may take a seat
+    return storage.collection_lock(SEAT_LOG)
+
+def current():
+    # The up-to-date counters; call with lock() held
+    with _guard:
+        if _live[0] is None:
+            _live[0] = Occupancy()
+        state = _live[0]
+    state.refresh()
+    return state
+
+# ========== Inserts ==========
+def admit(grade, student_id=None, state=None):
+    # Call with lock() held. True when the student may sit in grade, False
+    # when they should be waitlisted; raises ValidationError when the grade
+    # is full and the policy is "reject".
+    if state is None:
+        state = current()
+    if state.has_room(grade, student_id):
+        return True
+    if config.get("capacity_policy") == "waitlist":
+        return False
+    raise ValidationError(state.full_message(grade))
+
+def student_added(student, seated):
+    current().record([["s", student["student_id"], student["grade"] if seated else None]])
+
+def enrollment_added(enrollment):
+    state = current()
+    change = state.enrollment_change(enrollment)
+    if change is not None:
+        state.record([change])
+
+def grade_added(grade):
+    current().record([["c", grade["name"], _capacity(grade)]])
+
+def planner():
+    # A private copy of the counters for a bulk import to admit its rows
+    # against before anything is saved; commit(changes) afterwards
+    return current().copy()
+
+def commit(changes):
+    current().record(changes)
+
+# ========== Queries ==========
+def seat_of(student_id):
+    # The grade a student sits in, or None (waitlisted, withdrawn)
+    with lock():
+        return current().seats.get(student_id)
+
+def seats():
+    # {student_id: grade} of every seated student
+    with lock():
+        return dict(current().seats)
+
+def counts():
+    # {grade: seated students}
+    with lock():
+        return dict(current().counts)
+
+def rebuild():
+    with lock():
+        state = current()
+        state.rebuild()
+        state.refresh()
+        return dict(state.counts)
@@ -0,0 +1,328 @@
+# School Management System
+# Module: Typed Records (core)
+# Data Storage: none; the in-memory form of the records of every collection
+# Libraries: collections.abc, datetime, threading
+#
+# Loaded records are kept as instances of one slotted class per collection
+# instead of dicts: a student record is 128 bytes where its dict was 464,
+# and numbers and dates are converted once, when the collection is read,
+# rather than with float()/int() in every report. The classes are
+# read-only Mappings, so code written for the dicts (r["name"],
+# r.get("grade", ""), dict(r)) works unchanged. A field the record lacks is
+# an unset slot, so the hottest loops can read getattr(r, "name", "Unknown")
+# at the speed of dict.get.
+#
+# Conversion never loses data: a value that does not parse (an age of "n/a",
+# a date of "soon") is kept as it was, a date prints exactly as it was
+# written, and fields a class does not know are kept in `extra`. Writing a
+# record back therefore gives the same JSON, except that numbers saved as
+# text ("40") come back as numbers (40).
+#
+# Fields that repeat a few values across the whole collection (grade, gender,
+# subject, status, role, ...) are dictionary-encoded: the slot holds a small
+# int code into the collection's StringTable, so every record shares one copy
+# of each string, and get()/r[...] decode it. The report engine groups on the
+# raw codes (getattr) and decodes only the keys of the finished groups.
+# With the "field_codes" setting the files hold codes as well (storage.py),
+# each under CODE_PREFIX + the field name ("$grade": 3), so a code is never
+# taken for a number typed into the field; from_dict maps those straight to
+# TABLE codes.
+
+import threading
+from collections.abc import Mapping
+from datetime import date
+
+_MISSING = object()
+
+# The key an encoded field is stored under in a file written with codes
+CODE_PREFIX = "$"
+
+# Parsed dates are shared between records with the same text
+DATE_CACHE_SIZE = 100000
+_dates = {}
+
+# ========== Values ==========
+class Date(date):
+    # A date that remembers its separator: "2010/01/01" or "2010-01-01"
+    __slots__ = ("sep",)
+
+    def __new__(cls, year, month, day, sep="-"):
+        self = date.__new__(cls, year, month, day)
+        self.sep = sep
+        return self
+
+    def __str__(self):
+        return f"{self.year:04d}{self.sep}{self.month:02d}{self.sep}{self.day:02d}"
+
+    def __reduce__(self):
+        # date's own pickling would drop the separator
+        return (Date, (self.year, self.month, self.day, self.sep))
+
+def to_date(value):
+    # YYYY/MM/DD or YYYY-MM-DD as a Date; anything else unchanged
+    if not isinstance(value, str):
+        return value
+    parsed = _dates.get(value)
+    if parsed is not None:
+        return parsed
+    sep = value[4:5]
+    if len(value) != 10 or sep not in ("/", "-") or value[7] != sep:
+        return value
+    year, month, day = value[:4], value[5:7], value[8:]
+    if not (year + month + day).isdigit():
+        return value
+    try:
+        parsed = Date(int(year), int(month), int(day), sep)
+    except ValueError:
+        return value  # e.g. 2024/02/30
+    if len(_dates) < DATE_CACHE_SIZE:
+        _dates[value] = parsed
+    return parsed
+
+def to_int(value):
+    if isinstance(value, str):
+        try:
+            return int(value)
+        except ValueError:
+            return value
+    return value
+
+def to_number(value):
+    # int when the text is a whole number, else float
+    if isinstance(value, str):
+        try:
+            return int(value)
+        except ValueError:
+            try:
+                return float(value)
+            except ValueError:
+                return value
+    return value
+
+def to_float(value):
+    if isinstance(value, str):
+        try:
+            return float(value)
+        except ValueError:
+            return value
+    return value
+
+def plain(value):
+    # The JSON form of a field value
+    return str(value) if isinstance(value, Date) else value
+
+# ========== Dictionary Encoding ==========
+class StringTable:
+    # The distinct values of a collection's encoded fields, each with a code:
+    # its position in `values`. Codes are only ever added, so they stay valid
+    # for the life of the process.
+    def __init__(self):
+        self.values = []
+        self.codes = {}
+        self.lock = threading.Lock()
+
+    def code(self, value):
+        # Strings are the norm; anything else (a number typed into the grade
+        # field) is keyed by type and repr so 1, 1.0 and True stay apart
+        key = value if type(value) is str else (type(value), repr(value))
+        code = self.codes.get(key)
+        if code is None:
+            with self.lock:
+                code = self.codes.get(key)
+                if code is None:
+                    code = len(self.values)
+                    self.values.append(value)
+                    self.codes[key] = code
+        return code
+
+    def decode_keys(self, groups):
+        # {code: x} -> {value: x}, in the same order
+        values = self.values
+        return {values[code]: x for code, x in groups.items()}
+
+# ========== Records ==========
+class Record(Mapping):
+    # FIELDS: [(name, converter or None)]; ENCODED: the fields kept as codes
+    # into TABLE. Every subclass lists its field names in __slots__.
+    __slots__ = ("extra",)
+    FIELDS = []
+    ENCODED = ()
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls.NAMES = tuple(name for name, _ in cls.FIELDS)
+        cls.NAME_SET = frozenset(cls.NAMES)
+        cls.ENCODED_SET = frozenset(cls.ENCODED)
+        cls.CODED = tuple((name, CODE_PREFIX + name) for name in cls.ENCODED)
+        cls.DISK_NAME_SET = cls.NAME_SET.union(coded for _, coded in cls.CODED)
+        cls.AS_IS = tuple(name for name, convert in cls.FIELDS if convert is None and name not in cls.ENCODED_SET)
+        cls.CONVERTED = tuple((name, convert) for name, convert in cls.FIELDS if convert is not None)
+        cls.TABLE = StringTable()
+
+    @classmethod
+    def from_dict(cls, values, disk=None):
+        # disk: for records read from an encoded file (storage.py), the
+        # TABLE code of every on-disk code, which such files hold under the
+        # field's CODE_PREFIX key
+        if type(values) is cls:
+            return values
+        self = cls.__new__(cls)
+        get = values.get
+        for name in cls.AS_IS:
+            value = get(name, _MISSING)
+            if value is not _MISSING:
+                setattr(self, name, value)
+        codes = cls.TABLE.codes
+        for name in cls.ENCODED:
+            value = get(name, _MISSING)
+            if value is not _MISSING:
+                code = codes.get(value) if type(value) is str else None
+                setattr(self, name, code if code is not None else cls.TABLE.code(value))
+        names = cls.NAME_SET
+        if disk is not None:
+            names = cls.DISK_NAME_SET
+            for name, coded in cls.CODED:
+                value = get(coded, _MISSING)
+                if value is not _MISSING:
+                    setattr(self, name, disk[value])
+        for name, convert in cls.CONVERTED:
+            value = get(name, _MISSING)
+            if value is not _MISSING:
+                setattr(self, name, convert(value))
+        extra = None
+        if not names.issuperset(values):
+            extra = {k: v for k, v in values.items() if k not in names}
+        self.extra = extra
+        return self
+
+    # ========== Mapping ==========
+    @classmethod
+    def code(cls, value):
+        # The code of an encoded field value, e.g. a default for getattr
+        return cls.TABLE.code(value)
+
+    def get(self, key, default=None):
+        if key in self.NAME_SET:
+            value = getattr(self, key, _MISSING)
+            if value is _MISSING:
+                return default
+            if key in self.ENCODED_SET:
+                return self.TABLE.values[value]
+            return value
+        if self.extra is not None:
+            return self.extra.get(key, default)
+        return default
+
+    def __getitem__(self, key):
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            raise KeyError(key)
+        return value
+
+    def __contains__(self, key):
+        return self.get(key, _MISSING) is not _MISSING
+
+    def __iter__(self):
+        for name in self.NAMES:
+            if hasattr(self, name):
+                yield name
+        if self.extra is not None:
+            yield from self.extra
+
+    def __len__(self):
+        return sum(1 for _ in self)
+
+    def to_dict(self):
+        return {key: plain(value) for key, value in self.items()}
+
+    def __repr__(self):
+        return f"{type(self).__name__}({self.to_dict()!r})"
+
+    def __reduce__(self):
+        # Pickled by value: another process has its own string tables
+        return (type(self).from_dict, (dict(self),))
+
+class Student(Record):
+    FIELDS = [
+        ("student_id", None), ("name", None), ("grade", None), ("dob", to_date),
+        ("gender", None), ("phone", None), ("address", None), ("email", None),
+        ("guardian_name", None), ("guardian_phone", None), ("registered_at", to_date),
+    ]
+    ENCODED = ("grade", "gender")
+    __slots__ = tuple(name for name, _ in FIELDS)
+
+class Teacher(Record):
+    FIELDS = [
+        ("Teacher_id", None), ("name", None), ("age", to_int), ("dob", to_date),
+        ("gender", None), ("phone", None), ("salary", to_number),
+        ("employment_date", to_date), ("courses", None),
+    ]
+    ENCODED = ("gender",)
+    __slots__ = tuple(name for name, _ in FIELDS)
+
+class Grade(Record):
+    FIELDS = [
+        ("name", None), ("description", None), ("level", None),
+        ("class_teacher", None), ("capacity", to_int),
+    ]
+    __slots__ = tuple(name for name, _ in FIELDS)
+
+class Subject(Record):
+    FIELDS = [("name", None), ("grades", None), ("category", None), ("description", None)]
+    ENCODED = ("category",)
+    __slots__ = tuple(name for name, _ in FIELDS)
+
+class Score(Record):
+    FIELDS = [("student_id", None), ("subject", None), ("teacher_id", None), ("score", to_float)]
+    ENCODED = ("subject",)
+    __slots__ = tuple(name for name, _ in FIELDS)
+
+class Enrollment(Record):
+    FIELDS = [
+        ("student_id", None), ("grade", None), ("enroll_date", to_date),
+        ("academic_year", None), ("status", None),
+    ]
+    ENCODED = ("grade", "academic_year", "status")
+    __slots__ = tuple(name for name, _ in FIELDS)
+
+class User(Record):
+    FIELDS = [
+        ("username", None), ("password", None), ("role", None),
+        ("full_name", None), ("created_at", to_date),
+    ]
+    ENCODED = ("role",)
+    __slots__ = tuple(name for name, _ in FIELDS)
+
+RECORD_TYPES = {
+    "students.json": Student,
+    "teachers.json": Teacher,
+    "grades.json": Grade,
+    "subjects.json": Subject,
+    "scores.json": Score,
+    "enrollments.json": Enrollment,
+    "users.json": User,
+}
+
+# ========== Collections ==========
+def typed(filename, values, disk=None):
+    # [records] for a list of dicts read from filename
+    cls = RECORD_TYPES.get(filename)
+    if cls is None:
+        return values
+    from_dict = cls.from_dict
+    return [from_dict(v, disk) if isinstance(v, dict) else v for v in values]
+
+def iter_typed(filename, values, disk=None):
+    cls = RECORD_TYPES.get(filename)
+    if cls is None:
+        return iter(values)
+    from_dict = cls.from_dict
+    return (from_dict(v, disk) if isinstance(v, dict) else v for v in values)
+
+def to_json(value):
+    # json.dump(..., default=records.to_json) for lists holding records
+    if isinstance(value, Record):
+        return value.to_dict()
+    if isinstance(value, Date):
+        return str(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
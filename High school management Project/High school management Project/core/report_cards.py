@@ -0,0 +1,155 @@
+# School Management System
+# Module: Batch Report Cards (core)
+# Data Storage: students.json, scores.json (read only); writes one file per
+#               student and format into the output folder
+# Libraries: concurrent.futures, hashlib, html, os, re, storage
+#
+# Produces the report card of every student in one run. scores.json is walked
+# once to group the scores by student_id, so the whole batch costs
+# O(students + scores) instead of one scan of the scores per student. The
+# cards are then split into chunks and rendered to .txt and/or .html files by
+# a pool of worker processes.
+#
+# File names are the student IDs with anything but letters, digits, "_", "."
+# and "-" replaced. IDs that would then share a name, also ignoring case
+# (as Windows and macOS do), such as "a/b" and "a_b" or "A1" and "a1", each
+# get a short hash of the raw ID appended instead of overwriting each other.
+
+import hashlib
+import html
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from core import storage
+
+FORMATS = ["txt", "html"]
+CHUNK_CARDS = 500
+
+# ========== Grouping ==========
+def scores_by_student(scores):
+    # student_id -> [score records], in file order
+    index = {}
+    for s in scores:
+        index.setdefault(s.get("student_id"), []).append(s)
+    return index
+
+def build_cards(students, scores):
+    index = scores_by_student(scores)
+    return [{"student": s, "scores": index.get(s.get("student_id"), [])} for s in students]
+
+# ========== Rendering ==========
+def _average(scores):
+    values = [s.get("score", 0) for s in scores]
+    return sum(values) / len(values) if values else None
+
+def render_text(card):
+    student = card["student"]
+    report = f"Report Card for {student.get('name')} (ID: {student.get('student_id')})\n"
+    report += f"Grade: {student.get('grade', '')}\n\n"
+    if card["scores"]:
+        for s in card["scores"]:
+            report += f"{s.get('subject')}: {s.get('score')}\n"
+        report += f"\nAverage: {_average(card['scores']):.2f}\n"
+    else:
+        report += "No scores recorded.\n"
+    return report
+
+def render_html(card):
+    student = card["student"]
+    name = html.escape(str(student.get("name", "")))
+    student_id = html.escape(str(student.get("student_id", "")))
+    rows = "".join(
+        f"<tr><td>{html.escape(str(s.get('subject', '')))}</td><td>{html.escape(str(s.get('score', '')))}</td></tr>\n"
+        for s in card["scores"]
+    )
+    if card["scores"]:
+        body = (
+            "<table>\n<tr><th>Subject</th><th>Score</th></tr>\n"
+            f"{rows}</table>\n"
+            f"<p>Average: {_average(card['scores']):.2f}</p>\n"
+        )
+    else:
+        body = "<p>No scores recorded.</p>\n"
+    return (
+        "<!DOCTYPE html>\n<html>\n<head>\n<meta charset=\"utf-8\">\n"
+        f"<title>Report Card - {name}</title>\n</head>\n<body>\n"
+        f"<h1>Report Card for {name}</h1>\n"
+        f"<p>ID: {student_id}<br>Grade: {html.escape(str(student.get('grade', '')))}</p>\n"
+        f"{body}</body>\n</html>\n"
+    )
+
+RENDERERS = {"txt": render_text, "html": render_html}
+
+def card_filename(student_id):
+    # IDs are typed by clerks; keep them from escaping the output folder
+    return re.sub(r"[^A-Za-z0-9_.-]", "_", str(student_id)) or "_"
+
+def card_filenames(student_ids):
+    # One distinct file name per card, in the same order
+    names = [card_filename(student_id) for student_id in student_ids]
+    sharing = {}
+    for name in names:
+        sharing[name.casefold()] = sharing.get(name.casefold(), 0) + 1
+    taken = set()
+    unique = []
+    for student_id, name in zip(student_ids, names):
+        if sharing[name.casefold()] > 1:
+            name += "-" + hashlib.sha1(str(student_id).encode("utf-8")).hexdigest()[:8]
+        # The same ID twice (a hand-edited file) is numbered
+        base, n = name, 1
+        while name.casefold() in taken:
+            n += 1
+            name = f"{base}-{n}"
+        taken.add(name.casefold())
+        unique.append(name)
+    return unique
+
+def _write_chunk(cards, out_dir, formats):
+    # Runs in a worker process; cards are (card, file name) pairs. Returns
+    # the number of files written.
+    written = 0
+    for card, name in cards:
+        base = os.path.join(out_dir, name)
+        for fmt in formats:
+            with open(f"{base}.{fmt}", 'w', encoding='utf-8') as f:
+                f.write(RENDERERS[fmt](card))
+            written += 1
+    return written
+
+# ========== Batch ==========
+def generate_all(out_dir, formats=None, workers=None, progress=None):
+    # Writes every student's card to out_dir and returns (cards, files).
+    # workers=1 renders in this process, e.g. from the GUI, whose main module
+    # must not be re-imported by spawned workers. progress(cards done, total)
+    # is called after each chunk; the GUI's raises to cancel the batch.
+    formats = formats or FORMATS
+    os.makedirs(out_dir, exist_ok=True)
+    cards = build_cards(storage.load_data("students.json"), storage.load_data("scores.json"))
+    names = card_filenames([card["student"].get("student_id") for card in cards])
+    named = list(zip(cards, names))
+    chunks = [named[i:i + CHUNK_CARDS] for i in range(0, len(named), CHUNK_CARDS)]
+    if progress is not None:
+        progress(0, len(cards))
+
+    files = 0
+    done = 0
+    if workers == 1 or len(chunks) <= 1:
+        for chunk in chunks:
+            files += _write_chunk(chunk, out_dir, formats)
+            done += len(chunk)
+            if progress is not None:
+                progress(done, len(cards))
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = {pool.submit(_write_chunk, chunk, out_dir, formats): len(chunk) for chunk in chunks}
+            try:
+                for f in as_completed(futures):
+                    files += f.result()
+                    done += futures[f]
+                    if progress is not None:
+                        progress(done, len(cards))
+            except BaseException:
+                for f in futures:
+                    f.cancel()
+                raise
+    return len(cards), files
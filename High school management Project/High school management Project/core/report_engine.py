@@ -0,0 +1,99 @@
+# School Management System
+# Module: Report Engine (core)
+# Data Storage: all collections, read only
+# Libraries: storage, records, reports, occupancy, metrics
+#
+# Computes every dashboard report together. Each collection is read once,
+# as a stream of records, instead of each report reloading the files it
+# needs.
+# The results have the same shape as the single-report functions in
+# reports.py, so the same render_* functions format them. Records arrive
+# typed (records.py) from every backend; the loops read their fields with
+# getattr, which skips the Mapping layer, and group on the int codes of the
+# dictionary-encoded fields, decoding only the keys of the finished groups.
+# progress(collections done, STEPS) is called as each loop goes, so the GUI
+# can show how far it got and cancel.
+
+from core import storage, reports, occupancy, metrics
+from core.records import Score, Enrollment
+
+STEPS = 4  # collections read
+
+def compute_all(progress=None):
+    # Returns {report name: data} for every entry in reports.REPORTS
+
+    # --- students: names by the grade they sit in, first student for the demo card ---
+    student_total = 0
+    card_student = None
+    names_by_grade = {}
+    seats = occupancy.seats()
+    for s in reports.with_progress(storage.iter_records("students.json"), progress, 0, STEPS):
+        if card_student is None:
+            card_student = s
+        student_total += 1
+        grade = seats.get(getattr(s, "student_id", None))
+        if grade is not None:
+            names_by_grade.setdefault(grade, []).append(getattr(s, "name", "Unknown"))
+
+    # --- scores: per-subject averages and the demo report card ---
+    card_id = card_student.get("student_id") if card_student else None
+    card_scores = []
+    subject_totals = {}
+    subject_counts = {}
+    unknown = Score.code("Unknown")
+    for s in reports.with_progress(storage.iter_records("scores.json"), progress, 1, STEPS):
+        subject = getattr(s, "subject", unknown)
+        subject_totals[subject] = subject_totals.get(subject, 0) + getattr(s, "score", 0)
+        subject_counts[subject] = subject_counts.get(subject, 0) + 1
+        if card_id is not None and getattr(s, "student_id", None) == card_id:
+            card_scores.append(s)
+    averages = Score.TABLE.decode_keys({subj: subject_totals[subj] / subject_counts[subj] for subj in subject_totals})
+
+    # --- grades: teacher assignments and capacity ---
+    teacher_assignments = {}
+    capacity_rows = []
+    seated = occupancy.counts()
+    grade_counts = {grade: count for grade, count in seated.items() if count}
+    for g in reports.with_progress(storage.iter_records("grades.json"), progress, 2, STEPS):
+        name = g.get("name", "Unknown")
+        teacher_assignments.setdefault(g.get("class_teacher", "Unknown"), []).append(name)
+        capacity_rows.append({
+            "grade": name,
+            "actual": seated.get(name, 0),
+            "capacity": g.get("capacity", 0),
+        })
+
+    # --- enrollments: status counts ---
+    status_counts = {}
+    unknown = Enrollment.code("Unknown")
+    for e in reports.with_progress(storage.iter_records("enrollments.json"), progress, 3, STEPS):
+        status = getattr(e, "status", unknown)
+        status_counts[status] = status_counts.get(status, 0) + 1
+    status_counts = Enrollment.TABLE.decode_keys(status_counts)
+    if progress is not None:
+        progress(STEPS, STEPS)
+
+    return {
+        "student-count-by-grade": grade_counts,
+        "average-score-per-subject": averages,
+        "teacher-assignment": teacher_assignments,
+        "enrollment-status": status_counts,
+        "capacity-vs-actual": capacity_rows,
+        "students-by-grade": names_by_grade,
+        "student-report-card": {"student": card_student, "scores": card_scores} if card_student else None,
+        "totals": {
+            "students": student_total,
+            "teachers": storage.count("teachers.json"),
+            "subjects": storage.count("subjects.json"),
+        },
+    }
+
+@metrics.timed("report:all")
+def run_all(progress=None):
+    # [(name, title, data, text)] in dashboard order
+    results = compute_all(progress)
+    rows = []
+    for name, (title, _, render) in reports.REPORTS.items():
+        data = results[name]
+        rows.append((name, title, data, render(data)))
+    return rows
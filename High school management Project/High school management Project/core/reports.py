@@ -0,0 +1,165 @@
+# School Management System
+# Module: Reports (core)
+# Data Storage: all collections, read only
+# Libraries: storage, aggregates, occupancy, metrics
+#
+# Each report has a function returning plain data and a render_* function
+# turning that data into the text the dashboard shows. REPORTS maps the CLI
+# name of every report to (title, compute, render). Counts and averages come
+# from the materialized aggregates, so they cost O(groups), not O(records).
+#
+# compute and run_report take an optional progress(done, total) callback,
+# as report_cards.generate_all does; the GUI's raises to cancel the report.
+# Loops over a whole collection call it every PROGRESS_EVERY records.
+
+from core import storage, aggregates, occupancy, metrics
+
+PROGRESS_EVERY = 5000
+
+# ========== Progress ==========
+def with_progress(records, progress, step, steps):
+    # The same records, calling progress(step, steps) as they go by
+    if progress is None:
+        return records
+    return _reporting(records, progress, step, steps)
+
+def _reporting(records, progress, step, steps):
+    progress(step, steps)
+    for i, record in enumerate(records, start=1):
+        if i % PROGRESS_EVERY == 0:
+            progress(step, steps)
+        yield record
+
+# ========== Report Data ==========
+# The grade reports count a student in the grade they sit in (occupancy.py),
+# the same counts the capacity check uses: an Active enrollment into another
+# grade moves them, and a waitlisted student is in no grade yet.
+def student_count_by_grade(progress=None):
+    return {grade: count for grade, count in occupancy.counts().items() if count}
+
+def average_score_per_subject(progress=None):
+    return aggregates.average_by("scores.json", "subject", "score")
+
+def teacher_assignment(progress=None):
+    return storage.group_values("grades.json", "class_teacher", "name")
+
+def enrollment_status(progress=None):
+    return aggregates.count_by("enrollments.json", "status")
+
+def capacity_vs_actual(progress=None):
+    # [{"grade", "actual", "capacity"}] in grades.json order; "actual" is
+    # the students seated there (waitlisted and withdrawn ones are not)
+    grade_student_counts = occupancy.counts()
+    rows = []
+    for g in with_progress(storage.iter_records("grades.json"), progress, 0, 1):
+        name = g.get("name", "Unknown")
+        rows.append({
+            "grade": name,
+            "actual": grade_student_counts.get(name, 0),
+            "capacity": g.get("capacity", 0),
+        })
+    return rows
+
+def students_by_grade(progress=None):
+    seats = occupancy.seats()
+    grades = {}
+    for s in with_progress(storage.iter_records("students.json"), progress, 0, 1):
+        grade = seats.get(s.get("student_id"))
+        if grade is not None:
+            grades.setdefault(grade, []).append(s.get("name", "Unknown"))
+    return grades
+
+def student_report_card(student_id=None, progress=None):
+    # Defaults to the first student, as the dashboard demo does
+    if student_id is None:
+        student = storage.first("students.json")
+    else:
+        matches = storage.find("students.json", "student_id", student_id)
+        student = matches[0] if matches else None
+    if student is None:
+        return None
+    return {
+        "student": student,
+        "scores": storage.find("scores.json", "student_id", student.get("student_id")),
+    }
+
+def totals(progress=None):
+    return {
+        "students": aggregates.count("students.json"),
+        "teachers": aggregates.count("teachers.json"),
+        "subjects": aggregates.count("subjects.json"),
+    }
+
+# ========== Report Text ==========
+def render_student_count_by_grade(grade_counts):
+    report = "\n".join([f"Grade {g}: {c} students" for g, c in grade_counts.items()])
+    return report or "No student records found."
+
+def render_average_score_per_subject(averages):
+    report = "\n".join([f"{subj}: {avg:.2f}" for subj, avg in averages.items()])
+    return report or "No score records found."
+
+def render_teacher_assignment(teacher_assignments):
+    report = "\n".join([
+        f"Teacher {t}: Grades {', '.join(grades)}"
+        for t, grades in teacher_assignments.items()
+    ])
+    return report or "No teacher assignments found."
+
+def render_enrollment_status(status_counts):
+    report = "\n".join([f"{status}: {count}" for status, count in status_counts.items()])
+    return report or "No enrollment records found."
+
+def render_capacity_vs_actual(rows):
+    report = "\n".join([f"Grade {r['grade']}: {r['actual']}/{r['capacity']} students" for r in rows])
+    return report or "No grade or student records found."
+
+def render_students_by_grade(grades):
+    report = ""
+    for grade, names in grades.items():
+        report += f"Grade {grade}:\n"
+        for name in names:
+            report += f"  - {name}\n"
+    return report or "No student records found."
+
+def render_student_report_card(card):
+    if card is None:
+        return "No student records found."
+    student = card["student"]
+    report = f"Report Card for {student.get('name')} (ID: {student.get('student_id')})\n"
+    if card["scores"]:
+        for s in card["scores"]:
+            report += f"{s.get('subject')}: {s.get('score')}\n"
+    else:
+        report += "No scores found. (Dummy: Math: 80, English: 75)\n"
+    return report
+
+def render_totals(counts):
+    return (
+        f"Total Students: {counts['students']}\n"
+        f"Total Teachers: {counts['teachers']}\n"
+        f"Total Subjects: {counts['subjects']}"
+    )
+
+# ========== Registry ==========
+REPORTS = {
+    "student-count-by-grade": ("Student Count by Grade", student_count_by_grade, render_student_count_by_grade),
+    "average-score-per-subject": ("Average Score per Subject", average_score_per_subject, render_average_score_per_subject),
+    "teacher-assignment": ("Teacher Assignment Summary", teacher_assignment, render_teacher_assignment),
+    "enrollment-status": ("Enrollment Status Summary", enrollment_status, render_enrollment_status),
+    "capacity-vs-actual": ("Capacity vs. Actual Students", capacity_vs_actual, render_capacity_vs_actual),
+    "students-by-grade": ("Students by Grade", students_by_grade, render_students_by_grade),
+    "student-report-card": ("Student Report Card", student_report_card, render_student_report_card),
+    "totals": ("Totals", totals, render_totals),
+}
+
+def run_report(name, progress=None):
+    # Returns (title, data, text)
+    title, compute, render = REPORTS[name]
+    with metrics.timer(f"report:{name}"):
+        if progress is not None:
+            progress(0, 1)
+        data = compute(progress=progress)
+        if progress is not None:
+            progress(1, 1)
+        return title, data, render(data)
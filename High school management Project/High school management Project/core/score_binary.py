@@ -0,0 +1,337 @@
+# School Management System
+# Module: Binary Score File (core)
+# Data Storage: scores.bin (fixed-width records) + scores.bin.dict (strings)
+# Libraries: json, mmap, os, struct, threading, records, storage
+#
+# A compact alternative to scores.json, used when the "score_format" setting
+# is "binary". Every score is a 16-byte record: the student_id, subject and
+# teacher_id as uint32 codes into the string dictionary, then the score as a
+# float32. The file starts with a 16-byte header:
+#
+#     magic "SCRB" | version uint16 | record size uint16 | record count uint64
+#
+# scores.bin.dict holds the dictionary as JSON lines [field number, string],
+# appended as new strings appear; a string's code is its position among the
+# lines of its field. Appends write the new strings, then the records, and
+# only then raise the header count, so a crash part-way leaves the extra
+# bytes unreferenced instead of corrupt. The dictionary stays in memory
+# between appends; each one reads only the lines other processes added
+# since, so adding a score does not reload every string ever stored.
+#
+# Readers memory-map the file: opening it parses nothing but the header and
+# the dictionary, and a record is decoded only when it is accessed. Once a
+# change to the files makes open_scores() map them again, the old mapping is
+# closed as soon as no read of it is under way. A missing scores.bin is
+# rebuilt from scores.json (an empty file when there is none), so deleting it
+# or switching "score_format" without converting loses no scores.
+#
+#     python cli.py scores-format binary    (scores.json -> scores.bin)
+#     python cli.py scores-format json      (scores.bin -> scores.json)
+
+import json
+import mmap
+import os
+import struct
+import threading
+from core import storage
+from core.records import Score
+
+COLLECTION = "scores.json"
+BIN_FILE = "scores.bin"
+DICT_FILE = "scores.bin.dict"
+FIELDS = ["student_id", "subject", "teacher_id", "score"]
+CODED_FIELDS = ["student_id", "subject", "teacher_id"]
+
+MAGIC = b"SCRB"
+VERSION = 1
+HEADER = struct.Struct("<4sHHQ")
+RECORD = struct.Struct("<IIIf")
+FLOAT32 = struct.Struct("<f")
+
+# ========== Score Values ==========
+def _to_float32(value):
+    return FLOAT32.unpack(FLOAT32.pack(value))[0]
+
+def score_value(stored):
+    # The shortest decimal that stores as the same float32, so 88.1 comes
+    # back as 88.1 rather than 88.09999847412109
+    text = f"{stored:.7g}"
+    if _to_float32(float(text)) != stored:
+        text = f"{stored:.9g}"
+    return float(text)
+
+def check_score(value):
+    # Raises ValueError for scores that float32 cannot hold exactly
+    value = float(value)
+    if score_value(_to_float32(value)) != value:
+        raise ValueError(f"Score {value!r} cannot be stored exactly as float32.")
+    return value
+
+# ========== Dictionary ==========
+class _Dictionary:
+    # scores.bin.dict kept in memory. refresh() reads only the lines appended
+    # since the last look, as indexes.KeyIndex does, and starts over when the
+    # file was replaced by a whole rewrite.
+    def __init__(self):
+        self.reset(None)
+
+    def reset(self, inode):
+        self.strings = [[] for _ in CODED_FIELDS]
+        self.codes = [{} for _ in CODED_FIELDS]
+        self.inode = inode
+        self.offset = 0  # end of the last complete line read
+
+    def add(self, field, value):
+        self.codes[field][value] = len(self.strings[field])
+        self.strings[field].append(value)
+
+    def refresh(self):
+        # Call under the collection lock
+        try:
+            st = os.stat(DICT_FILE)
+        except FileNotFoundError:
+            self.reset(None)
+            return self
+        if st.st_ino != self.inode or st.st_size < self.offset:
+            self.reset(st.st_ino)
+        if st.st_size > self.offset:
+            with open(DICT_FILE, 'rb') as f:
+                f.seek(self.offset)
+                for line in f:
+                    if not line.endswith(b"\n"):
+                        break  # torn by a crash; those strings were never used
+                    field, value = json.loads(line)
+                    self.add(field, value)
+                    self.offset += len(line)
+        return self
+
+_dictionary = _Dictionary()
+
+# ========== Reading ==========
+_open_lock = threading.Lock()
+
+class ScoreFile:
+    # Read-only sequence of Score records backed by a memory map. Reads
+    # count themselves in `readers`, so a retired file (see open_scores) is
+    # closed only once the last one is done.
+    def __init__(self, path=BIN_FILE, strings=None):
+        # strings only ever grow, so a reader may share the in-memory lists
+        if strings is None:
+            strings = _Dictionary().refresh().strings
+        self.strings = strings
+        self.readers = 0
+        self.retired = False
+        with open(path, 'rb') as f:
+            self.map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, size, self.count = HEADER.unpack_from(self.map, 0)
+        if magic != MAGIC or version != VERSION or size != RECORD.size:
+            self.map.close()
+            raise ValueError(f"{path} is not a version {VERSION} score file.")
+
+    def __len__(self):
+        return self.count
+
+    def _decode(self, student, subject, teacher, score):
+        return Score.from_dict({
+            "student_id": self.strings[0][student],
+            "subject": self.strings[1][subject],
+            "teacher_id": self.strings[2][teacher],
+            "score": score_value(score),
+        })
+
+    def _record(self, i):
+        if i < 0:
+            i += self.count
+        if not 0 <= i < self.count:
+            raise IndexError("score index out of range")
+        return self._decode(*RECORD.unpack_from(self.map, HEADER.size + i * RECORD.size))
+
+    def __getitem__(self, i):
+        self._start_read()
+        try:
+            if isinstance(i, slice):
+                return [self._record(j) for j in range(*i.indices(self.count))]
+            return self._record(i)
+        finally:
+            self._end_read()
+
+    def __iter__(self):
+        self._start_read()
+        return self._iter_records()
+
+    def _iter_records(self):
+        try:
+            for fields in RECORD.iter_unpack(self.records_buffer()):
+                yield self._decode(*fields)
+        finally:
+            self._end_read()
+
+    def records_buffer(self):
+        # The raw records, e.g. for numpy.frombuffer
+        return memoryview(self.map)[HEADER.size:HEADER.size + self.count * RECORD.size]
+
+    # ========== Closing ==========
+    def _start_read(self):
+        with _open_lock:
+            self.readers += 1
+
+    def _end_read(self):
+        with _open_lock:
+            self.readers -= 1
+            if self.retired and not self.readers:
+                self.close()
+
+    def retire(self):
+        # Call with _open_lock held: close now, or after the last read
+        self.retired = True
+        if not self.readers:
+            self.close()
+
+    def close(self):
+        try:
+            self.map.close()
+        except BufferError:
+            pass  # a records_buffer() view is still alive; unmapped with it
+
+def _signature():
+    signature = []
+    for path in (BIN_FILE, DICT_FILE):
+        try:
+            st = os.stat(path)
+        except FileNotFoundError:
+            signature.append(None)
+            continue
+        signature.append((st.st_ino, st.st_size, st.st_mtime_ns))
+    return tuple(signature)
+
+_open = {"signature": None, "file": None}
+
+def _replace_open(signature, file):
+    # Call with _open_lock held
+    if _open["file"] is not None:
+        _open["file"].retire()
+    _open.update(signature=signature, file=file)
+
+def open_scores():
+    # The same ScoreFile is returned while neither file changes. Read it
+    # straight away: the next call after a change may close it.
+    with storage.collection_lock(COLLECTION):
+        _ensure_file()
+        signature = _signature()
+        with _open_lock:
+            if _open["file"] is None or _open["signature"] != signature:
+                _replace_open(signature, ScoreFile(strings=_dictionary.refresh().strings))
+            return _open["file"]
+
+# ========== Writing ==========
+def _encode(records, dictionary):
+    # Packed records plus the [field number, string] pairs not yet in the
+    # dictionary; those are left out of it until they are on disk
+    new = []
+    staged = [{} for _ in CODED_FIELDS]
+    packed = bytearray()
+    count = 0
+    for record in records:
+        count += 1
+        row = []
+        for field_number, field in enumerate(CODED_FIELDS):
+            value = str(record.get(field, ""))
+            code = dictionary.codes[field_number].get(value)
+            if code is None:
+                code = staged[field_number].get(value)
+            if code is None:
+                code = staged[field_number][value] = len(dictionary.strings[field_number]) + len(staged[field_number])
+                new.append((field_number, value))
+            row.append(code)
+        packed += RECORD.pack(*row, check_score(record.get("score", 0)))
+    return bytes(packed), new, count
+
+def _dictionary_lines(new):
+    return "".join(json.dumps([n, v]) + "\n" for n, v in new).encode("utf-8")
+
+def _write_file(records):
+    # Whole rewrite through temp files, as storage does for JSON
+    packed, new, count = _encode(records, _Dictionary())
+    files = [
+        (DICT_FILE, _dictionary_lines(new)),
+        (BIN_FILE, HEADER.pack(MAGIC, VERSION, RECORD.size, count) + packed),
+    ]
+    for path, data in files:
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, 'wb') as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+
+def _ensure_file():
+    # Call under the collection lock
+    if not os.path.exists(BIN_FILE):
+        write_records(_json_records())
+
+def write_records(records):
+    # Replaces the whole collection; the key index and aggregates built from
+    # the old records are dropped, to be rebuilt on next use
+    with storage.collection_lock(COLLECTION):
+        if os.name == "nt":
+            # Windows cannot replace a mapped file. Elsewhere the old mapping
+            # stays valid for anyone still reading it.
+            with _open_lock:
+                _replace_open(None, None)
+        _write_file(records)
+        storage.drop_derived(COLLECTION)
+
+def append_records(records):
+    with storage.collection_lock(COLLECTION):
+        _ensure_file()
+        dictionary = _dictionary.refresh()
+        packed, new, added = _encode(records, dictionary)
+        if new:
+            data = _dictionary_lines(new)
+            with open(DICT_FILE, 'r+b') as f:
+                # Start after the last complete line, over any crash leftover
+                f.seek(dictionary.offset)
+                f.write(data)
+                f.truncate()
+                f.flush()
+                os.fsync(f.fileno())
+            for field_number, value in new:
+                dictionary.add(field_number, value)
+            dictionary.offset += len(data)
+        with open(BIN_FILE, 'r+b') as f:
+            _, _, _, count = HEADER.unpack(f.read(HEADER.size))
+            f.seek(HEADER.size + count * RECORD.size)
+            f.write(packed)
+            f.truncate()  # drop bytes a crashed append left past the count
+            f.flush()
+            os.fsync(f.fileno())
+            f.seek(0)
+            f.write(HEADER.pack(MAGIC, VERSION, RECORD.size, count + added))
+            f.flush()
+            os.fsync(f.fileno())
+
+# ========== Conversion ==========
+def _json_records():
+    # The records of scores.json (with its log); raises ValueError if one
+    # would not convert back exactly
+    records = storage.read_json_files(COLLECTION)
+    for i, record in enumerate(records, start=1):
+        if sorted(record) != sorted(FIELDS):
+            raise ValueError(f"Record {i} of {COLLECTION} has fields other than {', '.join(FIELDS)}.")
+        if not all(isinstance(record[field], str) for field in CODED_FIELDS):
+            raise ValueError(f"Record {i} of {COLLECTION} has an ID or subject that is not text.")
+        check_score(record["score"])
+    return records
+
+def from_json():
+    # scores.json (with its log) -> scores.bin; raises ValueError, writing
+    # nothing, if a record would not convert back exactly
+    records = _json_records()
+    write_records(records)
+    return len(records)
+
+def to_json():
+    # scores.bin -> scores.json
+    records = list(open_scores())
+    storage.save_json_data(COLLECTION, records)
+    return len(records)
@@ -0,0 +1,50 @@
+# School Management System
+# Module: Scores (core)
+# Data Storage: scores.json (or scores.bin, see score_binary.py)
+# Libraries: storage, aggregates, integrity, config, score_binary, metrics
+
+from core import storage, aggregates, config, score_binary, metrics
+from core.errors import ValidationError
+from core.integrity import check_references
+
+FILENAME = "scores.json"
+FIELDS = ["student_id", "subject", "teacher_id", "score"]
+
+def make_score(values):
+    try:
+        score_value = float(values.get("score", ""))
+    except ValueError:
+        raise ValidationError("Score must be a number.")
+
+    score = {
+        "student_id": values.get("student_id", ""),
+        "subject": values.get("subject", ""),
+        "teacher_id": values.get("teacher_id", ""),
+        "score": score_value
+    }
+
+    if not all([score["student_id"], score["subject"], score["teacher_id"], str(values.get("score", ""))]):
+        raise ValidationError("All fields are required.")
+
+    if config.get("score_format") == "binary":
+        try:
+            score_binary.check_score(score_value)
+        except ValueError:
+            raise ValidationError("Score has too many digits.")
+    return score
+
+@metrics.timed(f"add:{FILENAME}")
+def add_score(values):
+    score = make_score(values)
+    check_references(FILENAME, score)
+
+    with storage.collection_lock(FILENAME):
+        storage.append_record(FILENAME, score)
+        aggregates.record_added(FILENAME, score)
+    return score
+
+def list_scores():
+    return storage.load_data(FILENAME)
+
+def describe_score(s):
+    return f"Student ID: {s['student_id']}, Subject: {s['subject']}, Teacher ID: {s['teacher_id']}, Score: {s['score']}"
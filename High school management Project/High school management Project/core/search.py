@@ -0,0 +1,182 @@
+# School Management System
+# Module: Full-Text Search (core)
+# Data Storage: students.json, teachers.json, subjects.json (read only)
+# Libraries: bisect, re, threading, storage, sqlite_backend, metrics
+#
+# An inverted index per searchable collection: every word of the indexed
+# fields points at the records holding it, per field. Words are runs of
+# letters or of digits, case-folded, so "john.tubman7@example.com" gives
+# john, tubman, 7, example and com. A query finds the records that contain
+# every one of its words, whole or as the start of a word ("tub" finds
+# "Tubman"; a single letter only matches whole words). The distinct words
+# are kept sorted, so a prefix is one bisect away. Results are ranked by the
+# weight of the field each word matched in (a name beats an address), whole
+# words over prefixes, then insertion order.
+#
+# The index is kept in memory and follows the collection's files. When the
+# collection has only grown (an add_* in this window, or another window's
+# insert, both appended to the log) just the new records are indexed; any
+# other change, such as a save_data or a compaction, rebuilds it. With the
+# SQLite backend a LIKE query picks the candidates and they are ranked the
+# same way.
+#
+#     python cli.py search students tubman
+
+import re
+import threading
+from bisect import bisect_left, insort
+from core import storage, sqlite_backend, metrics
+
+# collection file -> [(field, weight)]
+SEARCH_FIELDS = {
+    "students.json": [("name", 4), ("email", 2), ("guardian_name", 2), ("address", 1)],
+    "teachers.json": [("name", 4), ("courses", 2)],
+    "subjects.json": [("name", 4), ("description", 1)],
+}
+
+RESULT_LIMIT = 100
+WHOLE_WORD = 2  # score multiplier of a whole-word match over a prefix match
+MIN_PREFIX = 2  # shorter query words must match whole words
+
+_WORD = re.compile(r"[^\W\d_]+|\d+")
+
+def words(text):
+    return _WORD.findall(str(text).casefold())
+
+class SearchIndex:
+    def __init__(self, filename):
+        self.filename = filename
+        self.fields = SEARCH_FIELDS[filename]
+        self.weights = [weight for _, weight in self.fields]
+        self.records = None    # the snapshot indexed
+        self.signature = None  # of the files when it was taken
+        self.postings = [{} for _ in self.fields]  # per field: word -> [record numbers]
+        self.known = set()     # distinct words
+        self.words = []        # the same, sorted
+        self.lock = threading.Lock()
+
+    # ========== Building ==========
+    def add(self, start, records):
+        # Index records numbered from start; returns the words not seen before
+        known = self.known
+        new = []
+        for n, record in enumerate(records, start):
+            for (field, _), postings in zip(self.fields, self.postings):
+                value = record.get(field)
+                if value is None:
+                    continue
+                for word in set(words(value)):
+                    ids = postings.get(word)
+                    if ids is None:
+                        ids = postings[word] = []
+                        if word not in known:
+                            known.add(word)
+                            new.append(word)
+                    ids.append(n)
+        return new
+
+    def build(self, records):
+        self.postings = [{} for _ in self.fields]
+        self.known = set()
+        self.add(0, records)
+        self.words = sorted(self.known)
+        self.records = records
+
+    def refresh(self):
+        # Call with self.lock held. The signature is read before the records,
+        # so the records are never older than it.
+        signature = storage.collection_signature(self.filename)
+        if signature == self.signature:
+            return
+        snapshot = storage.snapshot(self.filename)
+        if self.records is not None and storage.only_appended(self.signature, signature):
+            new = self.add(len(self.records), snapshot[len(self.records):])
+            if len(new) > len(self.words) // 10:
+                self.words = sorted(self.known)
+            else:
+                for word in new:
+                    insort(self.words, word)
+            self.records = snapshot
+        else:
+            self.build(snapshot)
+        self.signature = signature
+
+    # ========== Queries ==========
+    def matches(self, word):
+        # {record number: best score of word in that record}
+        groups = []
+        tokens = [word]
+        if len(word) >= MIN_PREFIX:
+            i = bisect_left(self.words, word)
+            tokens = []
+            while i < len(self.words) and self.words[i].startswith(word):
+                tokens.append(self.words[i])
+                i += 1
+        for token in tokens:
+            factor = WHOLE_WORD if token == word else 1
+            for weight, postings in zip(self.weights, self.postings):
+                ids = postings.get(token)
+                if ids:
+                    groups.append((weight * factor, ids))
+        # Lowest scores first, so a record's best score is written last
+        groups.sort(key=lambda group: group[0])
+        best = {}
+        for score, ids in groups:
+            best.update(dict.fromkeys(ids, score))
+        return best
+
+    def rank(self, query_words, limit):
+        # The best `limit` records holding every query word
+        if not query_words:
+            return []
+        # Rarest word first, so the candidates shrink as fast as possible
+        per_word = sorted((self.matches(word) for word in set(query_words)), key=len)
+        totals = dict(per_word[0])
+        for best in per_word[1:]:
+            totals = {n: score + best[n] for n, score in totals.items() if n in best}
+            if not totals:
+                return []
+        # Highest score first; the sort is stable, so ties stay in record order
+        top = sorted(sorted(totals), key=totals.__getitem__, reverse=True)[:limit]
+        return [self.records[n] for n in top]
+
+_lock = threading.Lock()
+_indexes = {}
+
+def get_index(filename):
+    with _lock:
+        index = _indexes.get(filename)
+        if index is None:
+            index = _indexes[filename] = SearchIndex(filename)
+        return index
+
+def reset():
+    # Drop every index, e.g. to time a cold build
+    with _lock:
+        _indexes.clear()
+
+def _search_sqlite(filename, query_words, limit):
+    # The LIKE filter matches anywhere inside a value; indexing just the
+    # candidates narrows that to word starts and ranks them
+    fields = [field for field, _ in SEARCH_FIELDS[filename]]
+    index = SearchIndex(filename)
+    index.build(sqlite_backend.search_candidates(filename, fields, query_words))
+    return index.rank(query_words, limit)
+
+def search(filename, query, limit=RESULT_LIMIT):
+    # Records of a searchable collection matching `query`, best first
+    if filename not in SEARCH_FIELDS:
+        raise ValueError(f"{filename} cannot be searched.")
+    query_words = words(query)
+    if not query_words:
+        return []
+    with metrics.timer(f"search:{filename}") as t:
+        if storage.BACKEND == "sqlite":
+            results = _search_sqlite(filename, query_words, limit)
+        else:
+            index = get_index(filename)
+            with index.lock:
+                index.refresh()
+                results = index.rank(query_words, limit)
+        t.records = len(results)
+    return results
@@ -0,0 +1,305 @@
+# School Management System
+# Module: SQLite Storage Backend
+# Data Storage: SQLite database (config "sqlite_db", default school.db)
+# Libraries: sqlite3, json, threading, config, records, storage
+#
+# Maps every JSON collection to an indexed table and offers the same calls
+# as storage.py, so the GUI modules keep passing "students.json" etc. and
+# never see SQL. Enable with "backend": "sqlite" in config.json (or
+# SCHOOL_BACKEND=sqlite) after importing the JSON data once:
+#
+#     python cli.py sqlite-import
+
+import json
+import sqlite3
+import threading
+from core import config, records
+from core import storage
+
+# ========== Schema ==========
+# collection file -> (table, [(column, sql type)], primary key or None)
+TABLES = {
+    "students.json": ("students", [
+        ("student_id", "TEXT"), ("name", "TEXT"), ("grade", "TEXT"), ("dob", "TEXT"),
+        ("gender", "TEXT"), ("phone", "TEXT"), ("address", "TEXT"), ("email", "TEXT"),
+        ("guardian_name", "TEXT"), ("guardian_phone", "TEXT"), ("registered_at", "TEXT"),
+    ], "student_id"),
+    "teachers.json": ("teachers", [
+        ("Teacher_id", "TEXT"), ("name", "TEXT"), ("age", "TEXT"), ("dob", "TEXT"),
+        ("gender", "TEXT"), ("phone", "TEXT"), ("salary", "TEXT"),
+        ("employment_date", "TEXT"), ("courses", "TEXT"),
+    ], "Teacher_id"),
+    "grades.json": ("grades", [
+        ("name", "TEXT"), ("description", "TEXT"), ("level", "TEXT"),
+        ("class_teacher", "TEXT"), ("capacity", "INTEGER"),
+    ], "name"),
+    "subjects.json": ("subjects", [
+        ("name", "TEXT"), ("grades", "TEXT"),
+        ("category", "TEXT"), ("description", "TEXT"),
+    ], "name"),
+    "scores.json": ("scores", [
+        ("student_id", "TEXT"), ("subject", "TEXT"), ("teacher_id", "TEXT"), ("score", "REAL"),
+    ], None),
+    "enrollments.json": ("enrollments", [
+        ("student_id", "TEXT"), ("grade", "TEXT"), ("enroll_date", "TEXT"),
+        ("academic_year", "TEXT"), ("status", "TEXT"),
+    ], None),
+    "users.json": ("users", [
+        ("username", "TEXT"), ("password", "TEXT"), ("role", "TEXT"),
+        ("full_name", "TEXT"), ("created_at", "TEXT"),
+    ], "username"),
+}
+
+# Secondary indexes for the report and lookup columns
+INDEXES = [
+    ("students", "grade"),
+    ("scores", "student_id"),
+    ("scores", "subject"),
+    ("scores", "teacher_id"),
+    ("enrollments", "student_id"),
+    ("enrollments", "status"),
+    ("grades", "class_teacher"),
+]
+
+# Columns stored as JSON text because they hold lists
+JSON_COLUMNS = {("subjects", "grades")}
+
+# A table whose keys the JSON backend compares normalized (indexes.py: subject
+# names are case-folded) stores the normalized key too, in KEY_COLUMN, and
+# makes that the primary key, so uniqueness and lookups match that backend
+KEY_COLUMN = "normalized_key"
+
+# page() sorts with storage.sort_key, as the JSON backend does
+SORT_COLLATION = "SORT_KEY"
+
+_RECORD_TYPES = {table: records.RECORD_TYPES[filename] for filename, (table, _, _) in TABLES.items()}
+_FILENAMES = {table: filename for filename, (table, _, _) in TABLES.items()}
+_normalizers = {}
+
+def _normalizer(table):
+    # The key index's normalize function for table's key, or None
+    if table not in _normalizers:
+        from core import indexes
+        _normalizers[table] = indexes.PRIMARY_KEYS.get(_FILENAMES[table], (None, None))[1]
+    return _normalizers[table]
+
+def _compare_sort_keys(a, b):
+    a, b = storage.sort_key(a), storage.sort_key(b)
+    return (a > b) - (a < b)
+
+_local = threading.local()
+
+def connect():
+    conn = getattr(_local, "conn", None)
+    if conn is None:
+        conn = sqlite3.connect(config.get("sqlite_db"), timeout=30)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.create_collation(SORT_COLLATION, _compare_sort_keys)
+        create_schema(conn)
+        _local.conn = conn
+    return conn
+
+def close():
+    # Drop this thread's connection, e.g. before switching data folders
+    conn = getattr(_local, "conn", None)
+    if conn is not None:
+        conn.close()
+        _local.conn = None
+
+def create_schema(conn):
+    for table, columns, key in TABLES.values():
+        normalized = _normalizer(table) is not None
+        cols = []
+        for name, sql_type in columns:
+            col = f"{name} {sql_type}"
+            if name == key and not normalized:
+                col += " PRIMARY KEY"
+            cols.append(col)
+        if normalized:
+            cols.append(f"{KEY_COLUMN} TEXT PRIMARY KEY")
+        conn.execute(f"CREATE TABLE IF NOT EXISTS {table} ({', '.join(cols)})")
+    for table, column in INDEXES:
+        conn.execute(f"CREATE INDEX IF NOT EXISTS idx_{table}_{column} ON {table} ({column})")
+    conn.commit()
+
+# ========== Row Conversion ==========
+def _columns(filename):
+    table, columns, key = TABLES[filename]
+    return table, [name for name, _ in columns], key
+
+def _to_row(table, names, record):
+    row = []
+    for name in names:
+        value = records.plain(record.get(name))
+        if (table, name) in JSON_COLUMNS and value is not None:
+            value = json.dumps(value)
+        row.append(value)
+    normalize = _normalizer(table)
+    if normalize is not None:
+        row.append(normalize(str(record.get(TABLES[_FILENAMES[table]][2], ""))))
+    return row
+
+def _to_record(table, names, row):
+    # The same typed record the JSON backend reads
+    record = {}
+    for name, value in zip(names, row):
+        if value is None:
+            continue
+        if (table, name) in JSON_COLUMNS:
+            value = json.loads(value)
+        record[name] = value
+    return _RECORD_TYPES[table].from_dict(record)
+
+def _like_escape(text):
+    # For LIKE ... ESCAPE '\': the text matched literally
+    return text.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+def _insert_sql(table, names, verb="INSERT"):
+    # For rows made by _to_row
+    if _normalizer(table) is not None:
+        names = names + [KEY_COLUMN]
+    return f"{verb} INTO {table} ({', '.join(names)}) VALUES ({', '.join('?' * len(names))})"
+
+# ========== Data Utilities ==========
+def load_data(filename):
+    table, names, _ = _columns(filename)
+    rows = connect().execute(f"SELECT {', '.join(names)} FROM {table} ORDER BY rowid")
+    return [_to_record(table, names, row) for row in rows]
+
+def iter_records(filename):
+    # The cursor fetches rows as they are consumed
+    table, names, _ = _columns(filename)
+    for row in connect().execute(f"SELECT {', '.join(names)} FROM {table} ORDER BY rowid"):
+        yield _to_record(table, names, row)
+
+def save_data(filename, data):
+    table, names, _ = _columns(filename)
+    conn = connect()
+    with conn:
+        conn.execute(f"DELETE FROM {table}")
+        conn.executemany(_insert_sql(table, names), (_to_row(table, names, r) for r in data))
+
+def append_record(filename, record):
+    table, names, _ = _columns(filename)
+    conn = connect()
+    with conn:
+        conn.execute(_insert_sql(table, names), _to_row(table, names, record))
+
+def append_records(filename, records):
+    table, names, _ = _columns(filename)
+    conn = connect()
+    with conn:
+        conn.executemany(_insert_sql(table, names), [_to_row(table, names, r) for r in records])
+
+def key_map(filename):
+    table, _, key = _columns(filename)
+    if _normalizer(table) is not None:
+        return dict(connect().execute(f"SELECT {KEY_COLUMN}, {key} FROM {table}"))
+    return {row[0]: row[0] for row in connect().execute(f"SELECT {key} FROM {table}")}
+
+def add_unique(filename, record):
+    table, names, _ = _columns(filename)
+    conn = connect()
+    try:
+        with conn:
+            conn.execute(_insert_sql(table, names), _to_row(table, names, record))
+    except sqlite3.IntegrityError:
+        return False
+    return True
+
+def key_exists(filename, value):
+    return stored_key(filename, value) is not None
+
+def stored_key(filename, value):
+    table, _, key = _columns(filename)
+    normalize = _normalizer(table)
+    if normalize is not None:
+        row = connect().execute(f"SELECT {key} FROM {table} WHERE {KEY_COLUMN} = ?", (normalize(str(value)),)).fetchone()
+    else:
+        row = connect().execute(f"SELECT {key} FROM {table} WHERE {key} = ?", (str(value),)).fetchone()
+    return row[0] if row is not None else None
+
+# ========== Aggregates ==========
+def count(filename):
+    table, _, _ = _columns(filename)
+    return connect().execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+
+def count_by(filename, field):
+    table, _, _ = _columns(filename)
+    rows = connect().execute(
+        f"SELECT COALESCE({field}, 'Unknown'), COUNT(*) FROM {table} "
+        f"GROUP BY 1 ORDER BY MIN(rowid)")
+    return dict(rows)
+
+def average_by(filename, group_field, value_field):
+    table, _, _ = _columns(filename)
+    rows = connect().execute(
+        f"SELECT COALESCE({group_field}, 'Unknown'), AVG(COALESCE({value_field}, 0)) FROM {table} "
+        f"GROUP BY 1 ORDER BY MIN(rowid)")
+    return dict(rows)
+
+def group_values(filename, group_field, value_field):
+    table, _, _ = _columns(filename)
+    groups = {}
+    rows = connect().execute(
+        f"SELECT COALESCE({group_field}, 'Unknown'), COALESCE({value_field}, 'Unknown') "
+        f"FROM {table} ORDER BY rowid")
+    for group, value in rows:
+        groups.setdefault(group, []).append(value)
+    return groups
+
+def find(filename, field, value):
+    table, names, _ = _columns(filename)
+    rows = connect().execute(
+        f"SELECT {', '.join(names)} FROM {table} WHERE {field} = ? ORDER BY rowid", (value,))
+    return [_to_record(table, names, row) for row in rows]
+
+def first(filename):
+    table, names, _ = _columns(filename)
+    row = connect().execute(
+        f"SELECT {', '.join(names)} FROM {table} ORDER BY rowid LIMIT 1").fetchone()
+    return _to_record(table, names, row) if row else None
+
+def page(filename, offset, limit, sort_field=None, descending=False):
+    table, names, _ = _columns(filename)
+    order = "rowid"
+    if sort_field is not None:
+        if sort_field not in names:
+            raise ValueError(f"Unknown column {sort_field!r} for {table}")
+        order = f"{sort_field} COLLATE {SORT_COLLATION} {'DESC' if descending else 'ASC'}, rowid"
+    rows = connect().execute(
+        f"SELECT {', '.join(names)} FROM {table} ORDER BY {order} LIMIT ? OFFSET ?",
+        (limit, offset))
+    return [_to_record(table, names, row) for row in rows]
+
+def search_candidates(filename, fields, words):
+    # Records where each word occurs somewhere in one of `fields`, for
+    # search.py to narrow down and rank
+    table, names, _ = _columns(filename)
+    clauses = []
+    params = []
+    for word in words:
+        pattern = "%" + _like_escape(word) + "%"
+        clauses.append("(" + " OR ".join(f"{field} LIKE ? ESCAPE '\\'" for field in fields) + ")")
+        params.extend([pattern] * len(fields))
+    rows = connect().execute(
+        f"SELECT {', '.join(names)} FROM {table} WHERE {' AND '.join(clauses)} ORDER BY rowid", params)
+    return [_to_record(table, names, row) for row in rows]
+
+# ========== JSON Import ==========
+def import_json():
+    # One-shot copy of every JSON collection into the database. Tables are
+    # replaced wholesale, so running it twice does not duplicate rows.
+    conn = connect()
+    counts = {}
+    with conn:
+        for filename, (table, columns, key) in TABLES.items():
+            names = [name for name, _ in columns]
+            records = storage.load_json_data(filename)
+            conn.execute(f"DELETE FROM {table}")
+            # Keep the first record when the JSON file holds duplicate keys
+            verb = "INSERT OR IGNORE" if key else "INSERT"
+            conn.executemany(_insert_sql(table, names, verb),
+                             [_to_row(table, names, r) for r in records])
+            counts[filename] = conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+    return counts
@@ -0,0 +1,1048 @@
+# School Management System
+# Module: Shared Storage
+# Data Storage: JSON file (<name>.json) + append-only log (<name>.json.log),
+#               or SQLite when config "backend" is "sqlite"; scores can be
+#               kept in scores.bin instead (config "score_format"), and
+#               encoded field values in <name>.json.codes (config
+#               "field_codes")
+# Libraries: array, atexit, glob, io, json, os, threading, config, locking,
+#            cache, json_stream, metrics, records
+#
+# New records are appended to the log as one JSON line each, so an insert
+# never rewrites the main file. Once the log grows past COMPACT_LOG_BYTES it
+# is folded back into the main JSON array on a background thread. Readers
+# always see the main file followed by any log records, in insertion order.
+# A compaction names the main file it is about to swap in, in a fsynced
+# <name>.json.merged marker, so one killed between the swap and removing the
+# folded log is finished by the next reader instead of reading that log twice.
+# A window that closes mid-compaction waits for it at exit.
+#
+# Module windows run as separate processes, so every read and write of a
+# collection holds its <name>.json.lock file lock. Whole-file writes go to a
+# temp file that is fsynced and renamed over the original, so a crash never
+# leaves truncated JSON. Appends use group commit: the lines are written
+# under the lock without an fsync, and the fsync runs once the appending
+# thread lets go of the lock (after the caller's whole read-modify-write,
+# e.g. a unique insert), so the lines other writers add meanwhile share it.
+# With write-behind on (config "flush_interval") it runs later still: see
+# below.
+# Parsed collections are cached in memory until one of their files changes;
+# readers get typed records (records.py) rather than the parsed dicts.
+# Optionally the fields records.py dictionary-encodes are stored as codes on
+# disk too (see Field Codes).
+#
+# The public functions below are the only storage calls the modules make.
+# With the SQLite backend they are forwarded to sqlite_backend.py.
+
+import atexit
+import glob
+from array import array
+import io
+import json
+import os
+import threading
+from core import config, json_stream, metrics, records
+from core.locking import file_lock, hold_marker, drop_marker, marker_abandoned
+from core.cache import collections_cache
+
+BACKEND = config.get("backend")
+
+COMPACT_LOG_BYTES = 1024 * 1024
+
+# Files derived from a collection (key indexes, aggregates) that a full rewrite
+# invalidates; readers rebuild them on next use
+DERIVED_SUFFIXES = [".idx", ".agg"]
+
+# Derived files built from several collections (the grade occupancy seat
+# log), invalidated by a full rewrite of any of them
+SHARED_DERIVED = {
+    "grades.json": ["grades.json.seats"],
+    "students.json": ["grades.json.seats"],
+    "enrollments.json": ["grades.json.seats"],
+}
+
+_lock = threading.Lock()
+_compactions = {}  # filename -> running compaction thread
+
+# ========== File Helpers ==========
+def log_path(filename):
+    return filename + ".log"
+
+def _rotated_path(filename):
+    # The log being folded in by a running (or interrupted) compaction
+    return filename + ".log.old"
+
+def _merged_path(filename):
+    # Names the main file a compaction swaps in; gone once .log.old is removed
+    return filename + ".merged"
+
+def _derived_paths(filename):
+    return [filename + suffix for suffix in DERIVED_SUFFIXES] + SHARED_DERIVED.get(filename, [])
+
+def _remove(paths):
+    for path in paths:
+        if os.path.exists(path):
+            os.remove(path)
+
+def drop_derived(filename):
+    # Call with the collection lock held, after replacing every record some
+    # other way than save_data (scores.bin); readers rebuild the files
+    _remove(_derived_paths(filename))
+
+def collection_lock(filename):
+    # Held around every read-modify-write of a collection and its sidecars
+    return file_lock(filename + ".lock")
+
+def _compaction_lock(filename):
+    return file_lock(filename + ".compact.lock")
+
+def _read_text(path):
+    if os.path.exists(path):
+        with open(path, 'r') as f:
+            return f.read()
+    return ""
+
+def _parse_json(text):
+    return json.loads(text) if text.strip() else []
+
+def _parse_log(text):
+    records = []
+    for line in text.splitlines():
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            records.append(json.loads(line))
+        except ValueError:
+            # A torn last line left by a crash mid-append
+            break
+    return records
+
+_record_encoder = json.JSONEncoder(indent=4, default=records.to_json)
+
+def _dump_array(data, f):
+    # Same text as json.dump(list(data), f, indent=4). Lists are dumped in
+    # one call; anything else (e.g. a generator) is written record by record.
+    if isinstance(data, list):
+        json.dump(data, f, indent=4, default=records.to_json)
+        return
+    count = 0
+    for record in data:
+        f.write(",\n    " if count else "[\n    ")
+        f.write(_record_encoder.encode(record).replace("\n", "\n    "))
+        count += 1
+    f.write("\n]" if count else "[]")
+
+def _write_json(filename, data, codes=None):
+    # With codes, the records are written encoded, and values new to the
+    # table reach the .codes file before the main file is swapped in
+    if codes is not None:
+        new = []
+        if isinstance(data, list):
+            data = [codes.encode(record, new) for record in data]
+        else:
+            data = (codes.encode(record, new) for record in data)
+    tmp = f"{filename}.{os.getpid()}.tmp"
+    with open(tmp, 'w') as f:
+        _dump_array(data, f)
+        f.flush()
+        os.fsync(f.fileno())
+    if codes is not None:
+        codes.commit(new)
+    os.replace(tmp, filename)
+
+def _write_log(filename, chunk):
+    with open(log_path(filename), 'a') as f:
+        f.write(chunk)
+        f.flush()
+        return f.tell()
+
+# ========== Field Codes ==========
+# With "field_codes" on, the fields records.py keeps as codes into a string
+# table (student grade and gender, score subject, enrollment status, ...)
+# are stored as int codes on disk as well. Each value is written once, as a
+# JSON line of <name>.json.codes, and its code is its line number. The file
+# is only appended to, and a value is fsynced there before any record using
+# it is written, so every code on disk resolves. Readers parse just the lines
+# added since their last look and map each code straight to the in-memory
+# StringTable code, so an encoded field is never decoded to a string and
+# hashed again while loading.
+#
+# On disk an encoded field is kept under records.CODE_PREFIX + its name
+# ("$grade": 3), so a code can never be mistaken for a value: a number typed
+# into the field is written as "grade": 10 like any other value. A code the
+# .codes file does not hold, or a key that is not a code, is a damaged file
+# and reading it raises ValueError rather than guessing a value.
+#
+# A collection is encoded while its .codes file exists, and appends follow
+# the files. Only a whole rewrite (save_data, `cli.py field-codes`) switches
+# it to the setting. Records written before the switch have no coded keys
+# and read the same.
+_field_code_tables = {}
+
+def _value_key(value):
+    # As records.StringTable keys values: 1, 1.0 and True stay apart
+    return value if type(value) is str else (type(value), repr(value))
+
+class _FieldCodes:
+    def __init__(self, filename, cls):
+        self.filename = filename
+        self.path = filename + ".codes"
+        self.cls = cls
+        self.fields = cls.ENCODED_SET
+        self.coded = {coded: name for name, coded in cls.CODED}  # "$grade" -> "grade"
+        self.reset(None)
+
+    def reset(self, inode):
+        self.values = []  # code -> value
+        self.memory = []  # code -> code in cls.TABLE
+        self.codes = {}   # _value_key(value) -> code
+        self.inode = inode
+        self.offset = 0   # end of the last complete line read
+
+    def _add(self, value):
+        self.codes[_value_key(value)] = len(self.values)
+        self.values.append(value)
+        self.memory.append(self.cls.TABLE.code(value))
+
+    def refresh(self):
+        # Call with the collection lock held. True while the collection is
+        # encoded.
+        signature = _signature(self.path)
+        if signature is None:
+            self.reset(None)
+            return False
+        if signature[0] != self.inode or signature[1] < self.offset:
+            self.reset(signature[0])  # replaced by a whole rewrite
+        if signature[1] > self.offset:
+            with open(self.path, 'rb') as f:
+                f.seek(self.offset)
+                for line in f:
+                    if not line.endswith(b"\n"):
+                        break  # torn by a crash; never used by a record
+                    self._add(json.loads(line))
+                    self.offset += len(line)
+        return True
+
+    def _check(self, code):
+        # A code beyond the last look may be a value another window added
+        # since; anything else the file does not hold is damage
+        if type(code) is not int or code < 0:
+            raise ValueError(f"{self.filename}: {code!r} is not a field code")
+        if code >= len(self.values):
+            with collection_lock(self.filename):
+                self.refresh()
+            if code >= len(self.values):
+                raise ValueError(f"{self.filename}: field code {code} is not in {self.path}")
+
+    def __getitem__(self, code):
+        # records.from_dict's view: the TABLE code of an on-disk code
+        if type(code) is not int or not 0 <= code < len(self.memory):
+            self._check(code)
+        return self.memory[code]
+
+    def value(self, code):
+        if type(code) is not int or not 0 <= code < len(self.values):
+            self._check(code)
+        return self.values[code]
+
+    def decode(self, record):
+        # A parsed dict with its codes replaced by the values
+        decoded = {}
+        for key, value in record.items():
+            field = self.coded.get(key)
+            if field is None:
+                decoded[key] = value
+            else:
+                decoded[field] = self.value(value)
+        return decoded
+
+    def encode(self, record, new):
+        # A dict to write for record, with codes for its encoded fields.
+        # Values the table lacks are added and listed in new for commit().
+        values = record.to_dict() if isinstance(record, records.Record) else record
+        encoded = {}
+        for field, value in values.items():
+            if field in self.fields:
+                code = self.codes.get(_value_key(value))
+                if code is None:
+                    code = len(self.values)
+                    self._add(value)
+                    new.append(value)
+                encoded[records.CODE_PREFIX + field] = code
+            else:
+                encoded[field] = value
+        return encoded
+
+    def commit(self, new):
+        # Call with the collection lock held: append new to the .codes file
+        if not new:
+            return
+        data = "".join(json.dumps(value) + "\n" for value in new).encode("utf-8")
+        try:
+            with os.fdopen(os.open(self.path, os.O_RDWR | os.O_CREAT), 'r+b') as f:
+                f.seek(self.offset)  # over any crash leftover
+                f.write(data)
+                f.truncate()
+                f.flush()
+                os.fsync(f.fileno())
+                self.inode = os.fstat(f.fileno()).st_ino
+        except BaseException:
+            # The values added in memory may never have reached the file
+            self.reset(None)
+            raise
+        self.offset += len(data)
+
+def _field_codes(filename):
+    # The collection's code table, or None when it has no encoded fields
+    cls = records.RECORD_TYPES.get(filename)
+    if cls is None or not cls.ENCODED:
+        return None
+    with _lock:
+        codes = _field_code_tables.get(filename)
+        if codes is None:
+            codes = _field_code_tables[filename] = _FieldCodes(filename, cls)
+    return codes
+
+# ========== Group Commit And Write-Behind ==========
+# Appends never fsync while they hold the collection lock. The lines reach
+# the log, and so every reader in every window, at once. By default the
+# appending thread then fsyncs when it releases the lock (_flush_file); any
+# lines written by other threads while it waited for the lock go out with
+# the same fsync, and their own flushes find nothing left to do.
+#
+# With "flush_interval" above 0 (write-behind) the appender does not wait
+# for the fsync at all: a background thread fsyncs the logs written since
+# its last run every flush_interval seconds, or sooner once "flush_records"
+# records are waiting. flush() also runs when a window closes and at exit.
+# A killed process loses nothing, as the OS already has the lines; a power
+# cut loses at most the last interval. That gives up the promise that a
+# record is on disk once its add returns, so write-behind is off unless the
+# setting is raised.
+#
+# While a process has unsynced lines in a log it holds a marker lock
+# (<name>.json.log.unsynced.<pid>). The next process to open the collection
+# after a crash finds the marker unheld and recovers: a torn last line is cut
+# off and the derived files are dropped, to be rebuilt from the records that
+# survived.
+_unsynced = {}   # filename -> records written since the last fsync
+_markers = {}    # filename -> marker handle
+_written = {}    # filename -> appends made by this process
+_synced = {}     # filename -> how many of them a finished fsync covers
+_syncing = set()
+_sync_done = threading.Condition(_lock)
+_recovered = set()
+_flush_wanted = threading.Event()
+_flusher = []
+
+def _write_behind():
+    return config.get("flush_interval") > 0
+
+def _marker_path(filename):
+    return f"{log_path(filename)}.unsynced.{os.getpid()}"
+
+def _append_unsynced(filename, chunk):
+    # Call with the collection lock held
+    with _lock:
+        if filename not in _markers:
+            _markers[filename] = hold_marker(_marker_path(filename))
+    size = _write_log(filename, chunk)
+    with _lock:
+        _unsynced[filename] = _unsynced.get(filename, 0) + chunk.count("\n")
+        _written[filename] = _written.get(filename, 0) + 1
+        waiting = sum(_unsynced.values())
+        if _write_behind() and not _flusher:
+            _flusher.append(threading.Thread(target=_flush_loop, daemon=True))
+            _flusher[0].start()
+    # Never flushed here: the caller holds a collection lock, and flush()
+    # takes the others
+    if _write_behind() and waiting >= config.get("flush_records"):
+        _flush_wanted.set()
+    return size
+
+def _flush_loop():
+    while True:
+        _flush_wanted.wait(config.get("flush_interval"))
+        _flush_wanted.clear()
+        flush()
+
+def _sync(path):
+    # Opened without O_CREAT, so a log that is gone stays gone
+    try:
+        fd = os.open(path, os.O_WRONLY | os.O_APPEND)
+    except FileNotFoundError:
+        return  # folded into the main file, which the compaction fsynced
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+def flush():
+    # fsync every log this process has written to since its last flush
+    with _lock:
+        filenames = list(_markers)
+    for filename in filenames:
+        _flush_file(filename)
+
+def _flush_file(filename):
+    # Returns once an fsync that started after every append this process has
+    # made to filename is done. One thread fsyncs at a time, without the
+    # collection lock; appends that arrive meanwhile wait for the next one
+    # and share it.
+    with _sync_done:
+        target = _written.get(filename, 0)
+        while _synced.get(filename, 0) < target:
+            if filename in _syncing:
+                _sync_done.wait()
+                continue
+            _syncing.add(filename)
+            upto = _written[filename]
+            count = _unsynced.pop(filename, 0)
+            _sync_done.release()
+            try:
+                with metrics.timer(f"flush:{filename}") as t:
+                    t.records = count
+                    # The log first: a compaction may rotate it to .log.old
+                    # in between, and then the second call syncs it there
+                    _sync(log_path(filename))
+                    _sync(_rotated_path(filename))
+            finally:
+                _sync_done.acquire()
+                _syncing.discard(filename)
+                _sync_done.notify_all()
+            _synced[filename] = upto
+    # The marker goes once nothing is left unsynced; appends take it under
+    # the collection lock, so none can slip in between the check and the drop
+    with collection_lock(filename):
+        with _lock:
+            if _synced.get(filename, 0) < _written.get(filename, 0):
+                return
+            marker = _markers.pop(filename, None)
+        if marker is not None:
+            drop_marker(marker, _marker_path(filename))
+
+atexit.register(flush)
+
+def _cut_torn_line(path):
+    if not os.path.exists(path):
+        return
+    with open(path, 'rb+') as f:
+        data = f.read()
+        end = data.rfind(b"\n") + 1
+        if end < len(data):
+            f.truncate(end)
+
+def recover(filename):
+    # Once per collection and process: clean up after a writer that died
+    # with unsynced lines. Readers of derived files call it before trusting
+    # them.
+    with _lock:
+        if filename in _recovered:
+            return
+        _recovered.add(filename)
+    own = _marker_path(filename)
+    for marker in glob.glob(glob.escape(log_path(filename)) + ".unsynced.*"):
+        if marker == own:
+            continue
+        # Markers are taken under the collection lock, so one seen unheld
+        # here really was abandoned
+        with collection_lock(filename):
+            if not marker_abandoned(marker):
+                continue
+            for path in (_rotated_path(filename), log_path(filename)):
+                _cut_torn_line(path)
+            _remove(_derived_paths(filename) + [marker])
+
+def _finish_merge(filename):
+    # Call with the collection lock held, before reading the collection. A
+    # marker left behind means a compaction died mid-swap: if the main file
+    # is the one it names, .log.old is already folded in and is dropped;
+    # otherwise the swap never happened and .log.old is still needed.
+    marker = _merged_path(filename)
+    try:
+        with open(marker, 'r') as f:
+            merged = json.load(f)
+    except FileNotFoundError:
+        return
+    except ValueError:
+        merged = None  # torn, so written before the swap
+    main = _signature(filename)
+    if merged is not None and main is not None and main[0] == merged["inode"]:
+        _remove([_rotated_path(filename)])
+    _remove([marker])
+
+# ========== JSON Backend ==========
+def _signature(path):
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return (st.st_ino, st.st_size, st.st_mtime_ns)
+
+def _size(path):
+    signature = _signature(path)
+    return signature[1] if signature is not None else 0
+
+def mtime(path):
+    # None when missing. One stat, so a file that a compaction in another
+    # process removes between two checks cannot raise FileNotFoundError.
+    try:
+        return os.path.getmtime(path)
+    except FileNotFoundError:
+        return None
+
+def _read_bytes(path, offset=0):
+    if not os.path.exists(path):
+        return b""
+    with open(path, 'rb') as f:
+        f.seek(offset)
+        return f.read()
+
+def _log_offset(cached, current):
+    # Bytes of the log already parsed into the cached entry, or None when the
+    # log is not simply a longer version of the one cached
+    if cached is None:
+        return 0
+    if current is not None and current[0] == cached[0] and current[1] >= cached[1]:
+        return cached[1]
+    return None
+
+def collection_signature(filename):
+    # Changes whenever any file of the collection does
+    return (_signature(filename), _signature(_rotated_path(filename)), _signature(log_path(filename)))
+
+def only_appended(old, new):
+    # True when the collection with signature `new` is the one with `old`
+    # plus records appended to its log, so the first records kept their
+    # positions
+    return old[:2] == new[:2] and _log_offset(old[2], new[2]) is not None
+
+def _load_json_records(filename):
+    # Served from the cache when none of the files changed. When only new
+    # lines were appended to the log, just those lines are parsed. The list
+    # returned is the cached one and must not be modified.
+    binary = _binary(filename)
+    if binary is not None:
+        return binary.open_scores()
+    recover(filename)
+    rotated_path = _rotated_path(filename)
+    codes = _field_codes(filename)
+    with collection_lock(filename):
+        _finish_merge(filename)
+        disk = codes if codes is not None and codes.refresh() else None
+        signature = collection_signature(filename)
+        cached = collections_cache.lookup(filename)
+        if cached is not None and cached.signature == signature:
+            return cached.records
+        offset = None
+        if cached is not None and cached.signature[:2] == signature[:2]:
+            offset = _log_offset(cached.signature[2], signature[2])
+        if offset is not None:
+            base = rotated = None
+            log = _read_bytes(log_path(filename), offset)
+        else:
+            base = _read_bytes(filename)
+            rotated = _read_bytes(rotated_path)
+            log = _read_bytes(log_path(filename))
+
+    if offset is not None:
+        data = list(cached.records)
+    else:
+        data = records.typed(filename, _parse_json(base.decode("utf-8")), disk)
+        data.extend(records.iter_typed(filename, _parse_log(rotated.decode("utf-8")), disk))
+    data.extend(records.iter_typed(filename, _parse_log(log.decode("utf-8")), disk))
+    cost = sum(sig[1] for sig in signature if sig is not None)
+    collections_cache.store(filename, signature, data, cost)
+    return data
+
+def read_json_files(filename):
+    # The records in the JSON files themselves (main file, then logs),
+    # bypassing the cache and the binary score format; encoded fields come
+    # back as their values
+    recover(filename)
+    codes = _field_codes(filename)
+    with collection_lock(filename):
+        _finish_merge(filename)
+        data = _parse_json(_read_text(filename))
+        data.extend(_parse_log(_read_text(_rotated_path(filename))))
+        data.extend(_parse_log(_read_text(log_path(filename))))
+        if codes is not None and codes.refresh():
+            data = [codes.decode(record) for record in data]
+    return data
+
+def _stream_json_records(filename):
+    # Every file is opened under the lock, so a compaction that starts
+    # meanwhile swaps in new files without disturbing this read; the log is
+    # read only up to its size at that moment
+    recover(filename)
+    codes = _field_codes(filename)
+    files = []
+    with collection_lock(filename):
+        _finish_merge(filename)
+        disk = codes if codes is not None and codes.refresh() else None
+        for path in (filename, _rotated_path(filename), log_path(filename)):
+            if os.path.exists(path):
+                files.append((path, open(path, 'rb'), os.path.getsize(path)))
+            else:
+                files.append((path, None, 0))
+    try:
+        (_, main, _), (_, rotated, _), (_, log, log_size) = files
+        if main is not None:
+            yield from records.iter_typed(filename, json_stream.iter_array(io.TextIOWrapper(main, encoding="utf-8")), disk)
+        if rotated is not None:
+            yield from records.iter_typed(filename, json_stream.iter_lines(rotated), disk)
+        if log is not None:
+            yield from records.iter_typed(filename, json_stream.iter_lines(log, log_size), disk)
+    finally:
+        for _, f, _ in files:
+            if f is not None:
+                f.close()
+
+def _fits_cache(filename):
+    # Runs without the lock, so the rotated log may vanish under it; the
+    # signature counts a missing file as empty
+    size = sum(s[1] for s in collection_signature(filename) if s is not None)
+    return size <= collections_cache.max_bytes
+
+def iter_json_records(filename):
+    # Collections small enough for the cache come from it; larger ones are
+    # streamed from disk so memory stays bounded by one chunk and one record
+    binary = _binary(filename)
+    if binary is not None:
+        return iter(binary.open_scores())
+    if _fits_cache(filename):
+        return iter(_load_json_records(filename))
+    return _stream_json_records(filename)
+
+def load_json_data(filename):
+    # Callers get their own list; the record dicts are shared with the cache
+    # and must not be modified in place
+    return list(_load_json_records(filename))
+
+def save_json_data(filename, data, encode=None):
+    # Full rewrite: the main file becomes `data` (any iterable of records)
+    # and the log is discarded. The file is written encoded when `encode`,
+    # by default the "field_codes" setting, says so (see Field Codes).
+    if encode is None:
+        encode = config.get("field_codes")
+    codes = _field_codes(filename)
+    with _compaction_lock(filename):
+        with collection_lock(filename):
+            if codes is not None:
+                codes.refresh()
+            if codes is not None and encode:
+                _write_json(filename, data, codes)
+            else:
+                _write_json(filename, data)
+            _remove([_rotated_path(filename), log_path(filename), _merged_path(filename)] + _derived_paths(filename))
+            if codes is not None and not encode:
+                # Only once no file holds a code any more
+                _remove([codes.path])
+                codes.reset(None)
+
+def set_field_codes(filename, encode):
+    # Rewrites the collection with its encoded fields stored as codes, or as
+    # plain values again. Returns the number of records, or None when the
+    # collection has no such fields or its records are kept in scores.bin.
+    if _field_codes(filename) is None or _binary(filename) is not None:
+        return None
+    data = load_json_data(filename)
+    save_json_data(filename, data, encode)
+    return len(data)
+
+def append_json_records(filename, data):
+    # All records go to the log in one write, made durable by one fsync
+    # shared with any other appends that are waiting (see Group Commit)
+    data = list(data)
+    if not data:
+        return
+    recover(filename)
+    codes = _field_codes(filename)
+    lock = collection_lock(filename)
+    with lock:
+        if codes is not None and codes.refresh():
+            new = []
+            data = [codes.encode(record, new) for record in data]
+            codes.commit(new)
+        chunk = "".join(json.dumps(record, default=records.to_json) + "\n" for record in data)
+        size = _append_unsynced(filename, chunk)
+        if not _write_behind():
+            lock.after_release(_flush_file, filename)
+    if size >= COMPACT_LOG_BYTES:
+        compact_in_background(filename)
+
+def append_json_record(filename, record):
+    append_json_records(filename, [record])
+
+# ========== Compaction ==========
+def _fresh_derived(filename):
+    # Derived files at least as new as every data file of the collection
+    data = [p for p in (filename, _rotated_path(filename), log_path(filename)) if os.path.exists(p)]
+    newest = max((os.path.getmtime(p) for p in data), default=0)
+    return [p for p in _derived_paths(filename) if os.path.exists(p) and os.path.getmtime(p) >= newest]
+
+def compact(filename):
+    if _binary(filename) is not None:
+        return  # binary scores have no log
+    recover(filename)
+    compactor = _compaction_lock(filename)
+    if not compactor.acquire(blocking=False):
+        return  # another thread or window is already compacting
+    try:
+        with collection_lock(filename):
+            _finish_merge(filename)
+            rotated = _rotated_path(filename)
+            # Reuse a log left behind by an interrupted compaction rather than
+            # rotating over it, so no records are dropped
+            if not os.path.exists(rotated):
+                if not os.path.exists(log_path(filename)):
+                    return
+                os.replace(log_path(filename), rotated)
+            fresh = _fresh_derived(filename)
+
+        # Appends go to a fresh log while the main file is rebuilt. Only a
+        # compaction or save_data replaces the main file, and both hold the
+        # compaction lock, so it is safe to read without the collection lock.
+        data = _parse_json(_read_text(filename))
+        data.extend(_parse_log(_read_text(rotated)))
+        # A fixed name is safe under the compaction lock and means a temp file
+        # left by an interrupted run is simply overwritten next time
+        tmp = filename + ".compact.tmp"
+        with open(tmp, 'w') as f:
+            json.dump(data, f, indent=4)
+            f.flush()
+            os.fsync(f.fileno())
+            inode = os.fstat(f.fileno()).st_ino
+
+        with collection_lock(filename):
+            # The rename keeps the inode, so the marker tells a later reader
+            # whether the swap below happened
+            marker = _merged_path(filename)
+            with open(marker, 'w') as f:
+                json.dump({"inode": inode}, f)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp, filename)
+            os.remove(rotated)
+            os.remove(marker)
+            # Compaction does not change the records, so derived files that
+            # were up to date stay up to date despite the newer main file
+            for path in fresh:
+                if os.path.exists(path):
+                    os.utime(path)
+    finally:
+        compactor.release()
+
+def compact_in_background(filename):
+    with _lock:
+        if filename in _compactions:
+            return
+        thread = _compactions[filename] = threading.Thread(target=_run_compaction, args=(filename,), daemon=True)
+        thread.start()
+
+def _run_compaction(filename):
+    try:
+        compact(filename)
+    finally:
+        with _lock:
+            _compactions.pop(filename, None)
+
+def _join_compactions():
+    # A window or CLI command exiting mid-compaction lets it finish first
+    with _lock:
+        threads = list(_compactions.values())
+    for thread in threads:
+        thread.join()
+
+atexit.register(_join_compactions)
+
+# ========== Data Utilities ==========
+def _sqlite():
+    from core import sqlite_backend
+    return sqlite_backend
+
+def _binary(filename):
+    # scores.json is kept in scores.bin when "score_format" is "binary"
+    if filename == "scores.json" and config.get("score_format") == "binary":
+        from core import score_binary
+        return score_binary
+    return None
+
+def _data_bytes(filename):
+    # Size on disk of a collection, for the metrics; None with SQLite
+    if BACKEND == "sqlite":
+        return None
+    binary = _binary(filename)
+    paths = [binary.BIN_FILE] if binary is not None else [filename, _rotated_path(filename), log_path(filename)]
+    return sum(_size(p) for p in paths)
+
+def load_data(filename):
+    with metrics.timer(f"load_data:{filename}") as t:
+        if BACKEND == "sqlite":
+            data = _sqlite().load_data(filename)
+        else:
+            data = load_json_data(filename)
+        t.records = len(data)
+        t.bytes = _data_bytes(filename)
+    return data
+
+def snapshot(filename):
+    # Read-only records. On the JSON backend the same list object comes back
+    # for as long as the collection is unchanged, so callers can cache what
+    # they derive from it and check with `is`.
+    if BACKEND == "sqlite":
+        return _sqlite().load_data(filename)
+    return _load_json_records(filename)
+
+def iter_records(filename):
+    # Records one at a time in insertion order, for single-pass readers
+    if BACKEND == "sqlite":
+        return _sqlite().iter_records(filename)
+    return iter_json_records(filename)
+
+def save_data(filename, data):
+    with metrics.timer(f"save_data:{filename}") as t:
+        if isinstance(data, list):
+            t.records = len(data)
+        if BACKEND == "sqlite":
+            _sqlite().save_data(filename, data)
+            _remove(SHARED_DERIVED.get(filename, []))
+            return
+        binary = _binary(filename)
+        if binary is not None:
+            binary.write_records(data)
+        else:
+            save_json_data(filename, data)
+        t.bytes = _data_bytes(filename)
+
+def append_record(filename, record):
+    if BACKEND == "sqlite":
+        return _sqlite().append_record(filename, record)
+    binary = _binary(filename)
+    if binary is not None:
+        return binary.append_records([record])
+    append_json_record(filename, record)
+
+def append_records(filename, records):
+    # Bulk insert committed as a single write
+    if BACKEND == "sqlite":
+        return _sqlite().append_records(filename, records)
+    binary = _binary(filename)
+    if binary is not None:
+        return binary.append_records(records)
+    append_json_records(filename, records)
+
+# ========== Aggregates ==========
+# Report helpers. The SQLite backend answers these with GROUP BY queries;
+# the JSON backend walks the collection once through iter_json_records, so
+# large files are streamed rather than loaded.
+def count(filename):
+    if BACKEND == "sqlite":
+        return _sqlite().count(filename)
+    if _binary(filename) is None and not _fits_cache(filename):
+        return len(_page_index(filename))
+    return len(_load_json_records(filename))
+
+def count_by(filename, field):
+    if BACKEND == "sqlite":
+        return _sqlite().count_by(filename, field)
+    counts = {}
+    for r in iter_json_records(filename):
+        value = r.get(field, "Unknown")
+        counts[value] = counts.get(value, 0) + 1
+    return counts
+
+def average_by(filename, group_field, value_field):
+    if BACKEND == "sqlite":
+        return _sqlite().average_by(filename, group_field, value_field)
+    totals = {}
+    counts = {}
+    for r in iter_json_records(filename):
+        group = r.get(group_field, "Unknown")
+        totals[group] = totals.get(group, 0) + r.get(value_field, 0)
+        counts[group] = counts.get(group, 0) + 1
+    return {g: totals[g] / counts[g] for g in totals}
+
+def group_values(filename, group_field, value_field):
+    if BACKEND == "sqlite":
+        return _sqlite().group_values(filename, group_field, value_field)
+    groups = {}
+    for r in iter_json_records(filename):
+        groups.setdefault(r.get(group_field, "Unknown"), []).append(r.get(value_field, "Unknown"))
+    return groups
+
+def find(filename, field, value):
+    if BACKEND == "sqlite":
+        return _sqlite().find(filename, field, value)
+    return [r for r in iter_json_records(filename) if r.get(field) == value]
+
+def first(filename):
+    if BACKEND == "sqlite":
+        return _sqlite().first(filename)
+    return next(iter_json_records(filename), None)
+
+# ========== Paging ==========
+# Collections that fit the cache are paged from the cached list. Larger ones
+# would be parsed in full for every page, so they get a page index instead:
+# the byte range of every record in the main file and the logs, found by one
+# streamed pass and extended as the log grows. A page then reads and parses
+# just its own records. Sorting a large collection takes the same pass, also
+# collecting the sort field; the order is kept until the collection changes.
+_sorted = {}
+_page_indexes = {}
+_page_lock = threading.Lock()
+
+def sort_key(value):
+    # Missing values first, then numbers (and numeric strings such as IDs and
+    # ages), then text; the order SQLite gives NULLs, numbers and text
+    if value is None:
+        return (-1, 0.0, "")
+    try:
+        return (0, float(value), "")
+    except (TypeError, ValueError):
+        return (1, 0.0, str(value).casefold())
+
+class _PageIndex:
+    def __init__(self, signature, segments):
+        self.signature = signature
+        self.segments = segments  # [(path, starts, ends)]: main file, .log.old, log
+        self.orders = {}          # (sort field, descending) -> record numbers
+
+    def __len__(self):
+        return sum(len(starts) for _, starts, _ in self.segments)
+
+    def locate(self, n):
+        # (segment, position in it) of record number n
+        for i, (_, starts, _) in enumerate(self.segments):
+            if n < len(starts):
+                return i, n
+            n -= len(starts)
+        raise IndexError(n)
+
+def _sort_text(value):
+    # iter_spans reads the main file as Latin-1; undo that for the sort
+    if isinstance(value, str) and not value.isascii():
+        return value.encode("latin-1").decode("utf-8", "replace")
+    return value
+
+def _scan(filename, sort_field=None):
+    # One streamed pass over the collection: its page index, and the sort
+    # key of every record when sort_field is given
+    recover(filename)
+    paths = (filename, _rotated_path(filename), log_path(filename))
+    codes = _field_codes(filename)
+    if codes is not None and sort_field not in codes.fields:
+        codes = None  # the sort field is never a code
+    coded_field = records.CODE_PREFIX + str(sort_field)
+    with collection_lock(filename):
+        _finish_merge(filename)
+        if codes is not None and not codes.refresh():
+            codes = None
+        signature = collection_signature(filename)
+        files = [open(path, 'rb') if sig is not None else None for path, sig in zip(paths, signature)]
+    keys = [] if sort_field is not None else None
+    segments = []
+    try:
+        for n, (path, f) in enumerate(zip(paths, files)):
+            starts, ends = array("q"), array("q")
+            if f is not None:
+                if n == 0:
+                    spans = json_stream.iter_spans(f)
+                else:
+                    # The log only up to its size when the files were opened
+                    spans = json_stream.iter_line_spans(f, 0, signature[n][1])
+                for record, start, end in spans:
+                    starts.append(start)
+                    ends.append(end)
+                    if keys is not None:
+                        if codes is not None and coded_field in record:
+                            value = codes.value(record[coded_field])
+                        else:
+                            value = _sort_text(record.get(sort_field))
+                        keys.append(sort_key(value))
+            segments.append((path, starts, ends))
+    finally:
+        for f in files:
+            if f is not None:
+                f.close()
+    return _PageIndex(signature, segments), keys
+
+def _extend(index, filename):
+    # Add the lines appended to the log since the index was built. Returns
+    # False when more than the log changed.
+    with collection_lock(filename):
+        signature = collection_signature(filename)
+        if not only_appended(index.signature, signature):
+            return False
+        path, starts, ends = index.segments[2]
+        with open(path, 'rb') as f:
+            begin = ends[-1] if ends else 0
+            for _, start, end in json_stream.iter_line_spans(f, begin, signature[2][1]):
+                starts.append(start)
+                ends.append(end)
+        index.signature = signature
+        index.orders = {}
+    return True
+
+def _page_index(filename, sort_field=None, descending=False):
+    # The current page index, with the sorted order asked for
+    with _page_lock:
+        index = _page_indexes.get(filename)
+        if index is not None and index.signature != collection_signature(filename) and not _extend(index, filename):
+            index = None
+        key = (sort_field, descending)
+        if index is None or (sort_field is not None and key not in index.orders):
+            index, keys = _scan(filename, sort_field)
+            if sort_field is not None:
+                index.orders[key] = array("q", sorted(range(len(keys)), key=keys.__getitem__, reverse=descending))
+            _page_indexes[filename] = index
+        return index
+
+def _read_spans(filename, index, numbers):
+    # Call with the collection lock held and the index current
+    codes = _field_codes(filename)
+    disk = codes if codes is not None and codes.refresh() else None
+    handles = {}
+    data = []
+    try:
+        for n in numbers:
+            i, pos = index.locate(n)
+            path, starts, ends = index.segments[i]
+            f = handles.get(i)
+            if f is None:
+                f = handles[i] = open(path, 'rb')
+            f.seek(starts[pos])
+            data.append(json.loads(f.read(ends[pos] - starts[pos])))
+    finally:
+        for f in handles.values():
+            f.close()
+    return records.typed(filename, data, disk)
+
+def _page_large(filename, offset, limit, sort_field, descending):
+    while True:
+        index = _page_index(filename, sort_field, descending)
+        if sort_field is None:
+            numbers = range(offset, min(offset + limit, len(index)))
+        else:
+            numbers = index.orders[(sort_field, descending)][offset:offset + limit]
+        with collection_lock(filename):
+            # Anything written since the index was checked means another look
+            if collection_signature(filename) == index.signature:
+                return _read_spans(filename, index, numbers)
+
+def page(filename, offset, limit, sort_field=None, descending=False):
+    # One screenful of records for the list windows, optionally sorted
+    if BACKEND == "sqlite":
+        return _sqlite().page(filename, offset, limit, sort_field, descending)
+    if _binary(filename) is None and not _fits_cache(filename):
+        return _page_large(filename, offset, limit, sort_field, descending)
+    rows = _load_json_records(filename)
+    if sort_field is not None:
+        # The sorted order is kept until the collection is reloaded
+        key = (filename, sort_field, descending)
+        cached = _sorted.get(key)
+        if cached is None or cached[0] is not rows:
+            ordered = sorted(rows, key=lambda r: sort_key(r.get(sort_field)), reverse=descending)
+            cached = _sorted[key] = (rows, ordered)
+        rows = cached[1]
+    return rows[offset:offset + limit]
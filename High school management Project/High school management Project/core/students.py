@@ -0,0 +1,49 @@
+# School Management System
+# Module: Students (core)
+# Data Storage: students.json
+# Libraries: storage, indexes, aggregates, occupancy, enrollments, metrics
+
+from core import storage, aggregates, occupancy, enrollments, metrics
+from core.indexes import add_unique, key_exists
+from core.errors import ValidationError
+
+FILENAME = "students.json"
+FIELDS = ["student_id", "name", "grade", "dob", "gender", "phone", "address",
+          "email", "guardian_name", "guardian_phone", "registered_at"]
+
+def make_student(values):
+    # Field checks only; the duplicate check happens on insert
+    student = {field: values.get(field, "") for field in FIELDS}
+
+    if not all(student.values()):
+        raise ValidationError("All fields are Requiry.")
+    return student
+
+@metrics.timed(f"add:{FILENAME}")
+def add_student(values):
+    # Returns (student, seated); seated is False when the grade was full and
+    # the student went on its waitlist
+    student = make_student(values)
+
+    # The seat lock is taken first so no other window can fill the last
+    # seat between the capacity check and the insert. The ID is checked
+    # before the seat, as bulk_import does, so a taken ID is reported as
+    # such even when the grade is full.
+    with occupancy.lock():
+        with storage.collection_lock(FILENAME):
+            if key_exists(FILENAME, student["student_id"]):
+                raise ValidationError("Student ID already exists.")
+            seated = occupancy.admit(student["grade"], student["student_id"])
+            if not add_unique(FILENAME, student):
+                raise ValidationError("Student ID already exists.")
+            aggregates.record_added(FILENAME, student)
+        occupancy.student_added(student, seated)
+        if not seated:
+            enrollments.add_waitlisted(student["student_id"], student["grade"])
+    return student, seated
+
+def list_students():
+    return storage.load_data(FILENAME)
+
+def describe_student(s):
+    return f"ID: {s['student_id']}, Name: {s['name']}, Grade: {s['grade']}, Registered: {s['registered_at']}"
@@ -0,0 +1,45 @@
+# School Management System
+# Module: Subjects (core)
+# Data Storage: subjects.json
+# Libraries: storage, indexes, aggregates, metrics
+
+from core import storage, aggregates, metrics
+from core.indexes import add_unique
+from core.errors import ValidationError
+
+FILENAME = "subjects.json"
+FIELDS = ["name", "grades", "category", "description"]
+
+@metrics.timed(f"add:{FILENAME}")
+def add_subject(values):
+    name = values.get("name", "")
+    grades = values.get("grades", "")
+    category = values.get("category", "")
+    description = values.get("description", "")
+
+    if not all([name, grades, category, description]):
+        raise ValidationError("All fields are required.")
+
+    # The form sends "9th, 10th"; scripts may pass a list
+    if isinstance(grades, str):
+        grades = grades.split(",")
+    grades_list = [g.strip() for g in grades if g.strip()]
+
+    subject = {
+        "name": name,
+        "grades": grades_list,
+        "category": category,
+        "description": description
+    }
+
+    with storage.collection_lock(FILENAME):
+        if not add_unique(FILENAME, subject):
+            raise ValidationError("Subject name already exists.")
+        aggregates.record_added(FILENAME, subject)
+    return subject
+
+def list_subjects():
+    return storage.load_data(FILENAME)
+
+def describe_subject(s):
+    return f"Name: {s['name']}, Grades: {', '.join(s['grades'])}, Category: {s['category']}, Desc: {s['description']}"
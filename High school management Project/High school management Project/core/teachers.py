@@ -0,0 +1,31 @@
+# School Management System
+# Module: Teachers (core)
+# Data Storage: teachers.json
+# Libraries: storage, indexes, aggregates, metrics
+
+from core import storage, aggregates, metrics
+from core.indexes import add_unique
+from core.errors import ValidationError
+
+FILENAME = "teachers.json"
+FIELDS = ["Teacher_id", "name", "age", "dob", "gender", "phone", "salary",
+          "employment_date", "courses"]
+
+@metrics.timed(f"add:{FILENAME}")
+def add_teacher(values):
+    teacher = {field: values.get(field, "") for field in FIELDS}
+
+    if not all(teacher.values()):
+        raise ValidationError("All fields are required.")
+
+    with storage.collection_lock(FILENAME):
+        if not add_unique(FILENAME, teacher):
+            raise ValidationError("Teacher ID already exists.")
+        aggregates.record_added(FILENAME, teacher)
+    return teacher
+
+def list_teachers():
+    return storage.load_data(FILENAME)
+
+def describe_teacher(t):
+    return f"ID: {t['Teacher_id']}, Name: {t['name']}, Age: {t['age']}, Salary: {t['salary']}, Courses: {t['courses']}"
@@ -0,0 +1,28 @@
+# School Management System
+# Module: Users (core)
+# Data Storage: users.json
+# Libraries: storage, indexes, metrics
+
+from core import storage, metrics
+from core.indexes import add_unique
+from core.errors import ValidationError
+
+FILENAME = "users.json"
+FIELDS = ["username", "password", "role", "full_name", "created_at"]
+
+@metrics.timed(f"add:{FILENAME}")
+def add_user(values):
+    user = {field: values.get(field, "") for field in FIELDS}
+
+    if not all(user.values()):
+        raise ValidationError("All fields are required.")
+
+    if not add_unique(FILENAME, user):
+        raise ValidationError("Username already exists.")
+    return user
+
+def list_users():
+    return storage.load_data(FILENAME)
+
+def describe_user(u):
+    return f"Username: {u['username']}, Role: {u['role']}, Name: {u['full_name']}, Created: {u['created_at']}"
@@ -0,0 +1,27 @@
+# School Management System (GUI-Based using tkinter)
+# Module: CSV Import Dialog
+# Data Storage: the collection being imported, through core.bulk_import
+# Libraries: tkinter, filedialog, messagebox, core.bulk_import, task_runner
+
+from tkinter import filedialog, messagebox
+from core import bulk_import
+from task_runner import run_in_background
+
+MAX_LISTED = 20
+
+def import_csv_dialog(master, collection, title):
+    # The rows are checked and saved on the task runner; bad rows and other
+    # ValidationErrors are reported when it is done
+    path = filedialog.askopenfilename(parent=master, title=title, filetypes=[("CSV files", "*.csv"), ("All files", "*.*")])
+    if not path:
+        return
+
+    def imported(result):
+        report = f"{result.accepted} rows imported, {len(result.rejected)} rejected."
+        if result.rejected:
+            report += "\n\n" + "\n".join(f"Line {line}: {message}" for line, message in result.rejected[:MAX_LISTED])
+            if len(result.rejected) > MAX_LISTED:
+                report += f"\n... and {len(result.rejected) - MAX_LISTED} more"
+        messagebox.showinfo(title, report, parent=master)
+
+    run_in_background(master, f"Importing {collection}", bulk_import.import_csv, collection, path, on_done=imported)
@@ -0,0 +1,180 @@
+# School Management System (GUI-Based using tkinter)
+# Module: Record List Window
+# Data Storage: any collection, read through core.storage
+# Libraries: tkinter, ttk, messagebox, core.storage
+#
+# Replaces the old message-box dumps of the view_* buttons. The table holds
+# only the rows that fit on screen; scrolling asks storage for the next page,
+# so opening a list costs the same for 50 rows or 50,000. Click a column
+# heading to sort by it, click again to reverse. Every page is read on the
+# task runner, since the first load and a new sort order read the whole
+# collection and even a plain page can wait on another window's lock; while
+# one is being read, further scrolling only moves the offset, and the page
+# last scrolled to is read when it returns. Search results are shown the
+# same way, paged and sorted in memory.
+
+import tkinter as tk
+from tkinter import ttk, messagebox
+from core import storage
+from task_runner import run_in_background
+
+class RecordListWindow:
+    PAGE_ROWS = 25
+
+    def __init__(self, master, title, filename, columns, total=None, rows=None, records=None):
+        # columns: [(field, heading)]; total and rows (the first page) when
+        # the caller has already read them; records: a fixed list to show
+        # instead of the whole collection
+        self.filename = filename
+        self.columns = columns
+        self.records = records
+        self.offset = 0
+        self.sort_field = None
+        self.descending = False
+        self.reading = False  # a page read is running on the task runner
+        self.stale = False    # the offset or order changed while it ran
+        if records is not None:
+            total = len(records)
+        self.total = storage.count(filename) if total is None else total
+
+        self.window = tk.Toplevel(master)
+        self.window.title(title)
+        self.window.configure(bg="#f0f4f7")
+        self.build()
+        if rows is None:
+            self.render()
+        else:
+            self.show(0, rows)
+
+    # ========== Paging ==========
+    def fetch(self, offset, sort_field, descending):
+        # Runs on the task runner; returns (offset, rows)
+        if self.records is None:
+            return offset, storage.page(self.filename, offset, self.PAGE_ROWS, sort_field, descending)
+        rows = self.records
+        if sort_field is not None:
+            rows = sorted(rows, key=lambda r: storage.sort_key(r.get(sort_field)), reverse=descending)
+        return offset, rows[offset:offset + self.PAGE_ROWS]
+
+    def render(self, label=None):
+        if self.reading:
+            self.stale = True
+            return
+        self.reading = True
+        self.stale = False
+        run_in_background(self.window, label or f"Reading {self.filename}", self.fetch,
+                          self.offset, self.sort_field, self.descending,
+                          on_done=self.fetched, on_error=self.fetch_failed)
+
+    def fetched(self, result):
+        self.reading = False
+        self.show(*result)
+        if self.stale:
+            self.render()
+
+    def fetch_failed(self, error):
+        self.reading = False
+        messagebox.showerror("Error", f"Reading {self.filename} failed:\n{error}", parent=self.window)
+
+    def show(self, offset, rows):
+        self.tree.delete(*self.tree.get_children())
+        for record in rows:
+            self.tree.insert("", tk.END, values=[self.cell(record.get(field, "")) for field, _ in self.columns])
+
+        if self.total:
+            first = offset / self.total
+            last = (offset + len(rows)) / self.total
+            self.status.configure(text=f"Rows {offset + 1}-{offset + len(rows)} of {self.total}")
+        else:
+            first, last = 0.0, 1.0
+            self.status.configure(text="No records.")
+        self.scrollbar.set(first, last)
+
+    def cell(self, value):
+        if isinstance(value, list):
+            return ", ".join(str(v) for v in value)
+        return value
+
+    def scroll_to(self, offset):
+        offset = max(0, min(offset, self.total - self.PAGE_ROWS))
+        if offset != self.offset:
+            self.offset = offset
+            self.render()
+
+    def on_scrollbar(self, action, amount, unit=None):
+        if action == "moveto":
+            self.scroll_to(int(float(amount) * self.total))
+        elif unit == "pages":
+            self.scroll_to(self.offset + int(amount) * self.PAGE_ROWS)
+        else:
+            self.scroll_to(self.offset + int(amount))
+
+    def on_wheel(self, event):
+        if getattr(event, "num", None) == 4 or event.delta > 0:
+            self.scroll_to(self.offset - 3)
+        else:
+            self.scroll_to(self.offset + 3)
+
+    def sort_by(self, field):
+        if self.sort_field == field:
+            self.descending = not self.descending
+        else:
+            self.sort_field = field
+            self.descending = False
+        for f, heading in self.columns:
+            arrow = (" ▼" if self.descending else " ▲") if f == field else ""
+            self.tree.heading(f, text=heading + arrow)
+        self.offset = 0
+        # The first page of a new order sorts the whole collection
+        self.render(f"Sorting by {field}")
+
+    # ========== GUI Setup ==========
+    def build(self):
+        frame = tk.Frame(self.window, bg="#f0f4f7")
+        frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
+
+        fields = [field for field, _ in self.columns]
+        self.tree = ttk.Treeview(frame, columns=fields, show="headings", height=self.PAGE_ROWS, selectmode="browse")
+        for field, heading in self.columns:
+            self.tree.heading(field, text=heading, command=lambda f=field: self.sort_by(f))
+            self.tree.column(field, width=120, anchor="w")
+
+        # The scrollbar drives our offset instead of scrolling the Treeview,
+        # which only ever holds one page
+        self.scrollbar = ttk.Scrollbar(frame, orient=tk.VERTICAL, command=self.on_scrollbar)
+        self.scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        self.tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+
+        self.status = tk.Label(self.window, font=("Arial", 9), bg="#f0f4f7", fg="grey", anchor="w")
+        self.status.pack(fill=tk.X, padx=10, pady=(0, 8))
+
+        self.tree.bind("<MouseWheel>", self.on_wheel)
+        self.tree.bind("<Button-4>", self.on_wheel)
+        self.tree.bind("<Button-5>", self.on_wheel)
+        self.window.bind("<Prior>", lambda e: self.scroll_to(self.offset - self.PAGE_ROWS))
+        self.window.bind("<Next>", lambda e: self.scroll_to(self.offset + self.PAGE_ROWS))
+        self.window.bind("<Home>", lambda e: self.scroll_to(0))
+        self.window.bind("<End>", lambda e: self.scroll_to(self.total))
+
+def first_page(filename, progress=None):
+    # Counting may index a large collection first; Cancel takes effect
+    # between the two steps
+    if progress is not None:
+        progress(0, 2)
+    total = storage.count(filename)
+    if progress is not None:
+        progress(1, 2)
+    return total, storage.page(filename, 0, RecordListWindow.PAGE_ROWS)
+
+def show_records(master, title, filename, columns, empty_message):
+    # Open a list window once the collection is loaded, or just say so when
+    # it is empty
+    def loaded(result):
+        total, rows = result
+        if total == 0:
+            messagebox.showinfo(title, empty_message, parent=master)
+            return
+        RecordListWindow(master, title, filename, columns, total, rows)
+
+    run_in_background(master, f"Loading {filename}", first_page, filename, on_done=loaded,
+                      progress=True)
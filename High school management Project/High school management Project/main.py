@@ -1,162 +1,142 @@
 import tkinter as tk
-from tkinter import messagebox
-import json
+from tkinter import messagebox, filedialog
+import importlib.util
 import os
-import subprocess
-import sys
-
-def load_data(filename):
-    if os.path.exists(filename):
-        with open(filename, 'r') as f:
-            return json.load(f)
-    return []
+from core import storage, reports, report_engine, report_cards
+import Teacher
+import Grade
+import Subject
+import score
+import enrollment
+import user
+import performance_panel
+from task_runner import run_in_background, BusyIndicator
+
+def import_from_path(name, filename):
+    # For module files whose names are not valid identifiers
+    path = os.path.join(os.path.dirname(os.path.abspath(__file__)), filename)
+    spec = importlib.util.spec_from_file_location(name, path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+school_system = import_from_path("school_system", "python school_system.py")
+
+# --- Reports ---
+# The data and text come from core.reports; the dashboard only displays them.
+# Reports run on the task runner's worker threads so the windows stay live.
+
+def show_report(name):
+    run_in_background(root, f"Running report {name}", reports.run_report, name,
+                      on_done=lambda result: messagebox.showinfo(result[0], result[2]), progress=True)
 
 def report_student_count_by_grade():
-    students = load_data("students.json")
-    grade_counts = {}
-    for s in students:
-        grade = s.get("grade", "Unknown")
-        grade_counts[grade] = grade_counts.get(grade, 0) + 1
-    report = "\n".join([f"Grade {g}: {c} students" for g, c in grade_counts.items()])
-    if not report:
-        report = "No student records found."
-    messagebox.showinfo("Student Count by Grade", report)
+    show_report("student-count-by-grade")
 
 def report_average_score_per_subject():
-    scores = load_data("scores.json")
-    subject_totals = {}
-    subject_counts = {}
-    for s in scores:
-        subject = s.get("subject", "Unknown")
-        score = float(s.get("score", 0))
-        subject_totals[subject] = subject_totals.get(subject, 0) + score
-        subject_counts[subject] = subject_counts.get(subject, 0) + 1
-    report = "\n".join([
-        f"{subj}: {subject_totals[subj]/subject_counts[subj]:.2f}"
-        for subj in subject_totals
-    ])
-    if not report:
-        report = "No score records found."
-    messagebox.showinfo("Average Score per Subject", report)
+    show_report("average-score-per-subject")
 
 def report_teacher_assignment():
-    grades = load_data("grades.json")
-    teacher_assignments = {}
-    for g in grades:
-        teacher = g.get("class_teacher", "Unknown")
-        grade_name = g.get("name", "Unknown")
-        teacher_assignments.setdefault(teacher, []).append(grade_name)
-    report = "\n".join([
-        f"Teacher {t}: Grades {', '.join(grades)}"
-        for t, grades in teacher_assignments.items()
-    ])
-    if not report:
-        report = "No teacher assignments found."
-    messagebox.showinfo("Teacher Assignment Summary", report)
+    show_report("teacher-assignment")
 
 def report_enrollment_status():
-    enrollments = load_data("enrollments.json")
-    status_counts = {}
-    for e in enrollments:
-        status = e.get("status", "Unknown")
-        status_counts[status] = status_counts.get(status, 0) + 1
-    report = "\n".join([f"{status}: {count}" for status, count in status_counts.items()])
-    if not report:
-        report = "No enrollment records found."
-    messagebox.showinfo("Enrollment Status Summary", report)
+    show_report("enrollment-status")
 
 def report_capacity_vs_actual():
-    grades = load_data("grades.json")
-    students = load_data("students.json")
-    grade_student_counts = {}
-    for s in students:
-        grade = s.get("grade", "Unknown")
-        grade_student_counts[grade] = grade_student_counts.get(grade, 0) + 1
-    report_lines = []
-    for g in grades:
-        name = g.get("name", "Unknown")
-        capacity = g.get("capacity", 0)
-        actual = grade_student_counts.get(name, 0)
-        report_lines.append(f"Grade {name}: {actual}/{capacity} students")
-    report = "\n".join(report_lines)
-    if not report:
-        report = "No grade or student records found."
-    messagebox.showinfo("Capacity vs. Actual Students", report)
-
-# --- New Reports Below ---
+    show_report("capacity-vs-actual")
 
 def report_students_by_grade():
-    students = load_data("students.json")
-    grades = {}
-    for s in students:
-        grade = s.get("grade", "Unknown")
-        grades.setdefault(grade, []).append(s.get("name", "Unknown"))
-    report = ""
-    for grade, names in grades.items():
-        report += f"Grade {grade}:\n"
-        for name in names:
-            report += f"  - {name}\n"
-    if not report:
-        report = "No student records found."
-    messagebox.showinfo("Students by Grade", report)
+    show_report("students-by-grade")
 
 def report_student_report_card():
-    students = load_data("students.json")
-    scores = load_data("scores.json")
-    if not students:
-        messagebox.showinfo("Student Report Card", "No student records found.")
-        return
-    # For demo, show the first student
-    student = students[0]
-    student_scores = [s for s in scores if s.get("student_id") == student.get("student_id")]
-    report = f"Report Card for {student.get('name')} (ID: {student.get('student_id')})\n"
-    if student_scores:
-        for s in student_scores:
-            report += f"{s.get('subject')}: {s.get('score')}\n"
-    else:
-        report += "No scores found. (Dummy: Math: 80, English: 75)\n"
-    messagebox.showinfo("Student Report Card", report)
+    show_report("student-report-card")
 
 def report_totals():
-    students = load_data("students.json")
-    teachers = load_data("teachers.json")
-    subjects = load_data("subjects.json")
-    report = (
-        f"Total Students: {len(students)}\n"
-        f"Total Teachers: {len(teachers)}\n"
-        f"Total Subjects: {len(subjects)}"
-    )
-    messagebox.showinfo("Totals", report)
+    show_report("totals")
+
+def report_all_report_cards():
+    # One .txt and one .html card per student in a folder the user picks.
+    # Rendered in this process: worker processes would re-import the dashboard.
+    out_dir = filedialog.askdirectory(title="Save Report Cards To", parent=root)
+    if not out_dir:
+        return
+
+    def written(result):
+        cards, files = result
+        messagebox.showinfo("Report Cards", f"{cards} report cards written ({files} files) to:\n{out_dir}")
+
+    run_in_background(root, "Writing report cards",
+                      lambda progress: report_cards.generate_all(out_dir, workers=1, progress=progress),
+                      on_done=written, progress=True)
+
+def report_all():
+    # Every report from one read of each file, shown in one scrollable window
+    run_in_background(root, "Running all reports", report_engine.run_all, on_done=show_all_reports,
+                      progress=True)
+
+def show_all_reports(results):
+    window = tk.Toplevel(root)
+    window.title("All Reports")
+    window.geometry("600x600")
+    text = tk.Text(window, font=("Arial", 10), wrap=tk.WORD)
+    scrollbar = tk.Scrollbar(window, command=text.yview)
+    text.configure(yscrollcommand=scrollbar.set)
+    scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+    text.pack(fill=tk.BOTH, expand=True)
+    for _, title, _, body in results:
+        text.insert(tk.END, f"{title}\n", "title")
+        text.insert(tk.END, body.rstrip("\n") + "\n\n")
+    text.tag_configure("title", font=("Arial", 11, "bold"))
+    text.configure(state=tk.DISABLED)
 
 # --- Module Launchers ---
+# Modules open as Toplevel windows inside the dashboard process, so no new
+# interpreter is started and they share this process's storage layer.
+# Clicking a module that is already open brings its window to the front.
+
+open_windows = {}
+
+def open_module(module_class):
+    module = open_windows.get(module_class)
+    if module is not None and module.window.winfo_exists():
+        module.window.deiconify()
+        module.window.lift()
+        module.window.focus_force()
+        return
+    open_windows[module_class] = module_class(root)
 
 def open_student_module():
-    subprocess.Popen([sys.executable, os.path.join(os.getcwd(), "python school_system.py")])
+    open_module(school_system.StudentManagement)
 
 def open_teacher_module():
-    subprocess.Popen([sys.executable, os.path.join(os.getcwd(), "Teacher.py")])
+    open_module(Teacher.TeacherManagement)
 
 def open_grade_module():
-    subprocess.Popen([sys.executable, os.path.join(os.getcwd(), "Grade.py")])
+    open_module(Grade.GradeManagement)
 
 def open_subject_module():
-    subprocess.Popen([sys.executable, os.path.join(os.getcwd(), "Subject.py")])
+    open_module(Subject.SubjectManagement)
 
 def open_score_module():
-    subprocess.Popen([sys.executable, os.path.join(os.getcwd(), "score.py")])
+    open_module(score.ScoreManagement)
 
 def open_enrollment_module():
-    subprocess.Popen([sys.executable, os.path.join(os.getcwd(), "enrollment.py")])
+    open_module(enrollment.EnrollmentManagement)
 
 def open_user_module():
-    subprocess.Popen([sys.executable, os.path.join(os.getcwd(), "user.py")])
+    open_module(user.UserManagement)
+
+def open_performance_panel():
+    open_module(performance_panel.PerformancePanel)
 
 def logout():
+    storage.flush()
     root.destroy()
 
 root = tk.Tk()
 root.title("School Management System - Dashboard")
 root.configure(bg="#f0f4f7")
+root.protocol("WM_DELETE_WINDOW", logout)
 
 # --- Set window size and center it ---
 window_width = 900
@@ -211,7 +191,9 @@ btns = [
     ("Capacity vs Actual", report_capacity_vs_actual),
     ("Students by Grade", report_students_by_grade),
     ("Student Report Card (Demo)", report_student_report_card),
-    ("Total Students, Teachers, Subjects", report_totals)
+    ("All Report Cards to Folder", report_all_report_cards),
+    ("Total Students, Teachers, Subjects", report_totals),
+    ("Refresh All Reports", report_all)
 ]
 
 for text, cmd in btns:
@@ -252,7 +234,8 @@ module_btns = [
     ("Subject Management", open_subject_module),
     ("Score Management", open_score_module),
     ("Enrollment Management", open_enrollment_module),
-    ("User Management", open_user_module)
+    ("User Management", open_user_module),
+    ("Performance", open_performance_panel)
 ]
 
 for text, cmd in module_btns:
@@ -265,6 +248,9 @@ tk.Button(root, text="Exit / Logout", command=logout, font=("Arial", 12, "bold")
 footer = tk.Label(root, text="Developed By Tech Tonic", font=("Arial", 10), bg="#f0f4f7", fg="grey")
 footer.pack(side=tk.BOTTOM, pady=0)
 
+# --- Busy Indicator (background tasks of the dashboard and every module) ---
+BusyIndicator(root).pack(side=tk.BOTTOM, fill=tk.X, padx=20)
+
 root.mainloop()
 
 
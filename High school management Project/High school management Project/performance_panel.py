@@ -0,0 +1,102 @@
+# School Management System (GUI-Based using tkinter)
+# Module: Performance Panel
+# Data Storage: none; reads the in-process timings from core.metrics
+# Libraries: tkinter, ttk, filedialog, messagebox, core.config, core.metrics
+#
+# Live table of the timed operations (data loads and saves, add_* calls,
+# reports), slowest 95th percentile first, refreshed every second while the
+# window is open. Times are in milliseconds.
+
+import tkinter as tk
+from tkinter import ttk, filedialog, messagebox
+from core import config, metrics
+
+COLUMNS = [
+    ("name", "Operation", 230),
+    ("calls", "Calls", 60),
+    ("p50", "p50 ms", 75),
+    ("p95", "p95 ms", 75),
+    ("p99", "p99 ms", 75),
+    ("max", "Max ms", 75),
+    ("records", "Records", 80),
+    ("bytes", "KB", 80),
+]
+
+class PerformancePanel:
+    REFRESH_MS = 1000
+
+    def __init__(self, master=None):
+        self.window = tk.Tk() if master is None else tk.Toplevel(master)
+        self.build()
+        self.refresh()
+
+    # ========== Refresh ==========
+    def row(self, r):
+        values = []
+        for field, _, _ in COLUMNS:
+            value = r[field]
+            if field in ("p50", "p95", "p99", "max"):
+                value = f"{value * 1000:.1f}"
+            elif field == "bytes":
+                value = f"{value / 1024:.0f}" if value else ""
+            elif field == "records":
+                value = value or ""
+            values.append(value)
+        return values
+
+    def refresh(self):
+        if not self.window.winfo_exists():
+            return
+        rows = metrics.summary()
+        self.tree.delete(*self.tree.get_children())
+        for r in rows:
+            self.tree.insert("", tk.END, values=self.row(r))
+        self.status.configure(text=f"{len(rows)} operations timed" if rows else "Nothing timed yet - use the dashboard.")
+        self.window.after(self.REFRESH_MS, self.refresh)
+
+    def reset(self):
+        metrics.reset()
+        self.tree.delete(*self.tree.get_children())
+
+    def export(self):
+        # To the "metrics_log" file, or one picked here when it is not set
+        path = config.get("metrics_log") or filedialog.asksaveasfilename(
+            parent=self.window, title="Write Timings To", defaultextension=".jsonl",
+            filetypes=[("JSON lines", "*.jsonl"), ("All files", "*.*")])
+        if not path:
+            return
+        metrics.export(path)
+        messagebox.showinfo("Performance", f"Timings appended to:\n{path}", parent=self.window)
+
+    # ========== GUI Setup ==========
+    def build(self):
+        root = self.window
+        root.title("School Management System - Performance")
+        root.configure(bg="#f0f4f7")
+
+        header = tk.Label(root, text="Performance", font=("Arial", 15, "bold"), bg="#2c3e50", fg="white", pady=10)
+        header.pack(fill=tk.X)
+
+        frame = tk.Frame(root, bg="#f0f4f7")
+        frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
+
+        self.tree = ttk.Treeview(frame, columns=[c for c, _, _ in COLUMNS], show="headings", height=18)
+        for field, heading, width in COLUMNS:
+            self.tree.heading(field, text=heading)
+            self.tree.column(field, width=width, anchor="w" if field == "name" else "e")
+        scrollbar = ttk.Scrollbar(frame, orient=tk.VERTICAL, command=self.tree.yview)
+        self.tree.configure(yscrollcommand=scrollbar.set)
+        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        self.tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+
+        btn_style = {"font": ("Arial", 10), "bg": "#3498db", "fg": "white", "activebackground": "#2980b9", "activeforeground": "white", "bd": 0, "relief": tk.FLAT, "padx": 5, "pady": 3, "width": 16}
+        buttons = tk.Frame(root, bg="#f0f4f7")
+        buttons.pack(fill=tk.X, padx=10)
+        tk.Button(buttons, text="Reset", command=self.reset, **btn_style).pack(side=tk.LEFT, padx=(0, 6))
+        tk.Button(buttons, text="Write to Log", command=self.export, **btn_style).pack(side=tk.LEFT)
+
+        self.status = tk.Label(root, font=("Arial", 9), bg="#f0f4f7", fg="grey", anchor="w")
+        self.status.pack(fill=tk.X, padx=10, pady=(4, 8))
+
+if __name__ == "__main__":
+    PerformancePanel().window.mainloop()
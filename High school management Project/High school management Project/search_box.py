@@ -0,0 +1,47 @@
+# School Management System (GUI-Based using tkinter)
+# Module: Search Box
+# Data Storage: students.json, teachers.json or subjects.json, read through
+#               core.search
+# Libraries: tkinter, messagebox, core.search, list_window, task_runner
+#
+# One-line search field of the student, teacher and subject windows. Enter
+# or the Search button runs the query on the task runner (the first search
+# of a window builds the collection's index) and opens the matches, best
+# first, in a list window.
+
+import tkinter as tk
+from tkinter import messagebox
+from core import search
+from list_window import RecordListWindow
+from task_runner import run_in_background
+
+class SearchBox:
+    def __init__(self, master, window, title, filename, columns):
+        # master: the frame to pack into; window: the module window the
+        # results belong to; columns: [(field, heading)] of the result list
+        self.window = window
+        self.title = title
+        self.filename = filename
+        self.columns = columns
+
+        self.frame = tk.LabelFrame(master, text="Search", font=("Arial", 11, "bold"), bg="#f0f4f7", fg="#2c3e50", padx=10, pady=6, bd=2, relief=tk.GROOVE)
+        self.entry = tk.Entry(self.frame, font=("Arial", 10), bg="white")
+        self.entry.pack(side=tk.LEFT, fill=tk.X, expand=True)
+        self.entry.bind("<Return>", lambda event: self.run())
+        tk.Button(self.frame, text="Search", command=self.run, font=("Arial", 10), bg="#3498db", fg="white", activebackground="#2980b9", activeforeground="white", bd=0, relief=tk.FLAT, padx=8).pack(side=tk.LEFT, padx=(6, 0))
+
+    def pack(self, **kwargs):
+        self.frame.pack(**kwargs)
+
+    def run(self):
+        query = self.entry.get().strip()
+        if not query:
+            return
+        run_in_background(self.window, f"Searching {self.filename}", search.search, self.filename, query,
+                          on_done=lambda results: self.show(query, results))
+
+    def show(self, query, results):
+        if not results:
+            messagebox.showinfo(self.title, f'No matches for "{query}".', parent=self.window)
+            return
+        RecordListWindow(self.window, f"{self.title}: {query}", self.filename, self.columns, records=results)
@@ -0,0 +1,227 @@
+# School Management System (GUI-Based using tkinter)
+# Module: Background Task Runner
+# Data Storage: none; runs core calls (loads, reports, saves) off the Tk thread
+# Libraries: tkinter, ttk, messagebox, concurrent.futures, queue, sys,
+#            threading, core.errors
+#
+# Tk may only be touched from the thread running mainloop, so a long load or
+# report used to freeze every window until it returned. Here the work runs on
+# a small thread pool instead; a finished task is queued and picked up by a
+# root.after poll on the Tk thread, which then calls on_done / on_error.
+#
+# There is one runner per Tk root, shared by the dashboard and every module
+# window it opens. While anything runs, every window shows the busy cursor
+# and each BusyIndicator shows the oldest task, its progress and Cancel.
+# Cancelling is cooperative: a task started with progress=True gets a
+# progress(done, total) callback, which raises Cancelled once Cancel was
+# pressed. Tasks that cannot stop halfway (saves) offer no Cancel.
+
+import queue
+import sys
+import threading
+import tkinter as tk
+from concurrent.futures import ThreadPoolExecutor
+from tkinter import ttk, messagebox
+from core.errors import ValidationError
+
+WORKERS = 2
+POLL_MS = 50
+
+class Cancelled(Exception):
+    pass
+
+class Task:
+    def __init__(self, label, cancellable, parent):
+        self.label = label
+        self.cancellable = cancellable
+        self.parent = parent
+        self.done = 0
+        self.total = None
+        self.future = None
+        self.on_done = None
+        self.on_error = None
+        self._cancel = threading.Event()
+
+    def progress(self, done, total=None):
+        # Called from the worker thread; also the point where it stops
+        self.done = done
+        self.total = total
+        if self._cancel.is_set():
+            raise Cancelled()
+
+    def cancel(self):
+        if self.cancellable:
+            self._cancel.set()
+            # Only stops it if no worker has picked it up yet
+            self.future.cancel()
+
+    @property
+    def cancelled(self):
+        return self._cancel.is_set()
+
+class TaskRunner:
+    def __init__(self, root):
+        self.root = root
+        self.pool = ThreadPoolExecutor(max_workers=WORKERS, thread_name_prefix="school-task")
+        self.finished = queue.Queue()
+        self.tasks = []
+        self.listeners = []
+        self.polling = False
+        self.busy = False
+        root.bind("<Destroy>", self.on_destroy, add="+")
+
+    # ========== Submitting ==========
+    def submit(self, label, fn, *args, on_done=None, on_error=None, progress=False, parent=None):
+        # fn(*args) runs on a worker; on_done(result) or on_error(exception)
+        # run later on the Tk thread. With progress=True fn is also passed
+        # progress=<callback> and the task can be cancelled.
+        task = Task(label, progress, parent)
+        task.on_done = on_done
+        task.on_error = on_error
+        kwargs = {"progress": task.progress} if progress else {}
+        task.future = self.pool.submit(fn, *args, **kwargs)
+        task.future.add_done_callback(lambda future: self.finished.put(task))
+        self.tasks.append(task)
+        if not self.polling:
+            self.polling = True
+            self.root.after(POLL_MS, self.poll)
+        self.notify()
+        return task
+
+    # ========== Polling (Tk thread) ==========
+    def poll(self):
+        done = []
+        while True:
+            try:
+                done.append(self.finished.get_nowait())
+            except queue.Empty:
+                break
+        for task in done:
+            self.tasks.remove(task)
+        if self.tasks:
+            self.root.after(POLL_MS, self.poll)
+        else:
+            self.polling = False
+        self.notify()
+        for task in done:
+            try:
+                self.deliver(task)
+            except Exception:
+                self.root.report_callback_exception(*sys.exc_info())
+
+    def deliver(self, task):
+        future = task.future
+        if future.cancelled():
+            return
+        error = future.exception()
+        if isinstance(error, Cancelled):
+            return
+        parent = task.parent
+        if parent is not None and not parent.winfo_exists():
+            # The window that asked was closed meanwhile; errors still show
+            if error is None:
+                return
+            parent = None
+        if error is None:
+            if task.on_done is not None:
+                task.on_done(future.result())
+        elif task.on_error is not None:
+            task.on_error(error)
+        elif isinstance(error, ValidationError):
+            messagebox.showerror("Error", str(error), parent=parent or self.root)
+        else:
+            messagebox.showerror("Error", f"{task.label} failed:\n{error}", parent=parent or self.root)
+
+    # ========== Busy Indicator ==========
+    def notify(self):
+        busy = bool(self.tasks)
+        if busy != self.busy:
+            self.busy = busy
+            self.set_cursor("watch" if busy else "")
+        for listener in list(self.listeners):
+            listener()
+
+    def set_cursor(self, cursor):
+        for window in _windows(self.root):
+            try:
+                window.configure(cursor=cursor)
+            except tk.TclError:
+                pass
+
+    def on_destroy(self, event):
+        if event.widget is not self.root:
+            return
+        for task in self.tasks:
+            task.cancel()
+        self.pool.shutdown(wait=False, cancel_futures=True)
+        _runners.pop(self.root, None)
+
+def _windows(window):
+    # The root and every Toplevel under it
+    yield window
+    for child in window.winfo_children():
+        if isinstance(child, tk.Toplevel):
+            yield from _windows(child)
+
+_runners = {}
+
+def runner_for(widget):
+    # The runner shared by every window of widget's Tk root
+    root = widget.nametowidget(".")
+    runner = _runners.get(root)
+    if runner is None:
+        runner = _runners[root] = TaskRunner(root)
+    return runner
+
+def run_in_background(window, label, fn, *args, on_done=None, on_error=None, progress=False):
+    # on_done is skipped when `window` has been closed by the time fn returns
+    return runner_for(window).submit(label, fn, *args, on_done=on_done, on_error=on_error,
+                                     progress=progress, parent=window)
+
+class BusyIndicator:
+    # One-line status bar: the oldest running task, its progress and Cancel.
+    # Blank while nothing runs.
+    def __init__(self, master, bg="#f0f4f7"):
+        self.runner = runner_for(master)
+        self.frame = tk.Frame(master, bg=bg)
+        self.label = tk.Label(self.frame, font=("Arial", 9), bg=bg, fg="grey", anchor="w")
+        self.label.pack(side=tk.LEFT, fill=tk.X, expand=True)
+        self.cancel_btn = tk.Button(self.frame, text="Cancel", command=self.cancel, font=("Arial", 9), bg="#e74c3c", fg="white", activebackground="#c0392b", activeforeground="white", bd=0, relief=tk.FLAT, padx=6)
+        self.bar = ttk.Progressbar(self.frame, length=140)
+        self.runner.listeners.append(self.update)
+        self.frame.bind("<Destroy>", self.detach)
+        self.update()
+
+    def pack(self, **kwargs):
+        self.frame.pack(**kwargs)
+
+    def detach(self, event=None):
+        if self.update in self.runner.listeners:
+            self.runner.listeners.remove(self.update)
+
+    def update(self):
+        tasks = self.runner.tasks
+        if not tasks:
+            self.label.configure(text="")
+            self.bar.pack_forget()
+            self.cancel_btn.pack_forget()
+            return
+        task = tasks[0]
+        text = f"{task.label}..."
+        if len(tasks) > 1:
+            text += f"  (+{len(tasks) - 1} more)"
+        self.label.configure(text=text)
+        if task.total:
+            self.bar.configure(mode="determinate", maximum=task.total, value=task.done)
+        else:
+            self.bar.configure(mode="indeterminate")
+            self.bar.step(4)
+        self.bar.pack(side=tk.RIGHT)
+        if task.cancellable:
+            self.cancel_btn.pack(side=tk.RIGHT, padx=(6, 0), before=self.bar)
+        else:
+            self.cancel_btn.pack_forget()
+
+    def cancel(self):
+        if self.runner.tasks:
+            self.runner.tasks[0].cancel()
@@ -0,0 +1,111 @@
+# School Management System
+# Module: Test Fixtures
+# Data Storage: a temporary data folder per test
+# Libraries: os, subprocess, sys, textwrap, pytest, core
+#
+# Run from the project folder with: python -m pytest -q tests
+#
+# Every test gets an empty data folder as its working directory, the way
+# cli.py --data-dir points the program at one. The core modules keep
+# per-collection state in memory (the parsed-collection cache, key indexes,
+# search indexes, page indexes, field code tables, the binary score file,
+# the seat counters, the SQLite connection, which collections were checked
+# for crash recovery), keyed by file name, so it is dropped between tests.
+# Logs are fsynced on release rather than by the write-behind flusher, and
+# compactions still running at the end of a test are waited for, so nothing
+# outlives the folder. The backend fixture runs a test once against each
+# storage backend; the school fixture fills the folder with a small school.
+# run_python() starts a separate process in the same folder, standing in for
+# another module window.
+
+import os
+import subprocess
+import sys
+import textwrap
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from core import config, indexes, occupancy, score_binary, search, sqlite_backend, storage
+from core.cache import collections_cache
+
+def _reset_state():
+    collections_cache.clear()
+    indexes._indexes.clear()
+    score_binary._dictionary = score_binary._Dictionary()
+    score_binary._open.update(signature=None, file=None)
+    storage._page_indexes.clear()
+    storage._field_code_tables.clear()
+    occupancy._live[0] = None
+    storage._recovered.clear()
+    search.reset()
+    conn = getattr(sqlite_backend._local, "conn", None)
+    if conn is not None:
+        conn.close()
+        sqlite_backend._local.conn = None
+
+@pytest.fixture
+def data_dir(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setitem(config.settings, "flush_interval", 0)
+    _reset_state()
+    yield tmp_path
+    storage._join_compactions()
+    storage.flush()
+    _reset_state()
+
+@pytest.fixture(params=["json", "sqlite"])
+def backend(request, data_dir, monkeypatch):
+    monkeypatch.setattr(storage, "BACKEND", request.param)
+    return request.param
+
+SCHOOL = {
+    "grades.json": [
+        {"name": "G1", "description": "First", "level": "1", "class_teacher": "T1", "capacity": 30},
+        {"name": "G2", "description": "Second", "level": "2", "class_teacher": "T2", "capacity": 5},
+        {"name": "G3", "description": "Third", "level": "3", "class_teacher": "T1", "capacity": 2},
+    ],
+    "students.json": [
+        {"student_id": "S1", "name": "Ann", "grade": "G1"},
+        {"student_id": "S2", "name": "Ben", "grade": "G1"},
+        {"student_id": "S3", "name": "Cid", "grade": "G2"},
+    ],
+    "teachers.json": [
+        {"Teacher_id": "T1", "name": "Tess", "courses": "Maths"},
+        {"Teacher_id": "T2", "name": "Tom", "courses": "Art"},
+    ],
+    "subjects.json": [
+        {"name": "Maths", "grades": ["G1", "G2"]},
+        {"name": "Art", "grades": ["G2"]},
+    ],
+    "scores.json": [
+        {"student_id": "S1", "subject": "Maths", "teacher_id": "T1", "score": 80.0},
+        {"student_id": "S1", "subject": "Art", "teacher_id": "T2", "score": 70.0},
+        {"student_id": "S2", "subject": "Maths", "teacher_id": "T1", "score": 60.0},
+        {"student_id": "S3", "subject": "Art", "teacher_id": "T2", "score": 95.5},
+    ],
+    "enrollments.json": [
+        {"student_id": "S1", "grade": "G1", "status": "Active"},
+        {"student_id": "S2", "grade": "G1", "status": "Active"},
+        {"student_id": "S3", "grade": "G2", "status": "Active"},
+    ],
+}
+
+@pytest.fixture
+def school(data_dir):
+    for filename, records in SCHOOL.items():
+        storage.save_data(filename, [dict(r) for r in records])
+    return data_dir
+
+def run_python(code, cwd, *args, env=None, wait=True):
+    # Runs code in a new interpreter in cwd; returns the CompletedProcess, or
+    # the Popen when wait is False
+    environ = dict(os.environ, PYTHONPATH=ROOT, SCHOOL_FLUSH_INTERVAL="0")
+    environ.update(env or {})
+    command = [sys.executable, "-c", textwrap.dedent(code), *map(str, args)]
+    if not wait:
+        return subprocess.Popen(command, cwd=cwd, env=environ, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
+    result = subprocess.run(command, cwd=cwd, env=environ, capture_output=True, text=True, timeout=120)
+    assert result.returncode == 0, result.stderr
+    return result
@@ -0,0 +1,76 @@
+# School Management System
+# Module: Tests - Materialized Aggregates
+# Libraries: os, conftest, core
+#
+# The .agg files are only a shortcut: whatever happens to them (a crash
+# between the append and the update, a hand edit, a missing or stale file,
+# a compaction) the reports must read what a rebuild from the records gives.
+
+import os
+from conftest import run_python
+from core import aggregates, reports, storage
+from core.scores import add_score
+
+def _scores():
+    return storage.load_data("scores.json")
+
+def _from_records():
+    averages = {}
+    for s in _scores():
+        averages.setdefault(s["subject"], []).append(s["score"])
+    return {subject: sum(v) / len(v) for subject, v in averages.items()}
+
+def _age(path, seconds=10):
+    # Backdates a file so newer writes are seen as newer whatever the
+    # file system's timestamp resolution
+    st = os.stat(path)
+    os.utime(path, (st.st_atime - seconds, st.st_mtime - seconds))
+
+def test_kept_up_to_date_by_inserts(school):
+    add_score({"student_id": "S2", "subject": "Art", "teacher_id": "T2", "score": "50"})
+    add_score({"student_id": "S3", "subject": "Maths", "teacher_id": "T2", "score": "40"})
+    assert aggregates.load("scores.json") == aggregates.rebuild("scores.json")
+    assert reports.average_score_per_subject() == _from_records()
+    assert aggregates.count("scores.json") == len(_scores())
+
+def test_rebuilt_after_crash_between_append_and_update(school):
+    aggregates.load("scores.json")
+    _age(aggregates.aggregate_path("scores.json"))
+    # The window dies after appending, before its aggregate update
+    run_python("""
+        import os
+        from core import storage
+        storage.append_record("scores.json", {"student_id": "S2", "subject": "Art", "teacher_id": "T2", "score": 10.0})
+        os._exit(0)
+    """, school)
+    assert aggregates.count("scores.json") == 5
+    assert reports.average_score_per_subject() == _from_records()
+
+def test_rebuilt_when_missing(school):
+    aggregates.load("scores.json")
+    os.remove(aggregates.aggregate_path("scores.json"))
+    assert reports.average_score_per_subject() == _from_records()
+    assert os.path.exists(aggregates.aggregate_path("scores.json"))
+
+def test_rebuilt_when_older_than_data(school):
+    aggregates.load("scores.json")
+    _age(aggregates.aggregate_path("scores.json"))
+    # A hand edit of the main file
+    storage._write_json("scores.json", _scores()[:1])
+    assert aggregates.count("scores.json") == 1
+    assert reports.average_score_per_subject() == _from_records()
+
+def test_save_data_drops_them(school):
+    aggregates.load("scores.json")
+    storage.save_data("scores.json", _scores()[:2])
+    assert not os.path.exists(aggregates.aggregate_path("scores.json"))
+    assert aggregates.count("scores.json") == 2
+
+def test_compaction_keeps_fresh_aggregates(school):
+    for n in range(5):
+        add_score({"student_id": "S1", "subject": "Maths", "teacher_id": "T1", "score": str(n)})
+    storage.compact("scores.json")
+    assert not aggregates._stale("scores.json")
+    assert aggregates.load("scores.json") == aggregates.rebuild("scores.json")
+    add_score({"student_id": "S1", "subject": "Maths", "teacher_id": "T1", "score": "100"})
+    assert reports.average_score_per_subject() == _from_records()
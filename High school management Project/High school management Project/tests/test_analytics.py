@@ -0,0 +1,56 @@
+# School Management System
+# Module: Tests - Score Analytics
+# Libraries: statistics, sys, pytest, core
+#
+# The vectorized statistics must agree with the same figures worked out
+# record by record. numpy is optional, so those tests are skipped without
+# it; the error shown when it is missing is checked either way.
+
+import statistics
+import sys
+import pytest
+from core import analytics, storage
+
+def test_clear_error_without_numpy(school, monkeypatch):
+    monkeypatch.setitem(sys.modules, "numpy", None)
+    with pytest.raises(RuntimeError, match="pip install numpy"):
+        analytics.score_stats("subject")
+
+def test_snapshot_unchanged_until_the_collection_changes(school):
+    first = storage.snapshot("scores.json")
+    assert storage.snapshot("scores.json") is first
+    storage.append_record("scores.json", {"student_id": "S2", "subject": "Art", "teacher_id": "T2", "score": 30.0})
+    assert storage.snapshot("scores.json") is not first
+
+@pytest.mark.parametrize("by, field", [("subject", "subject"), ("teacher", "teacher_id"), ("grade", None)])
+def test_stats_match_record_by_record(school, by, field):
+    pytest.importorskip("numpy")
+    grade_of = {s["student_id"]: s["grade"] for s in storage.load_data("students.json")}
+    groups = {}
+    for s in storage.load_data("scores.json"):
+        key = s[field] if field else grade_of[s["student_id"]]
+        groups.setdefault(key, []).append(s["score"])
+
+    stats = analytics.score_stats(by, pass_mark=65)
+    assert set(stats) == set(groups)
+    for name, values in groups.items():
+        row = stats[name]
+        assert row["count"] == len(values)
+        assert row["mean"] == pytest.approx(statistics.fmean(values))
+        assert row["std"] == pytest.approx(statistics.pstdev(values), abs=1e-9)
+        assert row["median"] == pytest.approx(statistics.median(values))
+        assert (row["min"], row["max"]) == (min(values), max(values))
+        assert row["pass_rate"] == pytest.approx(sum(v >= 65 for v in values) / len(values))
+        assert sum(row["histogram"]) == len(values)
+
+def test_columns_rebuilt_only_on_change(school):
+    pytest.importorskip("numpy")
+    columns = analytics.load_columns()
+    assert analytics.load_columns() is columns
+    storage.append_record("students.json", {"student_id": "S4", "name": "New", "grade": "G3"})
+    assert analytics.load_columns() is not columns
+
+def test_no_scores(data_dir):
+    pytest.importorskip("numpy")
+    assert analytics.score_stats("grade") == {}
+    assert analytics.render_score_stats({}) == "No score records found."
@@ -0,0 +1,80 @@
+# School Management System
+# Module: Tests - Bulk CSV Import
+# Libraries: pytest, core
+#
+# Every row gets the form checks and the reference checks; accepted rows are
+# stored with their keys and aggregates, and each rejected row is reported
+# with its line number in the CSV and leaves nothing behind.
+
+import pytest
+from core import aggregates, bulk_import, indexes, storage
+from core.errors import ValidationError
+
+STUDENT_HEADER = "student_id,name,grade,dob,gender,phone,address,email,guardian_name,guardian_phone,registered_at\n"
+
+def _student_row(student_id, name="Pupil"):
+    return f"{student_id},{name},G1,2010-01-01,F,555,Street,a@b.c,Parent,556,2024-09-01\n"
+
+def _write(path, text):
+    with open(path, "w", newline="") as f:
+        f.write(text)
+    return path
+
+def test_students_rejected_with_line_numbers(backend, school):
+    path = _write("students.csv", STUDENT_HEADER
+                  + _student_row("N1")           # line 2
+                  + _student_row("S1")           # line 3: already on file
+                  + _student_row("N2", "")       # line 4: missing name
+                  + _student_row("N1")           # line 5: twice in this file
+                  + '"N3","Multi\nLine",G1,2010-01-01,F,555,Street,a@b.c,Parent,556,2024-09-01\n'  # lines 6-7
+                  + _student_row("N4"))          # line 8
+    result = bulk_import.import_csv("students", path)
+    assert result.accepted == 3
+    assert result.rejected == [
+        (3, "Student ID already exists."),
+        (4, "All fields are Requiry."),
+        (5, "Student ID already exists."),
+    ]
+    ids = [s["student_id"] for s in storage.load_data("students.json")]
+    assert ids == ["S1", "S2", "S3", "N1", "N3", "N4"]
+    assert indexes.key_exists("students.json", "N4")
+    assert not indexes.add_unique("students.json", {"student_id": "N3", "name": "x", "grade": "G1"})
+    assert aggregates.count_by("students.json", "grade")["G1"] == 5
+
+def test_scores_checked_against_references(backend, school):
+    path = _write("scores.csv", "student_id,subject,teacher_id,score\n"
+                  "S1,maths,T1,75\n"      # subject names match ignoring case
+                  "S9,Maths,T1,75\n"
+                  "S1,Maths,T9,75\n"
+                  "S1,Music,T1,75\n"
+                  "S1,Maths,T1,lots\n"
+                  "S2,Art,T2,65\n")
+    result = bulk_import.import_csv("scores", path)
+    assert result.accepted == 2
+    assert result.rejected == [
+        (3, "Student ID does not exist."),
+        (4, "Teacher ID does not exist."),
+        (5, "Subject does not exist."),
+        (6, "Score must be a number."),
+    ]
+    assert len(storage.load_data("scores.json")) == 6
+    assert aggregates.average_by("scores.json", "subject", "score")["Art"] == pytest.approx((70 + 95.5 + 65) / 3)
+
+def test_enrollments_checked_against_references(school):
+    path = _write("enrollments.csv", "student_id,grade,status\nS3,G3,Active\nS3,G9,Active\nS9,G1,Active\n")
+    result = bulk_import.import_csv("enrollments", path)
+    assert result.accepted == 1
+    assert result.rejected == [(3, "Grade does not exist."), (4, "Student ID does not exist.")]
+
+def test_missing_columns_are_an_error(school):
+    path = _write("scores.csv", "student_id,subject,score\nS1,Maths,75\n")
+    with pytest.raises(ValidationError, match="teacher_id"):
+        bulk_import.import_csv("scores", path)
+    assert len(storage.load_data("scores.json")) == 4
+
+def test_rows_across_batches(school, monkeypatch):
+    monkeypatch.setattr(bulk_import, "BATCH_ROWS", 3)
+    path = _write("students.csv", STUDENT_HEADER + "".join(_student_row(f"N{n}") for n in range(10)) + _student_row("S2"))
+    result = bulk_import.import_csv("students", path)
+    assert result.accepted == 10
+    assert result.rejected == [(12, "Student ID already exists.")]
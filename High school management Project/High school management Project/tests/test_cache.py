@@ -0,0 +1,80 @@
+# School Management System
+# Module: Tests - Collection Cache
+# Libraries: conftest, core
+#
+# A cached collection is only served while none of its files changed, and
+# the cache never holds more than the "cache_max_mb" setting allows, as
+# that setting stands when the cache is used.
+
+from conftest import run_python
+from core import config, storage
+from core.cache import CollectionCache, collections_cache
+
+FILENAME = "students.json"
+
+def _student(n):
+    return {"student_id": f"S{n}", "name": f"Student {n}", "grade": "G0"}
+
+# ========== Eviction ==========
+def test_least_recently_used_is_evicted():
+    cache = CollectionCache(max_bytes=100)
+    cache.store("a", 1, ["a"], 40)
+    cache.store("b", 1, ["b"], 40)
+    cache.lookup("a")
+    cache.store("c", 1, ["c"], 40)
+    assert cache.lookup("b") is None
+    assert cache.lookup("a").records == ["a"]
+    assert cache.total == 80
+
+def test_entry_larger_than_the_cache_is_not_kept():
+    cache = CollectionCache(max_bytes=100)
+    cache.store("a", 1, ["a"], 40)
+    cache.store("b", 1, ["b"], 200)
+    assert cache.lookup("b") is None
+    assert cache.lookup("a") is not None
+
+def test_limit_follows_the_current_setting(monkeypatch):
+    monkeypatch.setitem(config.settings, "cache_max_mb", 2)
+    assert collections_cache.max_bytes == 2 * 1024 * 1024
+    monkeypatch.setitem(config.settings, "cache_max_mb", 0)
+    assert collections_cache.max_bytes == 0
+
+# ========== Through Storage ==========
+def test_unchanged_collection_is_served_from_cache(data_dir):
+    storage.save_data(FILENAME, [_student(0), _student(1)])
+    first = storage.load_data(FILENAME)
+    second = storage.load_data(FILENAME)
+    assert second == first
+    assert second[0] is first[0]
+    # Callers get their own list
+    second.append(_student(9))
+    assert len(storage.load_data(FILENAME)) == 2
+
+def test_only_new_log_lines_are_parsed(data_dir):
+    storage.save_data(FILENAME, [_student(0)])
+    storage.append_record(FILENAME, _student(1))
+    before = storage.load_data(FILENAME)
+    storage.append_record(FILENAME, _student(2))
+    after = storage.load_data(FILENAME)
+    assert [r["student_id"] for r in after] == ["S0", "S1", "S2"]
+    assert after[1] is before[1]
+
+def test_changes_from_another_process_are_seen(data_dir):
+    storage.save_data(FILENAME, [_student(0)])
+    storage.load_data(FILENAME)
+    run_python("""
+        from core import storage
+        storage.append_record("students.json", {"student_id": "S1", "name": "n", "grade": "G0"})
+    """, data_dir)
+    assert [r["student_id"] for r in storage.load_data(FILENAME)] == ["S0", "S1"]
+    run_python("""
+        from core import storage
+        storage.save_data("students.json", [{"student_id": "S7", "name": "n", "grade": "G0"}])
+    """, data_dir)
+    assert [r["student_id"] for r in storage.load_data(FILENAME)] == ["S7"]
+
+def test_nothing_cached_with_a_zero_limit(data_dir, monkeypatch):
+    monkeypatch.setitem(config.settings, "cache_max_mb", 0)
+    storage.save_data(FILENAME, [_student(0)])
+    assert storage.load_data(FILENAME) == [_student(0)]
+    assert collections_cache.lookup(FILENAME) is None
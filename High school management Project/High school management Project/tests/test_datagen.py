@@ -0,0 +1,60 @@
+# School Management System
+# Module: Tests - Data Generator and Benchmark
+# Libraries: json, os, tempfile, core
+#
+# Generated data must be the same for the same seed and consistent (every
+# reference points at a record that exists), and a benchmark run must leave
+# nothing behind: not in the caller's folder, not in the temp folder.
+
+import json
+import os
+import tempfile
+from core import benchmark, datagen, storage
+
+def _files():
+    data = {}
+    for filename in datagen.sizes(1):
+        with open(filename, "rb") as f:
+            data[filename] = f.read()
+    return data
+
+def test_same_seed_same_data(data_dir):
+    datagen.generate(60, seed=3)
+    first = _files()
+    datagen.generate(60, seed=3)
+    assert _files() == first
+    datagen.generate(60, seed=4)
+    assert _files() != first
+
+def test_sizes_and_references(data_dir):
+    counts = datagen.generate(70, seed=1)
+    for filename, n in counts.items():
+        assert len(storage.load_data(filename)) == n
+    keys = {
+        filename: {str(r[field]).casefold() for r in storage.load_data(filename)}
+        for filename, field in [("students.json", "student_id"), ("teachers.json", "Teacher_id"),
+                                ("grades.json", "name"), ("subjects.json", "name")]
+    }
+    assert len(keys["students.json"]) == 70
+    for s in storage.load_data("scores.json"):
+        assert s["student_id"].casefold() in keys["students.json"]
+        assert s["teacher_id"].casefold() in keys["teachers.json"]
+        assert s["subject"].casefold() in keys["subjects.json"]
+    for e in storage.load_data("enrollments.json"):
+        assert e["grade"].casefold() in keys["grades.json"]
+    for s in storage.load_data("students.json"):
+        assert s["grade"].casefold() in keys["grades.json"]
+
+def test_benchmark_leaves_nothing_behind(data_dir, monkeypatch):
+    scratch = data_dir / "tmp"
+    scratch.mkdir()
+    monkeypatch.setattr(tempfile, "tempdir", str(scratch))
+    results = benchmark.run([20, 40], runs=1, adds=2)
+    assert results["meta"]["sizes"] == [20, 40]
+    cases = {(r["size"], r["case"]) for r in results["results"]}
+    assert (20, "report:all") in cases and (40, "add:students.json") in cases
+    assert sorted(os.listdir(data_dir)) == ["tmp"]
+    assert os.listdir(scratch) == []
+    benchmark.save_results(results, "out.json")
+    with open("out.json") as f:
+        assert json.load(f)["meta"]["runs"] == 1
@@ -0,0 +1,86 @@
+# School Management System
+# Module: Tests - Primary-Key Indexes
+# Libraries: os, pytest, conftest, core
+#
+# Duplicate checks go through the key index instead of reloading the
+# collection, so the index has to agree with the data: keys added here, keys
+# added by another process, and keys after save_data rewrites the file. The
+# autocomplete reads the same keys as sorted snapshots.
+
+import os
+import pytest
+from conftest import run_python
+from core import indexes, storage
+
+def _student(n):
+    return {"student_id": f"S{n}", "name": f"Student {n}", "grade": "G0"}
+
+def test_duplicates_are_rejected(data_dir):
+    assert indexes.add_unique("students.json", _student(1))
+    assert not indexes.add_unique("students.json", _student(1))
+    assert indexes.key_exists("students.json", "S1")
+    assert not indexes.key_exists("students.json", "S2")
+    assert len(storage.load_data("students.json")) == 1
+
+def test_subject_names_are_case_folded(data_dir):
+    assert indexes.add_unique("subjects.json", {"name": "Maths"})
+    assert not indexes.add_unique("subjects.json", {"name": "MATHS"})
+    assert indexes.key_exists("subjects.json", "maths")
+
+def test_index_built_from_existing_data(data_dir):
+    storage.save_data("students.json", [_student(1), _student(2)])
+    assert indexes.key_exists("students.json", "S2")
+    assert os.path.exists(indexes.index_path("students.json"))
+
+def test_keys_added_by_another_process(data_dir):
+    assert indexes.add_unique("students.json", _student(1))
+    run_python("""
+        from core import indexes
+        assert indexes.add_unique("students.json", {"student_id": "S2", "name": "n", "grade": "G0"})
+        assert not indexes.add_unique("students.json", {"student_id": "S1", "name": "n", "grade": "G0"})
+    """, data_dir)
+    assert indexes.key_exists("students.json", "S2")
+    assert not indexes.add_unique("students.json", _student(2))
+
+def test_index_rebuilt_after_save_data(data_dir):
+    indexes.add_unique("students.json", _student(1))
+    storage.save_data("students.json", [_student(7)])
+    assert not indexes.key_exists("students.json", "S1")
+    assert indexes.key_exists("students.json", "S7")
+
+# ========== Completions ==========
+def test_completions_match_prefixes_as_written(backend, data_dir):
+    for name in ["Maths", "art History", "Art", "Music", "Mechanics"]:
+        assert indexes.add_unique("subjects.json", {"name": name})
+    completions = indexes.completions("subjects.json")
+    assert completions.match("M") == ["Maths", "Mechanics", "Music"]
+    assert completions.match("ART") == ["Art", "art History"]
+    assert completions.match("") == ["Art", "art History", "Maths", "Mechanics", "Music"]
+    assert completions.match("m", limit=2) == ["Maths", "Mechanics"]
+    assert completions.match("x") == []
+
+def test_completions_are_snapshots(backend, data_dir):
+    indexes.add_unique("students.json", _student(1))
+    before = indexes.completions("students.json")
+    assert indexes.completions("students.json").match("S") == ["S1"]
+    indexes.add_unique("students.json", _student(2))
+    run_python("""
+        from core import indexes
+        assert indexes.add_unique("students.json", {"student_id": "S3", "name": "n", "grade": "G0"})
+    """, data_dir, env={"SCHOOL_BACKEND": storage.BACKEND})
+    # The old snapshot is left as it was; a new one has every key
+    assert before.match("S") == ["S1"]
+    assert indexes.completions("students.json").match("S") == ["S1", "S2", "S3"]
+
+@pytest.mark.parametrize("insert_sorted_max", [1000, 2])
+def test_completions_follow_key_batches(data_dir, monkeypatch, insert_sorted_max):
+    # Small batches are inserted in place, larger ones re-sorted
+    monkeypatch.setattr(indexes, "INSERT_SORTED_MAX", insert_sorted_max)
+    indexes.add_unique("students.json", _student(5))
+    assert indexes.completions("students.json").match("S") == ["S5"]
+    run_python("""
+        from core import indexes, storage
+        with storage.collection_lock("students.json"):
+            indexes.add_many("students.json", [{"student_id": f"S{n}", "name": "n", "grade": "G0"} for n in (1, 9, 3)])
+    """, data_dir)
+    assert indexes.completions("students.json").match("S") == ["S1", "S3", "S5", "S9"]
@@ -0,0 +1,67 @@
+# School Management System
+# Module: Tests - Referential Integrity
+# Libraries: json, os, pytest, core
+#
+# A record may only point at students, teachers, subjects and grades that
+# exist, as the key indexes see them. The indexes must keep up with the
+# data files even when those are edited by hand or the index file is lost.
+
+import json
+import os
+import pytest
+from core import bulk_import, indexes, reports, storage
+from core.enrollments import add_enrollment
+from core.errors import ValidationError
+from core.grades import add_grade
+from core.scores import add_score
+
+def _score(**values):
+    return add_score(dict({"student_id": "S1", "subject": "Maths", "teacher_id": "T1", "score": "50"}, **values))
+
+@pytest.mark.parametrize("field, value, message", [
+    ("student_id", "S9", "Student ID does not exist."),
+    ("teacher_id", "T9", "Teacher ID does not exist."),
+    ("subject", "Music", "Subject does not exist."),
+])
+def test_score_references_must_exist(backend, school, field, value, message):
+    with pytest.raises(ValidationError, match=message):
+        _score(**{field: value})
+    assert len(storage.load_data("scores.json")) == 4
+
+def test_enrollment_and_grade_references_must_exist(backend, school):
+    with pytest.raises(ValidationError, match="Grade does not exist."):
+        add_enrollment({"student_id": "S3", "grade": "G9", "status": "Active"})
+    with pytest.raises(ValidationError, match="Student ID does not exist."):
+        add_enrollment({"student_id": "S9", "grade": "G1", "status": "Active"})
+    with pytest.raises(ValidationError, match="Class teacher"):
+        add_grade({"name": "G4", "description": "d", "level": "4", "class_teacher": "T9", "capacity": "5"})
+    assert add_grade({"name": "G4", "description": "d", "level": "4", "class_teacher": "T2", "capacity": "5"})
+
+def test_subject_stored_as_the_subject_spells_it(backend, school):
+    assert _score(subject="mATHS")["subject"] == "Maths"
+    assert reports.average_score_per_subject() == {"Maths": 190 / 3, "Art": (70 + 95.5) / 2}
+    path = "scores.csv"
+    with open(path, "w") as f:
+        f.write("student_id,subject,teacher_id,score\nS2,art,T2,40\n")
+    assert bulk_import.import_csv("scores", path).accepted == 1
+    assert storage.load_data("scores.json")[-1]["subject"] == "Art"
+
+# ========== Stale Or Missing Index Files ==========
+def test_hand_edited_data_file_is_seen(school):
+    assert indexes.key_exists("students.json", "S3")
+    with open("students.json") as f:
+        students = json.load(f)
+    students[2]["student_id"] = "S30"
+    with open("students.json", "w") as f:
+        json.dump(students, f)
+    st = os.stat(indexes.index_path("students.json"))
+    os.utime(indexes.index_path("students.json"), (st.st_atime - 10, st.st_mtime - 10))
+    with pytest.raises(ValidationError, match="Student ID does not exist."):
+        _score(student_id="S3")
+    assert _score(student_id="S30")
+
+def test_lost_index_file_is_rebuilt(school):
+    assert indexes.key_exists("subjects.json", "maths")
+    os.remove(indexes.index_path("subjects.json"))
+    assert indexes.stored_key("subjects.json", "ART") == "Art"
+    assert indexes.key_map("subjects.json") == {"maths": "Maths", "art": "Art"}
@@ -0,0 +1,92 @@
+# School Management System
+# Module: Tests - Streaming JSON Reader
+# Libraries: io, json, pytest, core.json_stream
+#
+# The reader sees the file in chunks of chunk_chars characters, so every
+# chunk size from one character up is tried: each record, number, string
+# and escape then gets cut at every possible point.
+
+import io
+import json
+import pytest
+from core import json_stream
+
+RECORDS = [
+    {"student_id": "S1", "name": "Ann \"Nan\" Lee", "grade": "10th", "age": 15},
+    {"score": 88.125, "neg": -1.5e-3, "big": 12345678901234567890, "ok": True, "none": None},
+    {"nested": {"list": [1, [2, 3], {"a": "]"}], "empty": {}}, "text": "comma, bracket ] brace }"},
+    {"escapes": "tab\tnewline\nslash\\ quote\" unicode é中 \U0001f600"},
+    [],
+    "plain string",
+    42,
+]
+
+def _chunk_sizes(text):
+    return range(1, len(text) + 2)
+
+def _values(data, chunk):
+    return [value for value, _, _ in json_stream.iter_spans(io.BytesIO(data), chunk)]
+
+@pytest.mark.parametrize("indent", [None, 4])
+def test_iter_array_every_chunk_size(indent):
+    text = json.dumps(RECORDS, indent=indent)
+    for chunk in _chunk_sizes(text):
+        assert list(json_stream.iter_array(io.StringIO(text), chunk)) == RECORDS, chunk
+
+def test_iter_array_number_cut_at_chunk_end():
+    text = "[1234567, 2.5e10, -98765]"
+    for chunk in _chunk_sizes(text):
+        assert list(json_stream.iter_array(io.StringIO(text), chunk)) == [1234567, 2.5e10, -98765], chunk
+
+@pytest.mark.parametrize("text", ["", "   \n", "[]", " [ \n ] "])
+def test_iter_array_empty(text):
+    for chunk in (1, 2, 64):
+        assert list(json_stream.iter_array(io.StringIO(text), chunk)) == []
+
+@pytest.mark.parametrize("text", ['{"a": 1}', "[1, 2", "[1 2]", '[{"a": 1}'])
+def test_iter_array_rejects_bad_input(text):
+    with pytest.raises(ValueError):
+        list(json_stream.iter_array(io.StringIO(text), 3))
+
+@pytest.mark.parametrize("indent", [None, 4])
+def test_iter_spans_offsets_at_every_chunk_size(indent):
+    data = json.dumps(RECORDS, indent=indent).encode("ascii")
+    for chunk in _chunk_sizes(data):
+        spans = list(json_stream.iter_spans(io.BytesIO(data), chunk))
+        assert [value for value, _, _ in spans] == RECORDS, chunk
+        for value, start, end in spans:
+            assert json.loads(data[start:end]) == value
+
+def test_iter_spans_number_cut_at_chunk_end():
+    # A number is valid JSON on its own, so a chunk ending inside one must
+    # not yield the digits read so far
+    data = b"[1234567, 2.5e10, -98765]"
+    for chunk in _chunk_sizes(data):
+        assert _values(data, chunk) == [1234567, 2.5e10, -98765], chunk
+
+@pytest.mark.parametrize("data", [b"", b"   \n", b"[]", b" [ \n ] "])
+def test_iter_spans_empty(data):
+    for chunk in (1, 2, 64):
+        assert _values(data, chunk) == []
+
+@pytest.mark.parametrize("data", [b'{"a": 1}', b"[1, 2", b"[1 2]", b'[{"a": 1}'])
+def test_iter_spans_rejects_bad_input(data):
+    with pytest.raises(ValueError):
+        _values(data, 3)
+
+def test_iter_lines_stops_at_torn_line():
+    lines = b'{"a": 1}\n{"a": 2}\n{"a": '
+    assert list(json_stream.iter_lines(io.BytesIO(lines))) == [{"a": 1}, {"a": 2}]
+    # Lines past the size the caller saw are left out
+    assert list(json_stream.iter_lines(io.BytesIO(lines), 9)) == [{"a": 1}]
+
+def test_iter_line_spans_stops_at_torn_line():
+    lines = b'{"a": 1}\n{"a": 2}\n{"a": '
+    spans = list(json_stream.iter_line_spans(io.BytesIO(lines)))
+    assert spans == [({"a": 1}, 0, 9), ({"a": 2}, 9, 18)]
+    # Lines past the size the caller saw are left out
+    assert list(json_stream.iter_line_spans(io.BytesIO(lines), 0, 9)) == [({"a": 1}, 0, 9)]
+
+def test_iter_line_spans_from_offset():
+    lines = b'{"a": 1}\n{"a": 2}\n{"a": 3}'
+    assert list(json_stream.iter_line_spans(io.BytesIO(lines), 9)) == [({"a": 2}, 9, 18)]
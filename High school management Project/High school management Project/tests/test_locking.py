@@ -0,0 +1,56 @@
+# School Management System
+# Module: Tests - Inter-Process File Locks
+# Libraries: threading, conftest, core
+#
+# FileLock has to keep other processes and other threads out, let the
+# holding thread take it again, and run deferred work only once the lock
+# is fully released.
+
+import threading
+from conftest import run_python
+from core.locking import file_lock
+
+PROBE = """
+    from core.locking import file_lock
+    lock = file_lock("students.json.lock")
+    got = lock.acquire(blocking=False)
+    print(got)
+    if got:
+        lock.release()
+"""
+
+def test_other_process_is_kept_out(data_dir):
+    lock = file_lock("students.json.lock")
+    with lock:
+        assert run_python(PROBE, data_dir).stdout.strip() == "False"
+    assert run_python(PROBE, data_dir).stdout.strip() == "True"
+
+def test_reentrant_within_a_thread(data_dir):
+    lock = file_lock("students.json.lock")
+    with lock:
+        with lock:
+            assert lock.held()
+        assert lock.held()
+    assert not lock.held()
+
+def test_other_thread_is_kept_out(data_dir):
+    lock = file_lock("students.json.lock")
+    results = []
+    with lock:
+        thread = threading.Thread(target=lambda: results.append(lock.acquire(blocking=False)))
+        thread.start()
+        thread.join()
+    assert results == [False]
+
+def test_after_release_runs_once_after_outermost_release(data_dir):
+    lock = file_lock("students.json.lock")
+    calls = []
+    with lock:
+        with lock:
+            lock.after_release(calls.append, "flush")
+            lock.after_release(calls.append, "flush")
+        assert calls == []
+    assert calls == ["flush"]
+    with lock:
+        pass
+    assert calls == ["flush"]
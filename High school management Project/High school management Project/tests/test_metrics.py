@@ -0,0 +1,66 @@
+# School Management System
+# Module: Tests - Timing Metrics
+# Libraries: json, os, pytest, core
+#
+# Percentiles over the last WINDOW samples, the records and bytes counted
+# by load_data/save_data, and the summary lines written to "metrics_log".
+
+import json
+import os
+import pytest
+from core import config, metrics, reports, storage
+from core.students import add_student
+
+@pytest.fixture(autouse=True)
+def fresh_metrics():
+    metrics.reset()
+    yield
+    metrics.reset()
+
+def _row(name):
+    return next(r for r in metrics.summary() if r["name"] == name)
+
+def test_percentiles_over_the_window():
+    for ms in range(1, 101):
+        metrics.record("op", ms / 1000)
+    row = _row("op")
+    assert (row["p50"], row["p95"], row["p99"], row["max"]) == (0.05, 0.095, 0.099, 0.1)
+    assert row["calls"] == 100
+    for _ in range(metrics.WINDOW):
+        metrics.record("op", 0.001)
+    row = _row("op")
+    # Old samples leave the window; the running totals keep counting
+    assert (row["p99"], row["max"]) == (0.001, 0.001)
+    assert row["calls"] == 100 + metrics.WINDOW
+
+def test_slowest_first():
+    metrics.record("fast", 0.001)
+    metrics.record("slow", 0.5)
+    assert [r["name"] for r in metrics.summary()] == ["slow", "fast"]
+
+def test_hot_paths_are_timed(school):
+    storage.load_data("students.json")
+    add_student({field: "x" for field in ["student_id", "name", "grade", "dob", "gender", "phone", "address",
+                                           "email", "guardian_name", "guardian_phone", "registered_at"]})
+    reports.run_report("totals")
+    load = _row("load_data:students.json")
+    assert load["records"] == 3
+    assert load["bytes"] == os.path.getsize("students.json")
+    save = _row("save_data:scores.json")
+    assert save["records"] == 4 and save["bytes"] == os.path.getsize("scores.json")
+    assert _row("add:students.json")["calls"] == 1
+    assert _row("report:totals")["calls"] == 1
+
+def test_summary_lines_written_at_interval(data_dir, monkeypatch):
+    monkeypatch.setitem(config.settings, "metrics_log", "metrics.jsonl")
+    monkeypatch.setitem(config.settings, "metrics_interval", 3600)
+    monkeypatch.setattr(metrics, "_last_export", [0.0])
+    metrics.record("op", 0.01)
+    metrics.record("op", 0.02)
+    with open("metrics.jsonl") as f:
+        lines = [json.loads(line) for line in f]
+    assert len(lines) == 1
+    assert lines[0]["operations"][0]["name"] == "op"
+    metrics.export()
+    with open("metrics.jsonl") as f:
+        assert json.loads(f.readlines()[-1])["operations"][0]["calls"] == 2
@@ -0,0 +1,57 @@
+# School Management System
+# Module: Tests - Typed Records
+# Libraries: json, pickle, pytest, core
+#
+# Records are loaded as slotted classes with numbers and dates converted,
+# still read like the dicts they replace, and are written back as the same
+# JSON on every backend.
+
+import json
+import pickle
+import pytest
+from conftest import SCHOOL
+from core import records, storage
+
+STUDENT = {"student_id": "S1", "name": "Ann", "grade": "G1", "dob": "2010/01/31",
+           "registered_at": "2024-09-01", "nickname": "A"}
+
+def test_values_are_converted_once():
+    student = records.Student.from_dict(STUDENT)
+    assert student.dob == records.Date(2010, 1, 31)
+    assert str(student.dob) == "2010/01/31" and str(student.registered_at) == "2024-09-01"
+    score = records.Score.from_dict({"student_id": "S1", "subject": "Maths", "score": "80"})
+    assert score["score"] == 80.0 and isinstance(score["score"], float)
+    assert records.Teacher.from_dict({"salary": "4000"})["salary"] == 4000
+    assert records.Teacher.from_dict({"salary": "4000.5"})["salary"] == 4000.5
+
+@pytest.mark.parametrize("value", ["n/a", "2024/02/30", "2024-1-1", "", 7])
+def test_values_that_do_not_parse_are_kept(value):
+    assert records.Student.from_dict({"dob": value})["dob"] == value
+    assert records.Teacher.from_dict({"age": value})["age"] == value
+
+def test_records_read_like_dicts():
+    student = records.Student.from_dict(STUDENT)
+    assert student["name"] == "Ann" and student.get("gender", "?") == "?"
+    assert student["nickname"] == "A"  # unknown fields are kept
+    assert "phone" not in student and "grade" in student
+    with pytest.raises(KeyError):
+        student["phone"]
+    assert list(student) == ["student_id", "name", "grade", "dob", "registered_at", "nickname"]
+    assert student.to_dict() == STUDENT
+    assert json.dumps(student, default=records.to_json) == json.dumps(STUDENT)
+    assert pickle.loads(pickle.dumps(student.dob)) == student.dob
+    assert str(pickle.loads(pickle.dumps(student.dob))) == "2010/01/31"
+
+def test_collections_load_as_records(backend, school):
+    students = storage.load_data("students.json")
+    assert all(type(s) is records.Student for s in students)
+    assert [s.to_dict() for s in students] == SCHOOL["students.json"]
+    grade = storage.load_data("grades.json")[0]
+    assert type(grade) is records.Grade and grade["capacity"] == 30
+
+def test_save_writes_the_same_json(backend, data_dir):
+    teacher = {"Teacher_id": "T1", "name": "Tess", "age": "40", "dob": "1980/05/06", "salary": 1200.5}
+    storage.save_data("teachers.json", [teacher])
+    storage.save_data("teachers.json", storage.load_data("teachers.json"))
+    # Numeric text comes back as a number; everything else as written
+    assert [t.to_dict() for t in storage.load_data("teachers.json")] == [dict(teacher, age=40)]
@@ -0,0 +1,46 @@
+# School Management System
+# Module: Tests - Batch Report Cards
+# Libraries: os, core
+#
+# One card per student, with that student's scores, written to a file no
+# other card can overwrite, whether rendered here or by the worker pool.
+
+import os
+from core import report_cards, storage
+
+def test_cards_match_the_single_report(school):
+    count, files = report_cards.generate_all("cards", workers=1)
+    assert (count, files) == (3, 6)
+    assert sorted(os.listdir("cards")) == ["S1.html", "S1.txt", "S2.html", "S2.txt", "S3.html", "S3.txt"]
+    with open(os.path.join("cards", "S1.txt"), encoding="utf-8") as f:
+        text = f.read()
+    assert "Maths: 80.0" in text and "Art: 70.0" in text
+    assert "Average: 75.00" in text
+
+def test_student_without_scores(school):
+    storage.append_record("students.json", {"student_id": "S4", "name": "New", "grade": "G3"})
+    report_cards.generate_all("cards", ["txt"], workers=1)
+    with open(os.path.join("cards", "S4.txt"), encoding="utf-8") as f:
+        assert "No scores recorded." in f.read()
+
+def test_colliding_file_names_get_their_own_files():
+    ids = ["a/b", "a_b", "A1", "a1", "../x", "S1", "S1"]
+    names = report_cards.card_filenames(ids)
+    assert len({name.casefold() for name in names}) == len(ids)
+    # The same ID twice (a hand-edited file) is numbered
+    assert names[6] == names[5] + "-2"
+    assert all("/" not in name and name != ".." for name in names)
+    assert names[0].startswith("a_b-") and names[1].startswith("a_b-")
+
+def test_worker_pool_writes_the_same_files(school, monkeypatch):
+    students = [{"student_id": f"N{n}", "name": f"<b>{n}</b>", "grade": "G1"} for n in range(12)]
+    storage.save_data("students.json", students)
+    report_cards.generate_all("single", workers=1)
+    monkeypatch.setattr(report_cards, "CHUNK_CARDS", 5)
+    assert report_cards.generate_all("pool", workers=2) == (12, 24)
+    assert sorted(os.listdir("pool")) == sorted(os.listdir("single"))
+    for name in os.listdir("pool"):
+        with open(os.path.join("pool", name), encoding="utf-8") as a, open(os.path.join("single", name), encoding="utf-8") as b:
+            assert a.read() == b.read()
+    with open(os.path.join("pool", "N0.html"), encoding="utf-8") as f:
+        assert "&lt;b&gt;0&lt;/b&gt;" in f.read()
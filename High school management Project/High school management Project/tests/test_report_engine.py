@@ -0,0 +1,35 @@
+# School Management System
+# Module: Tests - Report Engine
+# Libraries: core
+#
+# compute_all() walks each collection once but must give exactly what the
+# single-report functions give, on either backend and with empty data.
+
+from core import config, report_engine, reports
+
+def _individual():
+    return {name: compute() for name, (_, compute, _) in reports.REPORTS.items()}
+
+def test_matches_individual_reports(backend, school):
+    results = report_engine.compute_all()
+    assert results == _individual()
+    assert results["capacity-vs-actual"] == [
+        {"grade": "G1", "actual": 2, "capacity": 30},
+        {"grade": "G2", "actual": 1, "capacity": 5},
+        {"grade": "G3", "actual": 0, "capacity": 2},
+    ]
+
+def test_matches_individual_reports_with_no_data(backend):
+    assert report_engine.compute_all() == _individual()
+
+def test_run_all_renders_every_report(school):
+    rows = report_engine.run_all()
+    assert [name for name, _, _, _ in rows] == list(reports.REPORTS)
+    for name, title, data, text in rows:
+        assert title == reports.REPORTS[name][0]
+        assert text == reports.REPORTS[name][2](data)
+
+def test_streamed_collections_give_the_same_reports(school, monkeypatch):
+    expected = report_engine.compute_all()
+    monkeypatch.setitem(config.settings, "cache_max_mb", 0)
+    assert report_engine.compute_all() == expected
@@ -0,0 +1,75 @@
+# School Management System
+# Module: Tests - Report Progress and Cancel
+# Libraries: concurrent.futures, pytest, core, task_runner
+#
+# Long reports call progress(done, total) as they go, which is where the
+# task runner stops a cancelled one: the progress callback raises and the
+# report gives up part-way. Task itself needs no Tk root.
+
+from concurrent.futures import Future
+import pytest
+from core import report_cards, report_engine, reports, storage
+from list_window import first_page
+from task_runner import Cancelled, Task
+
+class StopAt:
+    # A progress callback that records its calls and raises on the nth
+    def __init__(self, n=None):
+        self.calls = []
+        self.n = n
+
+    def __call__(self, done, total=None):
+        self.calls.append((done, total))
+        if self.n is not None and len(self.calls) >= self.n:
+            raise Cancelled()
+
+def test_report_engine_reports_every_collection(school, monkeypatch):
+    monkeypatch.setattr(reports, "PROGRESS_EVERY", 2)
+    progress = StopAt()
+    expected = report_engine.compute_all()
+    assert report_engine.compute_all(progress) == expected
+    steps = [done for done, _ in progress.calls]
+    assert steps == sorted(steps)
+    assert steps[0] == 0 and progress.calls[-1] == (report_engine.STEPS, report_engine.STEPS)
+
+def test_cancel_stops_the_report_engine(school):
+    progress = StopAt(2)
+    with pytest.raises(Cancelled):
+        report_engine.run_all(progress)
+    assert len(progress.calls) == 2
+
+def test_single_reports_take_progress(school):
+    for name in reports.REPORTS:
+        title, data, text = reports.run_report(name, progress=StopAt())
+        assert data == reports.REPORTS[name][1]()
+
+def test_cancel_stops_report_cards(school):
+    progress = StopAt(2)
+    with pytest.raises(Cancelled):
+        report_cards.generate_all("cards", workers=1, progress=progress)
+    assert progress.calls[0] == (0, 3)
+
+def test_list_loading_reports_its_steps(school):
+    progress = StopAt()
+    total, rows = first_page("students.json", progress)
+    assert total == 3 and rows == storage.load_data("students.json")
+    assert progress.calls == [(0, 2), (1, 2)]
+    with pytest.raises(Cancelled):
+        first_page("students.json", StopAt(2))
+
+def test_task_progress_raises_once_cancelled():
+    task = Task("Report", True, None)
+    task.future = Future()
+    task.progress(1, 4)
+    assert (task.done, task.total) == (1, 4)
+    task.cancel()
+    assert task.cancelled
+    with pytest.raises(Cancelled):
+        task.progress(2, 4)
+
+def test_task_without_progress_is_not_cancelled():
+    task = Task("Save", False, None)
+    task.future = Future()
+    task.cancel()
+    assert not task.cancelled
+    task.progress(1)
@@ -0,0 +1,125 @@
+# School Management System
+# Module: Tests - Binary Score File
+# Libraries: os, pytest, core
+#
+# The string dictionary is kept in memory between appends and only the
+# lines added since are read, so appends from another process, a torn
+# dictionary line and a whole rewrite must all come out right. With
+# "score_format" set to "binary" the rest of the program must not notice.
+
+import os
+import pytest
+from conftest import SCHOOL, run_python
+from core import aggregates, config, reports, score_binary, storage
+from core.scores import add_score
+
+def _score(student, subject="Math", teacher="T1", score=50.0):
+    return {"student_id": student, "subject": subject, "teacher_id": teacher, "score": score}
+
+def _read():
+    return [(s["student_id"], s["subject"], s["teacher_id"], s["score"]) for s in score_binary.ScoreFile()]
+
+@pytest.fixture
+def binary(school, monkeypatch):
+    monkeypatch.setitem(config.settings, "score_format", "binary")
+    return school
+
+# ========== File Format ==========
+def test_appends_from_another_process(data_dir):
+    score_binary.write_records([_score("S1"), _score("S2", "English")])
+    score_binary.append_records([_score("S3", "Art", "T2")])
+    run_python("""
+        from core import score_binary
+        score_binary.append_records([{"student_id": "S4", "subject": "Music", "teacher_id": "T3", "score": 1.5}])
+    """, data_dir)
+    # This process has not seen Music or T3 yet
+    score_binary.append_records([_score("S5", "Music", "T3", 88.1)])
+    assert _read() == [
+        ("S1", "Math", "T1", 50.0),
+        ("S2", "English", "T1", 50.0),
+        ("S3", "Art", "T2", 50.0),
+        ("S4", "Music", "T3", 1.5),
+        ("S5", "Music", "T3", 88.1),
+    ]
+    with open(score_binary.DICT_FILE) as f:
+        assert f.read().count('"Music"') == 1
+
+def test_torn_dictionary_line_is_overwritten(data_dir):
+    score_binary.write_records([_score("S1")])
+    with open(score_binary.DICT_FILE, "ab") as f:
+        f.write(b'[0, "half')
+    score_binary.append_records([_score("S2", "Art")])
+    assert _read() == [("S1", "Math", "T1", 50.0), ("S2", "Art", "T1", 50.0)]
+    with open(score_binary.DICT_FILE, "rb") as f:
+        assert b"half" not in f.read()
+
+def test_records_past_the_count_are_ignored(data_dir):
+    # A crash after writing the records but before raising the header count
+    score_binary.write_records([_score("S1")])
+    with open(score_binary.BIN_FILE, "ab") as f:
+        f.write(score_binary.RECORD.pack(0, 0, 0, 99.0))
+    assert _read() == [("S1", "Math", "T1", 50.0)]
+    score_binary.append_records([_score("S2")])
+    assert _read() == [("S1", "Math", "T1", 50.0), ("S2", "Math", "T1", 50.0)]
+
+def test_rewrite_starts_a_new_dictionary(data_dir):
+    score_binary.write_records([_score(f"S{n}") for n in range(10)])
+    score_binary.append_records([_score("S10")])
+    score_binary.write_records([_score("A", "Art", "T9")])
+    score_binary.append_records([_score("B", "Art", "T8")])
+    assert _read() == [("A", "Art", "T9", 50.0), ("B", "Art", "T8", 50.0)]
+    assert [s["student_id"] for s in score_binary.open_scores()] == ["A", "B"]
+
+def test_retired_mapping_is_closed(data_dir):
+    score_binary.write_records([_score("S1")])
+    old = score_binary.open_scores()
+    assert score_binary.open_scores() is old
+    score_binary.append_records([_score("S2")])
+    new = score_binary.open_scores()
+    assert new is not old
+    assert old.map.closed
+    assert len(new) == 2
+
+@pytest.mark.parametrize("value", [88.1, 0.5, 100, -3.25])
+def test_scores_come_back_as_typed(value):
+    assert score_binary.score_value(score_binary._to_float32(score_binary.check_score(value))) == value
+
+@pytest.mark.parametrize("value", [0.123456789, 16777217])
+def test_scores_float32_cannot_hold_are_refused(value):
+    with pytest.raises(ValueError):
+        score_binary.check_score(value)
+
+# ========== Through Storage ==========
+def test_program_reads_and_writes_the_binary_file(binary):
+    assert [dict(s) for s in storage.load_data("scores.json")] == SCHOOL["scores.json"]
+    assert os.path.exists(score_binary.BIN_FILE)
+    add_score({"student_id": "S2", "subject": "Art", "teacher_id": "T2", "score": "40"})
+    assert len(score_binary.open_scores()) == 5
+    assert reports.average_score_per_subject() == {"Maths": 70.0, "Art": (70 + 95.5 + 40) / 3}
+    assert aggregates.count("scores.json") == 5
+
+def test_missing_binary_file_is_rebuilt_from_json(binary):
+    score_binary.from_json()
+    os.remove(score_binary.BIN_FILE)
+    assert len(storage.load_data("scores.json")) == 4
+
+def test_rewrite_drops_stale_derived_files(binary):
+    assert aggregates.count("scores.json") == 4
+    storage.save_data("scores.json", [_score("S1", "Maths")])
+    assert not os.path.exists(aggregates.aggregate_path("scores.json"))
+    assert aggregates.count("scores.json") == 1
+
+def test_conversion_both_ways(school):
+    storage.append_record("scores.json", _score("S2", "Art", "T2", 12.5))
+    expected = storage.load_data("scores.json")
+    assert score_binary.from_json() == 5
+    assert list(score_binary.open_scores()) == expected
+    storage.save_data("scores.json", [])
+    assert score_binary.to_json() == 5
+    assert storage.load_data("scores.json") == expected
+
+def test_conversion_refuses_scores_it_would_change(school):
+    storage.append_record("scores.json", _score("S2", "Art", "T2", 0.123456789))
+    with pytest.raises(ValueError):
+        score_binary.from_json()
+    assert not os.path.exists(score_binary.BIN_FILE)
@@ -0,0 +1,63 @@
+# School Management System
+# Module: Tests - Full-Text Search
+# Libraries: pytest, core
+#
+# A query finds the records holding every one of its words, whole or as a
+# prefix, ranked by field weight, then whole word over prefix, then
+# insertion order, the same on both backends and as the collection grows.
+
+import pytest
+from conftest import run_python
+from core import search, storage
+
+FILENAME = "students.json"
+
+STUDENTS = [
+    {"student_id": "S1", "name": "Harriet Tubman", "email": "harriet@example.com", "guardian_name": "Ben Ross", "address": "1 Dorchester Road"},
+    {"student_id": "S2", "name": "Tubby Jones", "email": "tj@example.com", "guardian_name": "Ann Jones", "address": "2 Main Street"},
+    {"student_id": "S3", "name": "Ann Smith", "email": "ann.smith7@example.com", "guardian_name": "Tubman Smith", "address": "3 Main Street"},
+    {"student_id": "S4", "name": "Cid Ross", "email": "cid@example.com", "guardian_name": "Dee Ross", "address": "Tubman House"},
+]
+
+def _ids(query, **kwargs):
+    return [r["student_id"] for r in search.search(FILENAME, query, **kwargs)]
+
+@pytest.fixture
+def students(backend):
+    storage.save_data(FILENAME, [dict(s) for s in STUDENTS])
+
+def test_ranked_by_field_then_whole_word(students):
+    # Name, then guardian name, then address; a whole word beats a prefix
+    assert _ids("tubman") == ["S1", "S3", "S4"]
+    assert _ids("tub") == ["S1", "S2", "S3", "S4"]
+    assert _ids("Tubby") == ["S2"]
+
+def test_every_query_word_must_match(students):
+    assert _ids("ann main") == ["S3", "S2"]  # S3's name beats S2's guardian
+    assert _ids("ann smith 7") == ["S3"]
+    assert _ids("ross tubman") == ["S1", "S4"]
+    assert _ids("nobody") == []
+    assert _ids("  .,; ") == []
+
+def test_single_letters_match_whole_words_only(students):
+    assert _ids("t") == []
+    assert _ids("7") == ["S3"]
+
+def test_limit_keeps_the_best(students):
+    assert _ids("example", limit=2) == ["S1", "S2"]
+
+def test_index_follows_the_collection(students, data_dir):
+    assert _ids("zed") == []
+    storage.append_record(FILENAME, {"student_id": "S5", "name": "Zed Tubman"})
+    run_python("""
+        from core import storage
+        storage.append_record("students.json", {"student_id": "S6", "name": "Zed Zulu"})
+    """, data_dir, env={"SCHOOL_BACKEND": storage.BACKEND})
+    assert _ids("zed") == ["S5", "S6"]
+    assert _ids("tubman") == ["S1", "S5", "S3", "S4"]
+    storage.save_data(FILENAME, [dict(STUDENTS[0])])
+    assert _ids("tub") == ["S1"]
+
+def test_other_collections_cannot_be_searched(data_dir):
+    with pytest.raises(ValueError):
+        search.search("scores.json", "maths")
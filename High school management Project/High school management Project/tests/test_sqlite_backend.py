@@ -0,0 +1,73 @@
+# School Management System
+# Module: Tests - SQLite Backend
+# Libraries: pytest, core
+#
+# The SQLite backend is a drop-in for the JSON files: every storage call and
+# every unique-key check must give the same answer on both backends.
+
+import pytest
+from core import indexes, sqlite_backend, storage
+
+STUDENTS = [
+    {"student_id": "S1", "name": "Ann", "grade": "G1"},
+    {"student_id": "S2", "name": "Ben", "grade": "G2"},
+    {"student_id": "S3", "name": "Cid", "grade": "G1"},
+]
+SCORES = [
+    {"student_id": "S1", "subject": "Maths", "teacher_id": "T1", "score": 80.0},
+    {"student_id": "S2", "subject": "Maths", "teacher_id": "T1", "score": 60.0},
+    {"student_id": "S1", "subject": "Art", "teacher_id": "T2", "score": 90.0},
+]
+
+@pytest.fixture
+def filled(backend):
+    storage.save_data("students.json", STUDENTS[:2])
+    storage.append_record("students.json", STUDENTS[2])
+    storage.save_data("scores.json", SCORES)
+    return backend
+
+def test_records_round_trip(filled):
+    assert storage.load_data("students.json") == STUDENTS
+    assert storage.first("students.json") == STUDENTS[0]
+    assert storage.find("students.json", "grade", "G1") == [STUDENTS[0], STUDENTS[2]]
+    assert storage.find("students.json", "grade", "G9") == []
+
+def test_aggregates(filled):
+    assert storage.count("students.json") == 3
+    assert storage.count_by("students.json", "grade") == {"G1": 2, "G2": 1}
+    assert storage.average_by("scores.json", "subject", "score") == {"Maths": 70.0, "Art": 90.0}
+    assert storage.group_values("scores.json", "student_id", "subject") == {"S1": ["Maths", "Art"], "S2": ["Maths"]}
+
+def test_list_columns_round_trip(backend):
+    subject = {"name": "Maths", "grades": ["G1", "G2"]}
+    assert indexes.add_unique("subjects.json", subject)
+    assert storage.load_data("subjects.json") == [subject]
+
+def test_unique_keys(backend):
+    assert indexes.add_unique("students.json", STUDENTS[0])
+    assert not indexes.add_unique("students.json", dict(STUDENTS[0], name="Other"))
+    assert indexes.key_exists("students.json", "S1")
+    assert not indexes.key_exists("students.json", "S2")
+
+def test_subject_names_unique_ignoring_case(backend):
+    assert indexes.add_unique("subjects.json", {"name": "Maths"})
+    assert not indexes.add_unique("subjects.json", {"name": "MATHS"})
+    assert indexes.key_exists("subjects.json", "mAtHs")
+    assert [s["name"] for s in storage.load_data("subjects.json")] == ["Maths"]
+
+def test_import_json(data_dir):
+    storage.save_data("students.json", STUDENTS + [dict(STUDENTS[0], name="Duplicate")])
+    storage.save_data("subjects.json", [{"name": "Art"}, {"name": "ART"}])
+    counts = sqlite_backend.import_json()
+    assert counts["students.json"] == 3
+    assert counts["subjects.json"] == 1
+    assert sqlite_backend.load_data("students.json") == STUDENTS
+
+def test_pages_sort_like_the_json_backend(backend):
+    # Missing values, numeric strings such as IDs, and text in mixed case
+    values = ["b", "10", "9", None, "A", "2", "a", "3.5", "B", None]
+    storage.save_data("students.json", [{"student_id": f"S{n}", "name": v} for n, v in enumerate(values)])
+    for descending in (False, True):
+        names = [r.get("name") for r in storage.page("students.json", 0, 20, "name", descending)]
+        assert names == sorted(values, key=storage.sort_key, reverse=descending)
+    assert [r["student_id"] for r in storage.page("students.json", 3, 2)] == ["S3", "S4"]
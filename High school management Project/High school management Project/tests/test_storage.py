@@ -0,0 +1,290 @@
+# School Management System
+# Module: Tests - Shared Storage
+# Libraries: json, os, threading, pytest, core
+#
+# Appends go to the log and compaction folds them back into the main file;
+# readers must see every record exactly once, in insertion order, through
+# all of it, including after a crash mid-append or mid-compaction or with
+# unsynced lines, with several windows appending and compacting at once, and
+# with low-cardinality fields stored as codes.
+
+import json
+import os
+import threading
+import pytest
+from conftest import run_python
+from core import aggregates, config, indexes, storage
+
+FILENAME = "students.json"
+
+# One window's worth of unique inserts. The log limit is lowered so
+# background compactions run between the explicit ones.
+WRITER = """
+    import sys
+    from core import indexes, storage
+    storage.COMPACT_LOG_BYTES = 2048
+    tag, batches = sys.argv[1], int(sys.argv[2])
+    for i in range(batches):
+        record = {"student_id": f"{tag}-{i}", "name": f"Student {tag} {i}", "grade": "G0"}
+        assert indexes.add_unique("students.json", record)
+        if i % 25 == 0:
+            storage.compact("students.json")
+"""
+
+def _student(n, grade="G0"):
+    return {"student_id": f"S{n}", "name": f"Student {n}", "grade": grade}
+
+def _ids():
+    return [r["student_id"] for r in storage.load_data(FILENAME)]
+
+# ========== Appends ==========
+def test_appends_follow_the_main_file(data_dir):
+    storage.save_data(FILENAME, [_student(0), _student(1)])
+    storage.append_record(FILENAME, _student(2))
+    storage.append_record(FILENAME, _student(3))
+    assert _ids() == ["S0", "S1", "S2", "S3"]
+    # The main file is left alone until a compaction
+    with open(FILENAME) as f:
+        assert [r["student_id"] for r in json.load(f)] == ["S0", "S1"]
+
+def test_torn_last_line_is_ignored(data_dir):
+    storage.append_record(FILENAME, _student(0))
+    with open(storage.log_path(FILENAME), "a") as f:
+        f.write('{"student_id": "S1", "na')
+    assert _ids() == ["S0"]
+
+def test_appends_from_another_process(data_dir):
+    storage.append_record(FILENAME, _student(0))
+    run_python("""
+        from core import storage
+        storage.append_record("students.json", {"student_id": "S1", "name": "n", "grade": "G0"})
+    """, data_dir)
+    storage.append_record(FILENAME, _student(2))
+    assert _ids() == ["S0", "S1", "S2"]
+
+def test_save_data_discards_the_log(data_dir):
+    for n in range(3):
+        storage.append_record(FILENAME, _student(n))
+    storage.save_data(FILENAME, [_student(9)])
+    assert _ids() == ["S9"]
+    assert not os.path.exists(storage.log_path(FILENAME))
+
+def _assert_unique(expected_ids):
+    ids = _ids()
+    assert len(ids) == len(set(ids)), "a record was read twice"
+    assert set(ids) == set(expected_ids)
+
+# ========== Concurrency ==========
+@pytest.mark.parametrize("flush_interval", ["0", "0.05"])
+def test_appends_and_compaction_from_several_processes(data_dir, flush_interval):
+    writers, batches = 4, 120
+    procs = [run_python(WRITER, data_dir, f"W{w}", batches, env={"SCHOOL_FLUSH_INTERVAL": flush_interval}, wait=False)
+             for w in range(writers)]
+    for proc in procs:
+        _, err = proc.communicate(timeout=300)
+        assert proc.returncode == 0, err
+
+    expected = [f"W{w}-{i}" for w in range(writers) for i in range(batches)]
+    _assert_unique(expected)
+    storage.compact(FILENAME)
+    _assert_unique(expected)
+    assert not os.path.exists(storage.log_path(FILENAME))
+
+    # A window opened afterwards reads the same
+    out = run_python("""
+        from core import storage
+        print(len(storage.load_data("students.json")))
+    """, data_dir)
+    assert int(out.stdout) == len(expected)
+
+def test_unique_inserts_from_several_threads(data_dir, monkeypatch):
+    # Every thread tries every key; each key goes in exactly once
+    monkeypatch.setattr(storage, "COMPACT_LOG_BYTES", 2048)
+    added = []
+    def insert():
+        for n in range(50):
+            if indexes.add_unique(FILENAME, _student(n)):
+                added.append(n)
+    threads = [threading.Thread(target=insert) for _ in range(6)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert sorted(added) == list(range(50))
+    storage._join_compactions()
+    _assert_unique([f"S{n}" for n in range(50)])
+
+# ========== Crash Recovery ==========
+def _markers(data_dir):
+    return [p for p in os.listdir(data_dir) if ".unsynced." in p]
+
+def test_write_behind_recovery_after_crash(data_dir):
+    # The writer fsyncs nothing (a long flush interval), leaves half a line
+    # in the log and dies without its exit handlers
+    run_python("""
+        import os
+        from core import storage, indexes, aggregates
+        for i in range(20):
+            record = {"student_id": f"S{i}", "name": "n", "grade": "G0"}
+            with storage.collection_lock("students.json"):
+                indexes.add_unique("students.json", record)
+                aggregates.record_added("students.json", record)
+        with open(storage.log_path("students.json"), "a") as f:
+            f.write('{"student_id": "torn", "na')
+        os._exit(0)
+    """, data_dir, env={"SCHOOL_FLUSH_INTERVAL": "60"})
+    assert _markers(data_dir), "the writer should have left its marker behind"
+
+    expected = [f"S{i}" for i in range(20)]
+    _assert_unique(expected)
+    assert not _markers(data_dir)
+    with open(storage.log_path(FILENAME), "rb") as f:
+        assert f.read().endswith(b"\n")
+    # The key index and aggregates were dropped and rebuilt from what survived
+    assert indexes.key_exists(FILENAME, "S19") and not indexes.key_exists(FILENAME, "torn")
+    assert aggregates.count(FILENAME) == 20
+
+    # Appends go on from the cut
+    assert indexes.add_unique(FILENAME, _student(100))
+    _assert_unique(expected + ["S100"])
+
+def test_write_behind_flush_drops_the_marker(data_dir, monkeypatch):
+    monkeypatch.setitem(config.settings, "flush_interval", 60)
+    storage.append_record(FILENAME, _student(0))
+    assert _markers(data_dir)
+    storage.flush()
+    assert not _markers(data_dir)
+    assert _ids() == ["S0"]
+
+# ========== Compaction ==========
+def test_compaction_folds_the_log_in(data_dir):
+    storage.save_data(FILENAME, [_student(0)])
+    for n in range(1, 5):
+        storage.append_record(FILENAME, _student(n))
+    storage.compact(FILENAME)
+    assert not os.path.exists(storage.log_path(FILENAME))
+    assert not os.path.exists(storage._rotated_path(FILENAME))
+    with open(FILENAME) as f:
+        assert [r["student_id"] for r in json.load(f)] == ["S0", "S1", "S2", "S3", "S4"]
+    storage.append_record(FILENAME, _student(5))
+    assert _ids() == ["S0", "S1", "S2", "S3", "S4", "S5"]
+
+def test_large_log_is_compacted_in_background(data_dir, monkeypatch):
+    monkeypatch.setattr(storage, "COMPACT_LOG_BYTES", 512)
+    for n in range(40):
+        storage.append_record(FILENAME, _student(n))
+    storage._join_compactions()
+    assert _ids() == [f"S{n}" for n in range(40)]
+    assert os.path.getsize(FILENAME) > 0
+
+def _half_compacted(swapped):
+    # The files a compaction killed at its swap leaves: the records folded
+    # into the main file (or not yet), the log it rotated away, the marker
+    folded = [_student(n) for n in range(3)]
+    storage.save_data(FILENAME, folded if swapped else [])
+    with open(storage._rotated_path(FILENAME), "w") as f:
+        f.write("".join(json.dumps(r) + "\n" for r in folded))
+    inode = os.stat(FILENAME).st_ino if swapped else os.stat(FILENAME).st_ino + 1
+    with open(storage._merged_path(FILENAME), "w") as f:
+        json.dump({"inode": inode}, f)
+
+@pytest.mark.parametrize("swapped", [True, False])
+def test_interrupted_compaction_is_finished_by_next_reader(data_dir, swapped):
+    _half_compacted(swapped)
+    assert _ids() == ["S0", "S1", "S2"]
+    assert not os.path.exists(storage._merged_path(FILENAME))
+    assert os.path.exists(storage._rotated_path(FILENAME)) != swapped
+    storage.compact(FILENAME)
+    assert _ids() == ["S0", "S1", "S2"]
+
+# ========== Paging ==========
+def _pages(sort_field=None, descending=False, size=15):
+    rows = []
+    while True:
+        page = storage.page(FILENAME, len(rows), size, sort_field, descending)
+        if not page:
+            return rows
+        rows += page
+
+@pytest.mark.parametrize("sort_field, descending", [(None, False), ("grade", False), ("grade", True), ("student_id", True)])
+def test_large_collections_page_like_cached_ones(data_dir, monkeypatch, sort_field, descending):
+    storage.save_data(FILENAME, [_student(n, f"G{n % 4}") for n in range(50)])
+    for n in range(50, 70):
+        storage.append_record(FILENAME, _student(n, f"G{n % 4}"))
+    cached = _pages(sort_field, descending)
+    assert len(cached) == 70
+    if sort_field is not None:
+        assert cached == sorted(storage.load_data(FILENAME), key=lambda r: storage.sort_key(r[sort_field]), reverse=descending)
+
+    # Too big for the cache: paged through the byte-span index instead,
+    # which is extended as the log grows
+    monkeypatch.setitem(config.settings, "cache_max_mb", 0)
+    assert _pages(sort_field, descending) == cached
+    storage.append_record(FILENAME, _student(70, "G0"))
+    monkeypatch.setitem(config.settings, "cache_max_mb", 64)
+    expected = _pages(sort_field, descending)
+    monkeypatch.setitem(config.settings, "cache_max_mb", 0)
+    assert _pages(sort_field, descending) == expected
+    storage.compact(FILENAME)
+    assert _pages(sort_field, descending) == expected
+
+# ========== Streaming ==========
+def test_streamed_reads_match_cached(data_dir, monkeypatch):
+    storage.save_data(FILENAME, [_student(n, f"G{n % 4}") for n in range(50)])
+    for n in range(50, 70):
+        storage.append_record(FILENAME, _student(n, f"G{n % 4}"))
+    def reads():
+        return (
+            list(storage.iter_records(FILENAME)),
+            storage.count(FILENAME),
+            storage.count_by(FILENAME, "grade"),
+            storage.group_values(FILENAME, "grade", "student_id"),
+            storage.find(FILENAME, "grade", "G3"),
+            storage.first(FILENAME),
+        )
+    cached = reads()
+    assert cached[0] == storage.load_data(FILENAME)
+    # Too big for the cache: streamed from disk
+    monkeypatch.setitem(config.settings, "cache_max_mb", 0)
+    assert reads() == cached
+
+# ========== Field Codes ==========
+def test_field_codes_round_trip(data_dir, monkeypatch):
+    storage.save_data(FILENAME, [_student(n, f"G{n % 3}") for n in range(12)])
+    before = [r.to_dict() for r in storage.load_data(FILENAME)]
+
+    assert storage.set_field_codes(FILENAME, True) == 12
+    with open(FILENAME) as f:
+        assert all("grade" not in r and isinstance(r["$grade"], int) for r in json.load(f))
+    # Appends, including a grade never seen, from this and another process
+    assert indexes.add_unique(FILENAME, _student(12, "New Grade"))
+    run_python("""
+        from core import storage
+        storage.append_record("students.json", {"student_id": "S13", "name": "n", "grade": "Other"})
+    """, data_dir)
+    expected = before + [_student(12, "New Grade"), dict(_student(13, "Other"), name="n")]
+    assert [r.to_dict() for r in storage.load_data(FILENAME)] == expected
+    monkeypatch.setitem(config.settings, "cache_max_mb", 0)
+    assert [r.to_dict() for r in storage.iter_records(FILENAME)] == expected
+    assert [r["grade"] for r in storage.page(FILENAME, 0, 2, "grade", True)] == ["Other", "New Grade"]
+
+    storage.set_field_codes(FILENAME, False)
+    assert not os.path.exists(FILENAME + ".codes")
+    with open(FILENAME) as f:
+        assert [r["grade"] for r in json.load(f)] == [r["grade"] for r in expected]
+
+def test_number_typed_into_coded_field_is_a_value(data_dir):
+    storage.save_data(FILENAME, [_student(0, "G0"), _student(1, "G1")])
+    storage.set_field_codes(FILENAME, True)
+    storage.append_record(FILENAME, _student(2, 0))
+    assert [r["grade"] for r in storage.load_data(FILENAME)] == ["G0", "G1", 0]
+    assert [r["grade"] for r in storage.page(FILENAME, 0, 3, "grade")] == [0, "G0", "G1"]
+
+@pytest.mark.parametrize("code", [2, -1, "G0"])
+def test_code_missing_from_table_is_an_error(data_dir, code):
+    storage.save_data(FILENAME, [_student(0, "G0"), _student(1, "G1")])
+    storage.set_field_codes(FILENAME, True)
+    with open(storage.log_path(FILENAME), "a") as f:
+        f.write(json.dumps({"student_id": "S2", "$grade": code}) + "\n")
+    with pytest.raises(ValueError, match="students.json"):
+        storage.load_data(FILENAME)
@@ -0,0 +1,60 @@
+# School Management System
+# Module: Tests - Students
+# Libraries: pytest, core
+#
+# Adding a student checks the ID, then the seat in the grade. A full grade
+# refuses the newcomer or waitlists them, per config "capacity_policy", and
+# the grade reports count from the same seats the check uses.
+
+import pytest
+from core import config, enrollments, reports, storage, students, grades
+from core.errors import ValidationError
+
+def _values(student_id, grade="G1"):
+    values = {field: "x" for field in students.FIELDS}
+    values.update(student_id=student_id, grade=grade)
+    return values
+
+def _full_grade(monkeypatch, policy):
+    monkeypatch.setitem(config.settings, "capacity_policy", policy)
+    storage.append_record("teachers.json", {"Teacher_id": "T1", "name": "Teacher"})
+    grades.add_grade({"name": "G1", "description": "First", "level": "1", "class_teacher": "T1", "capacity": "1"})
+    grades.add_grade({"name": "G2", "description": "Second", "level": "2", "class_teacher": "T1", "capacity": "1"})
+    assert students.add_student(_values("S1"))[1]
+
+@pytest.fixture
+def full_grade(data_dir, monkeypatch):
+    _full_grade(monkeypatch, "reject")
+    return data_dir
+
+@pytest.fixture
+def waitlist(data_dir, monkeypatch):
+    _full_grade(monkeypatch, "waitlist")
+    return data_dir
+
+def test_duplicate_id_reported_before_full_grade(full_grade):
+    with pytest.raises(ValidationError, match="Student ID already exists"):
+        students.add_student(_values("S1"))
+
+def test_new_id_into_full_grade_is_refused(full_grade):
+    with pytest.raises(ValidationError, match="full"):
+        students.add_student(_values("S2"))
+    assert [s["student_id"] for s in storage.load_data(students.FILENAME)] == ["S1"]
+
+def test_full_grade_waitlists_the_newcomer(waitlist):
+    student, seated = students.add_student(_values("S2"))
+    assert student["student_id"] == "S2" and not seated
+    assert [(e["student_id"], e["status"]) for e in enrollments.list_enrollments()] == [("S2", "Waitlisted")]
+    assert reports.student_count_by_grade() == {"G1": 1}
+
+def test_reports_count_the_seats(waitlist):
+    students.add_student(_values("S2"))
+    # S1 moves to G2, freeing G1; S2 is promoted into it
+    enrollments.add_enrollment({"student_id": "S1", "grade": "G2", "status": "Active"})
+    enrollments.add_enrollment({"student_id": "S2", "grade": "G1", "status": "Active"})
+    assert reports.student_count_by_grade() == {"G1": 1, "G2": 1}
+    assert reports.students_by_grade() == {"G1": ["x"], "G2": ["x"]}
+    assert [(r["grade"], r["actual"]) for r in reports.capacity_vs_actual()] == [("G1", 1), ("G2", 1)]
+    # Both grades are full again
+    enrollment = enrollments.add_enrollment({"student_id": "S2", "grade": "G2", "status": "Active"})
+    assert enrollment["status"] == "Waitlisted"